@@ -18,6 +18,7 @@ bl_info = {
 import bpy
 import bpy.utils.previews
 import os
+import typing
 
 # import logging first, so it is initialized before all other modules
 from .utils import data_vis_logging
@@ -38,14 +39,25 @@ from .properties import (
     DV_LegendPropertyGroup,
     DV_GeneralPropertyGroup,
 )
-from .data_manager import DataManager, DataType
+from .data_manager import (
+    DataManager,
+    DataType,
+    ChartData,
+    describe_sampling,
+)
 from .docs import get_example_data_doc, draw_tooltip_button
 from .icon_manager import IconManager
 from .general import DV_ShowPopup, DV_DataInspect, DV_DataOpenFile
-from .utils import env_utils
+from .utils import env_utils, data_cache, ui_memo
 from . import preferences as prefs
 from . import geonodes
-from .preferences import DV_Preferences, get_preferences, get_example_data_path
+from . import live
+from .preferences import (
+    DV_Preferences,
+    get_preferences,
+    get_example_data_path,
+    get_stream_settings,
+)
 
 icon_manager = IconManager()
 data_manager = DataManager()
@@ -55,6 +67,19 @@ PERFORMANCE_WARNING_LINE_THRESHOLD = 150
 EXAMPLE_DATA_FOLDER = "example_data"
 
 
+def load_data(context: bpy.types.Context, filepath: str) -> int:
+    """Loads data from 'filepath' as the active data using settings from preferences"""
+    preferences = get_preferences(context)
+    DataManager.registry.memory_budget = preferences.data_memory_budget * 1024 * 1024
+    lines = data_manager.load_data(
+        filepath,
+        use_cache=preferences.cache_data,
+        stream=get_stream_settings(context),
+    )
+    ui_memo.invalidate()
+    return lines
+
+
 @data_vis_logging.logged_operator
 class FILE_OT_DVLoadFile(bpy.types.Operator):
     bl_idname = "ui.dv_load_data"
@@ -84,7 +109,7 @@ class FILE_OT_DVLoadFile(bpy.types.Operator):
                 self.report({"WARNING"}, f"File {self.filepath} already loaded!")
                 return {"CANCELLED"}
 
-        line_n = data_manager.load_data(self.filepath)
+        line_n = load_data(context, self.filepath)
 
         report_type = {"INFO"}
         if line_n == 0:
@@ -110,6 +135,8 @@ class DV_OT_ReloadData(bpy.types.Operator):
     def execute(self, context):
         data_list = context.scene.data_list
         data_list_index = context.scene.data_list_index
+        # Drop the data kept in memory, so the file is really loaded again
+        DataManager.registry.remove(data_list[data_list_index].filepath)
         data_list[data_list_index].load()
         self.report({"INFO"}, "Data reloaded!")
         return {"FINISHED"}
@@ -125,7 +152,7 @@ class DV_OT_PrintData(bpy.types.Operator):
 
     @classmethod
     def poll(cls, context):
-        return data_manager.parsed_data
+        return data_manager.values is not None
 
     def execute(self, context):
         data_manager.print_data()
@@ -143,10 +170,25 @@ class DV_OT_RemoveData(bpy.types.Operator):
 
     def execute(self, context):
         index = context.scene.data_list_index
+        DataManager.registry.remove(context.scene.data_list[index].filepath)
         context.scene.data_list.remove(index)
         return {"FINISHED"}
 
 
+@data_vis_logging.logged_operator
+class DV_OT_ClearDataCache(bpy.types.Operator):
+    """Removes all cached parsed data"""
+
+    bl_idname = "data_vis.clear_data_cache"
+    bl_label = "Clear Cache"
+    bl_option = {"REGISTER"}
+
+    def execute(self, context):
+        data_cache.clear()
+        self.report({"INFO"}, "Data cache cleared!")
+        return {"FINISHED"}
+
+
 class DV_AddonPanel(bpy.types.Panel):
     """Menu panel used for loading data and managing addon settings"""
 
@@ -182,6 +224,7 @@ class DV_AddonPanel(bpy.types.Panel):
         row.label(text="Recently Loaded Files", icon="ALIGN_JUSTIFY")
         col = row.column(align=True)
         col.alignment = "RIGHT"
+        col.prop(preferences, "live_data", icon="REC", text="")
         col.prop(preferences, "show_data_examples", icon="HELP", text="")
 
         if preferences.show_data_examples:
@@ -238,6 +281,9 @@ class DV_AddonPanel(bpy.types.Panel):
 
             lines = data_manager.lines
             row = self.create_label_row(col, "Lines", lines)
+            sampling_text = describe_sampling(data_manager.sampling)
+            if sampling_text is not None:
+                col.label(text=sampling_text, icon="INFO")
             if lines >= PERFORMANCE_WARNING_LINE_THRESHOLD:
                 row = col.row()
                 row.alert = True
@@ -285,6 +331,9 @@ class DV_AddonPanel(bpy.types.Panel):
             text="Create Chart",
             icon_value=icon_manager.get_icon_id("addon_icon"),
         )
+        layout.operator(
+            geonodes.data.DV_RegenerateAllCharts.bl_idname, icon="FILE_REFRESH"
+        )
 
     def _draw_legacy_ui(self, context, layout):
         row = layout.row()
@@ -386,7 +435,15 @@ class DV_DL_PropertyGroup(bpy.types.PropertyGroup):
     data_info: bpy.props.StringProperty()
 
     def load(self):
-        data_manager.load_data(self.filepath)
+        load_data(bpy.context, self.filepath)
+
+    def get_chart_data(self) -> typing.Optional[ChartData]:
+        """Returns data of this entry without making it the active data"""
+        return DataManager.registry.get_chart_data(
+            self.filepath,
+            use_cache=get_preferences(bpy.context).cache_data,
+            stream=get_stream_settings(bpy.context),
+        )
 
 
 class DV_UL_DataList(bpy.types.UIList):
@@ -431,6 +488,7 @@ classes = [
     DV_OT_PrintData,
     DV_OT_RemoveData,
     DV_OT_ReloadData,
+    DV_OT_ClearDataCache,
     OBJECT_OT_AddChart,
     OBJECT_OT_BarChart,
     OBJECT_OT_PieChart,
@@ -478,9 +536,13 @@ def register():
     bpy.types.Scene.data_list = bpy.props.CollectionProperty(type=DV_DL_PropertyGroup)
     bpy.types.Scene.data_list_index = bpy.props.IntProperty(update=reload_data)
     bpy.types.VIEW3D_MT_add.append(chart_ops)
+    ui_memo.register()
+    live.register()
 
 
 def unregister():
+    live.unregister()
+    ui_memo.unregister()
     icon_manager.remove_icons()
     for c in reversed(classes):
         bpy.utils.unregister_class(c)
@@ -2,6 +2,7 @@
 
 import bpy
 import random
+import numpy as np
 from enum import Enum
 from colorsys import rgb_to_hsv, hsv_to_rgb
 
@@ -257,6 +258,46 @@ class ColorGen:
             return material
 
 
+def get_value_colors(base_color, color_type, value_range, values):
+    """
+    Returns (N, 4) RGBA colors of 'values', same as the materials of 'ColorGen' with the
+    same arguments would have
+    """
+    values = np.asarray(values, dtype=np.float64)
+    colors = np.ones((len(values), 4), dtype=np.float32)
+    if color_type == ColorType.Constant:
+        colors[:, :3] = base_color
+    elif color_type == ColorType.Gradient:
+        # HSV to RGB is linear in saturation, when hue and value are fixed
+        h, s, v = rgb_to_hsv(*base_color)
+        full = np.array(hsv_to_rgb(h, s, v))
+        norm = (values - value_range[0]) / (value_range[1] - value_range[0])
+        colors[:, :3] = v + norm[:, np.newaxis] * (full - v)
+    elif color_type == ColorType.Random:
+        colors[:, :3] = [hsv_to_rgb(random.random(), 1.0, 1.0) for _ in values]
+    return colors
+
+
+def create_attribute_material(attribute_name, attribute_type="GEOMETRY"):
+    """
+    Creates material, which takes the color from 'attribute_name' attribute of the mesh, or
+    of the instancer if 'attribute_type' is 'INSTANCER'
+    """
+    material = bpy.data.materials.new(name="DV_ChartMat")
+    material.use_nodes = True
+
+    nodes = material.node_tree.nodes
+    bsdf_node = nodes.get("Principled BSDF")
+
+    attr_node = nodes.new("ShaderNodeAttribute")
+    attr_node.location = (-300, 0)
+    attr_node.attribute_type = attribute_type
+    attr_node.attribute_name = attribute_name
+
+    material.node_tree.links.new(attr_node.outputs["Color"], bsdf_node.inputs[0])
+    return material
+
+
 class ColoringFactory:
     """Factory, that can instantiate NodeShader or ColorGen based on similar settings"""
 
@@ -1,16 +1,57 @@
 # ©copyright Zdenek Dolezal 2024-, License GPL
 
+import io
 import os
+import sys
 import numpy as np
 import csv
+import itertools
+import collections
+import dataclasses
 import typing
 import logging
+import warnings
+from .utils import data_cache
 
 logger = logging.getLogger("data_vis")
 
 from enum import Enum
 
 
+class _BoundedReader(io.RawIOBase):
+    """Reads only the first 'size' bytes of 'file'"""
+
+    def __init__(self, file: typing.BinaryIO, size: int):
+        self.file = file
+        self.remaining = size
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        count = min(len(buffer), self.remaining)
+        if count <= 0:
+            return 0
+        read = self.file.readinto(memoryview(buffer)[:count])
+        self.remaining -= read
+        return read
+
+    def close(self):
+        self.file.close()
+        super().close()
+
+
+def open_bounded(filepath: str, size: int) -> typing.TextIO:
+    """
+    Opens 'filepath' as UTF-8 text ending after 'size' bytes, so rows appended while the file
+    is parsed are left for 'read_tail'.
+    """
+    return io.TextIOWrapper(
+        io.BufferedReader(_BoundedReader(open(filepath, "rb", buffering=0), size)),
+        encoding="UTF-8",
+    )
+
+
 class DataType(Enum):
     Numerical = 0
     Categorical = 1
@@ -26,6 +67,55 @@ class DataSubtype(Enum):
     XYZW = 5
 
 
+@dataclasses.dataclass(frozen=True)
+class StreamSettings:
+    """
+    How a file is read in streaming mode. The schema is detected from the first
+    'sample_rows' rows, then the file is parsed in chunks of 'chunk_rows' rows. Only every
+    'stride'-th row is kept and reading stops after 'row_budget' kept rows, 0 keeps all.
+    """
+
+    row_budget: int = 0
+    stride: int = 1
+    chunk_rows: int = 65536
+    sample_rows: int = 100
+
+
+def describe_sampling(
+    sampling: typing.Optional[typing.Dict[str, typing.Any]],
+) -> typing.Optional[str]:
+    """Returns description of the sampled stream, None if all rows of the file were loaded"""
+    if sampling is None:
+        return None
+    if sampling["loaded_rows"] == sampling["read_rows"] and sampling["complete"]:
+        return None
+
+    text = f"Sampled {sampling['loaded_rows']} of {sampling['read_rows']} rows"
+    if not sampling["complete"]:
+        text += ", rest of the file not read"
+    return text
+
+
+# Sizes of the Python objects in row lists and object arrays, which 'nbytes' doesn't include
+_POINTER_SIZE = np.dtype(object).itemsize
+_FLOAT_SIZE = sys.getsizeof(0.0)
+_LIST_SIZE = sys.getsizeof([])
+_EMPTY_STR_SIZE = sys.getsizeof("")
+
+
+def _objects_memory_size(
+    values: np.ndarray, categories: typing.Optional[np.ndarray]
+) -> int:
+    """
+    Returns approximate size of the Python objects created when 'values' and 'categories'
+    are converted into rows. Categories from object arrays are shared, not created.
+    """
+    size = values.size * _FLOAT_SIZE
+    if categories is not None and categories.dtype.kind == "U":
+        size += len(categories) * (_EMPTY_STR_SIZE + categories.dtype.itemsize // 4)
+    return size
+
+
 class ChartData:
     """V3.0 abstraction of data access, simpler to use"""
 
@@ -33,6 +123,10 @@ class ChartData:
         self.parsed_data = np.array(parsed_data)
         self.lines = len(parsed_data)
         self.labels = labels
+        self.sampling = None
+        self.filepath = None
+        # Hashes of the rows, computed once by the geonodes charts and kept with the data
+        self.fingerprint = None
 
         # Adjust categorical data to also calculate correct axis values
         if isinstance(self.parsed_data[0][1], str):
@@ -49,15 +143,167 @@ class ChartData:
             np.min(adjusted_data, axis=0)[:3],
             np.max(adjusted_data, axis=0)[:3],
         )
+        self._padded_min_max = None
+
+    @classmethod
+    def from_columns(
+        cls,
+        values: np.ndarray,
+        categories: typing.Optional[np.ndarray] = None,
+        labels: typing.Optional[typing.List[str]] = None,
+        sampling: typing.Optional[typing.Dict[str, typing.Any]] = None,
+        filepath: typing.Optional[str] = None,
+    ) -> "ChartData":
+        """
+        Creates ChartData from already typed columns, 'values' is the float64 block of numeric
+        columns and 'categories' the optional first categorical column. 'sampling' describes
+        the stream, if the data were read only partially. 'filepath' is the source file.
+        """
+        chart_data = cls.__new__(cls)
+        chart_data.lines = values.shape[0]
+        chart_data.labels = labels
+        chart_data.sampling = sampling
+        chart_data.filepath = filepath
+        chart_data.fingerprint = None
+        if categories is None:
+            chart_data.parsed_data = values
+            adjusted_data = values
+        else:
+            # Object array keeps the values as floats, so no float -> str -> float round trip
+            # happens when the data are preprocessed.
+            chart_data.parsed_data = np.empty(
+                (values.shape[0], values.shape[1] + 1), dtype=object
+            )
+            chart_data.parsed_data[:, 0] = categories
+            chart_data.parsed_data[:, 1:] = values
+            adjusted_data = np.column_stack([np.zeros(values.shape[0]), values])
+
+        chart_data.min_, chart_data.max_ = (
+            np.min(adjusted_data, axis=0)[:3],
+            np.max(adjusted_data, axis=0)[:3],
+        )
+        chart_data._padded_min_max = None
+        return chart_data
 
     def get_padded_min_max(self) -> typing.Tuple[np.ndarray, np.ndarray]:
         """Returns min and max values with 0 padding to get Vector3s"""
-        min_ = self.min_
-        max_ = self.max_
-        if len(self.min_) == 2:
-            min_ = np.append(self.min_, 0)
-            max_ = np.append(self.max_, 0)
-        return min_, max_
+        if self._padded_min_max is None:
+            min_ = self.min_
+            max_ = self.max_
+            if len(self.min_) == 2:
+                min_ = np.append(self.min_, 0)
+                max_ = np.append(self.max_, 0)
+            self._padded_min_max = (min_, max_)
+        return self._padded_min_max
+
+
+class DataRegistry:
+    """
+    Keeps datasets of multiple files in memory, so they don't have to be read again when
+    switching between them. Datasets are keyed by filepath, when the memory budget is exceeded,
+    least recently used datasets are evicted.
+    """
+
+    # Default memory budget in bytes
+    DEFAULT_MEMORY_BUDGET = 1024 * 1024 * 1024
+
+    def __init__(self, memory_budget: int = DEFAULT_MEMORY_BUDGET):
+        self.memory_budget = memory_budget
+        # filepath -> (file stamp, dataset), ordered from least recently used
+        self.datasets: collections.OrderedDict[
+            str, typing.Tuple[typing.Any, typing.Any]
+        ] = collections.OrderedDict()
+
+    def get(
+        self,
+        filepath: str,
+        delimiter: str = ",",
+        use_cache: bool = False,
+        stream: typing.Optional[StreamSettings] = None,
+    ):
+        """
+        Returns dataset for 'filepath', reads the file if it isn't in the registry, if it
+        changed since it was read or if it was read with different 'stream' settings.
+        Returns None if the data are invalid.
+        """
+        if not os.path.isfile(filepath):
+            self.remove(filepath)
+            return None
+
+        key = self._get_key(filepath)
+        stat = os.stat(filepath)
+        stamp = (stat.st_mtime_ns, stat.st_size, stream)
+        entry = self.datasets.get(key, None)
+        if entry is not None and entry[0] == stamp:
+            self.datasets.move_to_end(key)
+            return entry[1]
+
+        dataset = DataManager.new_dataset()
+        if dataset.read_file(filepath, delimiter, use_cache, stream) == 0:
+            self.remove(filepath)
+            return None
+
+        self.datasets[key] = (stamp, dataset)
+        self.datasets.move_to_end(key)
+        self.evict()
+        return dataset
+
+    def read_tail(self, filepath: str, delimiter: str = ",") -> typing.Optional[int]:
+        """
+        Appends rows added to the end of 'filepath' to its dataset, without reading the rest
+        of the file again. Returns number of appended rows, None if the file isn't in the
+        registry or has to be read again whole.
+        """
+        key = self._get_key(filepath)
+        entry = self.datasets.get(key, None)
+        if entry is None or not os.path.isfile(filepath):
+            return None
+
+        stamp, dataset = entry
+        stat = os.stat(filepath)
+        if stamp[:2] == (stat.st_mtime_ns, stat.st_size):
+            return 0
+
+        appended = dataset.read_tail(delimiter)
+        if appended is None:
+            self.remove(filepath)
+            return None
+
+        self.datasets[key] = ((stat.st_mtime_ns, stat.st_size, stamp[2]), dataset)
+        self.evict()
+        return appended
+
+    def get_chart_data(
+        self,
+        filepath: str,
+        delimiter: str = ",",
+        use_cache: bool = False,
+        stream: typing.Optional[StreamSettings] = None,
+    ) -> typing.Optional[ChartData]:
+        """Returns ChartData for 'filepath' without changing the active data"""
+        dataset = self.get(filepath, delimiter, use_cache, stream)
+        if dataset is None:
+            return None
+        return dataset.get_chart_data()
+
+    def remove(self, filepath: str) -> None:
+        self.datasets.pop(self._get_key(filepath), None)
+
+    def clear(self) -> None:
+        self.datasets.clear()
+
+    def get_memory_size(self) -> int:
+        return sum(dataset.get_memory_size() for _, dataset in self.datasets.values())
+
+    def evict(self) -> None:
+        """Removes least recently used datasets until the memory budget is met"""
+        # The most recently used dataset is always kept
+        while len(self.datasets) > 1 and self.get_memory_size() > self.memory_budget:
+            key, _ = self.datasets.popitem(last=False)
+            logger.debug(f"Evicted '{key}' from loaded data")
+
+    def _get_key(self, filepath: str) -> str:
+        return os.path.normcase(os.path.abspath(filepath))
 
 
 class DataManager:
@@ -74,6 +320,13 @@ class DataManager:
         def default_state(self):
             self.raw_data = None
             self.parsed_data = None
+            # Typed columns, 'values' is float64 block of all numeric columns, 'categories'
+            # holds the first column of categorical data.
+            self.values = None
+            self.categories = None
+            self.first_row_end_line = 0
+            # ChartData of the loaded file, created on first access and dropped on reload
+            self.chart_data = None
             self.predicted_data_type = None
             self.has_labels = False
             self.lines = 0
@@ -82,6 +335,10 @@ class DataManager:
             self.filepath = ""
             self.tail_length = 0
             self.animable = False
+            # Description of the stream if the data were read in streaming mode
+            self.sampling = None
+            # Position in the file up to which the rows were read
+            self.byte_offset = 0
 
         def set_data(self, data):
             self.raw_data = data
@@ -89,22 +346,58 @@ class DataManager:
         def get_raw_data(self):
             return self.raw_data
 
-        def load_data(self, filepath, delimiter=","):
+        def load_data(self, filepath, delimiter=",", use_cache=False, stream=None):
+            """
+            Makes data from 'filepath' the active data. The data are taken from the registry
+            of loaded datasets if the file didn't change, otherwise the file is read.
+            """
+            dataset = DataManager.registry.get(filepath, delimiter, use_cache, stream)
+            if dataset is None:
+                self.default_state()
+                if os.path.exists(filepath):
+                    self.filepath = filepath
+                    self.predicted_data_type = DataType.Invalid
+                return 0
+
+            # Create the ChartData on the shared dataset, so it is reused when switching back
+            dataset.get_chart_data()
+            self.__dict__.update(dataset.__dict__)
+            # Ranges can be overriden by the legacy charts, don't propagate that to the dataset
+            self.ranges = dict(dataset.ranges)
+            return dataset.get_loaded_lines()
+
+        def read_file(self, filepath, delimiter=",", use_cache=False, stream=None):
+            """
+            Reads data from 'filepath', if 'use_cache' is True, the parsed data are stored
+            in a binary sidecar and memory mapped from it on next load of unchanged file.
+            If 'stream' settings are given, the file is streamed in chunks and possibly only
+            sampled, such data are never cached.
+            """
             if not os.path.exists(filepath):
                 return 0
 
             self.default_state()
             self.filepath = filepath
+            # Only the bytes present now are parsed, rows appended while the file is read are
+            # found by the next 'read_tail'
+            self.byte_offset = os.path.getsize(filepath)
+            use_cache = use_cache and stream is None
+            if use_cache and self.__load_from_cache(filepath):
+                return self.get_loaded_lines()
+
             try:
-                with open(filepath, "r", encoding="UTF-8") as file:
-                    csv_reader = csv.reader(file, delimiter=delimiter)
-                    self.raw_data = []
-                    for line in csv_reader:
-                        if len(line) == 0:
-                            continue
-                        self.raw_data.append(line)
-                self.analyse_data()
-                self.parse_data()
+                if stream is None:
+                    self.raw_data = self.__read_sample(
+                        filepath, delimiter, DataManager.SAMPLE_ROWS
+                    )
+                    self.analyse_data()
+                    self.parse_data(delimiter)
+                else:
+                    self.raw_data = self.__read_sample(
+                        filepath, delimiter, max(stream.sample_rows, 2)
+                    )
+                    self.analyse_data()
+                    self.stream_data(stream, delimiter)
             except UnicodeDecodeError as e:
                 self.predicted_data_type = DataType.Invalid
                 return 0
@@ -112,7 +405,94 @@ class DataManager:
             if self.predicted_data_type == DataType.Invalid:
                 return 0
 
-            return len(self.raw_data)
+            if use_cache:
+                data_cache.store(
+                    filepath, self.__get_cache_meta(), self.values, self.categories
+                )
+
+            return self.get_loaded_lines()
+
+        def get_loaded_lines(self):
+            """Returns number of lines read from the file including header, 0 if invalid"""
+            if self.values is None or self.predicted_data_type == DataType.Invalid:
+                return 0
+            return self.lines + (1 if self.has_labels else 0)
+
+        def get_memory_size(self):
+            """
+            Returns approximate size of the parsed data in bytes, including the ChartData
+            and the rows created from them
+            """
+            if self.values is None:
+                return 0
+
+            size = self.values.nbytes
+            if self.categories is not None:
+                size += self.categories.nbytes
+            # Numerical ChartData shares 'values', categorical one is an object array copy
+            if (
+                self.chart_data is not None
+                and self.chart_data.parsed_data is not self.values
+            ):
+                size += self.chart_data.parsed_data.nbytes
+                size += _objects_memory_size(self.values, self.categories)
+            if self._parsed_data is not None and len(self._parsed_data) == self.lines:
+                size += self.lines * _LIST_SIZE
+                size += self.lines * self.get_column_count() * _POINTER_SIZE
+                size += _objects_memory_size(self.values, self.categories)
+            return size
+
+        def __get_cache_meta(self):
+            return {
+                "predicted_data_type": self.predicted_data_type.name,
+                "has_labels": self.has_labels,
+                "labels": list(self.labels) if self.has_labels else [],
+                "lines": self.lines,
+                "dimensions": self.dimensions,
+                "ranges": self.ranges,
+                "tail_length": self.tail_length,
+                "animable": self.animable,
+            }
+
+        def __load_from_cache(self, filepath):
+            cached = data_cache.load(filepath)
+            if cached is None:
+                return False
+
+            meta, self.values, self.categories = cached
+            self.predicted_data_type = DataType[meta["predicted_data_type"]]
+            self.has_labels = meta["has_labels"]
+            if self.has_labels:
+                self.labels = tuple(meta["labels"])
+            self.lines = meta["lines"]
+            self.dimensions = meta["dimensions"]
+            self.ranges = meta["ranges"]
+            self.tail_length = meta["tail_length"]
+            self.animable = meta["animable"]
+            self.__calculate_subtypes()
+            # Raw data hold only the analysed sample, nothing is read from the file now
+            self.raw_data = []
+            return True
+
+        def __read_sample(self, filepath, delimiter, rows):
+            """
+            Reads only the first 'rows' rows of the file, which are enough to analyse the
+            data. The line where the first row ends is remembered, so the header can be
+            skipped when parsing.
+            """
+            sample = []
+            with open(filepath, "r", encoding="UTF-8") as file:
+                csv_reader = csv.reader(file, delimiter=delimiter)
+                for line in csv_reader:
+                    if len(line) == 0:
+                        continue
+                    sample.append(line)
+                    if len(sample) == 1:
+                        self.first_row_end_line = csv_reader.line_num
+                    if len(sample) == rows:
+                        break
+
+            return sample
 
         def analyse_data(self):
             """Analyses data type and labels"""
@@ -172,8 +552,8 @@ class DataManager:
                 self.tail_length = row_info["floats"] - self.dimensions
                 self.__calculate_subtypes()
 
-        def parse_data(self):
-            """Takes raw_data and parses it into parsed_data while finding data ranges"""
+        def parse_data(self, delimiter=","):
+            """Parses the file into typed numpy columns while finding data ranges"""
             if self.raw_data is None:
                 logger.warning("No data has been loaded!")
                 self.parsed_data = [[]]
@@ -184,31 +564,239 @@ class DataManager:
                 self.parsed_data = [[]]
                 return
 
-            self.parsed_data = []
-            data = self.raw_data
+            if self.has_labels:
+                self.labels = tuple(str(x).strip() for x in self.raw_data[0])
+
+            is_categorical = self.predicted_data_type == DataType.Categorical
+            columns = len(self.raw_data[-1])
+            loadtxt_kwargs = {
+                "delimiter": delimiter,
+                "skiprows": self.first_row_end_line if self.has_labels else 0,
+                "comments": None,
+                "quotechar": '"',
+            }
+            try:
+                with open_bounded(self.filepath, self.byte_offset) as file:
+                    self.values = np.loadtxt(
+                        file,
+                        dtype=np.float64,
+                        usecols=range(1 if is_categorical else 0, columns),
+                        ndmin=2,
+                        **loadtxt_kwargs,
+                    )
+                if is_categorical:
+                    with warnings.catch_warnings(), open_bounded(
+                        self.filepath, self.byte_offset
+                    ) as file:
+                        # String columns are read in chunks, numpy warns about empty lines
+                        # not counting towards the chunk size, which doesn't concern us.
+                        warnings.simplefilter("ignore", UserWarning)
+                        self.categories = np.loadtxt(
+                            file,
+                            dtype=str,
+                            usecols=0,
+                            ndmin=1,
+                            **loadtxt_kwargs,
+                        )
+            except ValueError:
+                logger.exception(f"Failed to parse data from {self.filepath}")
+                self.predicted_data_type = DataType.Invalid
+                self.values = None
+                self.categories = None
+                self.parsed_data = [[]]
+                return
+
+            self.lines = self.values.shape[0]
+            self.__set_ranges(
+                np.column_stack(
+                    [self.values.min(axis=0), self.values.max(axis=0)]
+                ).tolist()
+            )
+
+        def stream_data(self, stream, delimiter=","):
+            """
+            Parses the file in chunks of 'stream.chunk_rows' rows into typed numpy columns.
+            Ranges are folded from all of the read rows, but only every 'stream.stride'-th row
+            is kept, until 'stream.row_budget' rows are kept.
+            """
+            if self.raw_data is None or self.predicted_data_type == DataType.Invalid:
+                logger.error("Invalid data loaded!")
+                self.parsed_data = [[]]
+                return
 
             if self.has_labels:
                 self.labels = tuple(str(x).strip() for x in self.raw_data[0])
-                start_idx = 1
-            else:
-                start_idx = 0
 
-            min_max = []
-            self.lines = 0
-            for i in range(start_idx, len(data)):
-                self.lines += 1
-                row_list = self.__get_row_list(self.raw_data[i])
-                if i == start_idx:
-                    min_max = [[val, val] for val in row_list]
-                else:
-                    for j, val in enumerate(row_list):
-                        if val < min_max[j][0]:
-                            min_max[j][0] = val
+            is_categorical = self.predicted_data_type == DataType.Categorical
+            columns = len(self.raw_data[-1])
+            loadtxt_kwargs = {
+                "delimiter": delimiter,
+                "comments": None,
+                "quotechar": '"',
+            }
+            value_chunks = []
+            category_chunks = []
+            minimum = None
+            maximum = None
+            read_rows = 0
+            kept_rows = 0
+            complete = True
+            with open_bounded(self.filepath, self.byte_offset) as file:
+                if self.has_labels:
+                    for _ in itertools.islice(file, self.first_row_end_line):
+                        pass
+
+                while True:
+                    lines = list(itertools.islice(file, stream.chunk_rows))
+                    if len(lines) == 0:
+                        break
+                    lines = [line for line in lines if line.strip()]
+                    if len(lines) == 0:
+                        continue
 
-                        if val > min_max[j][1]:
-                            min_max[j][1] = val
+                    try:
+                        values = np.loadtxt(
+                            lines,
+                            dtype=np.float64,
+                            usecols=range(1 if is_categorical else 0, columns),
+                            ndmin=2,
+                            **loadtxt_kwargs,
+                        )
+                    except ValueError:
+                        logger.exception(f"Failed to parse data from {self.filepath}")
+                        self.predicted_data_type = DataType.Invalid
+                        self.parsed_data = [[]]
+                        return
+
+                    # Stride continues across the chunks
+                    keep = np.arange(
+                        -read_rows % stream.stride, len(values), stream.stride
+                    )
+                    chunk_rows = len(values)
+                    remaining = stream.row_budget - kept_rows
+                    if stream.row_budget > 0 and len(keep) >= remaining:
+                        keep = keep[:remaining]
+                        # Rows after the last kept one are not counted as read
+                        values = values[: keep[-1] + 1]
+                        lines = lines[: keep[-1] + 1]
+
+                    chunk_min = values.min(axis=0)
+                    chunk_max = values.max(axis=0)
+                    minimum = (
+                        chunk_min if minimum is None else np.minimum(minimum, chunk_min)
+                    )
+                    maximum = (
+                        chunk_max if maximum is None else np.maximum(maximum, chunk_max)
+                    )
+                    read_rows += len(values)
+                    kept_rows += len(keep)
+                    value_chunks.append(values[keep])
+                    if is_categorical:
+                        categories = np.loadtxt(
+                            lines, dtype=str, usecols=0, ndmin=1, **loadtxt_kwargs
+                        )
+                        category_chunks.append(categories[keep])
+
+                    if stream.row_budget > 0 and kept_rows >= stream.row_budget:
+                        complete = len(values) == chunk_rows and not any(
+                            line.strip() for line in file
+                        )
+                        break
+
+            if kept_rows == 0:
+                logger.error(f"No data rows in {self.filepath}")
+                self.predicted_data_type = DataType.Invalid
+                self.parsed_data = [[]]
+                return
+
+            self.values = np.concatenate(value_chunks)
+            if is_categorical:
+                self.categories = np.concatenate(category_chunks)
+            self.lines = kept_rows
+            self.sampling = {
+                "stride": stream.stride,
+                "row_budget": stream.row_budget,
+                "read_rows": read_rows,
+                "loaded_rows": kept_rows,
+                "complete": complete,
+            }
+            self.__set_ranges(np.column_stack([minimum, maximum]).tolist())
+
+        def read_tail(self, delimiter=","):
+            """
+            Parses only the rows appended to the file since it was read and appends them to
+            the data. Row without a line end yet is left for the next call. Returns number of
+            appended rows, None if the file has to be read again, because it got smaller or
+            only a sample of it was loaded.
+            """
+            if self.values is None or self.predicted_data_type == DataType.Invalid:
+                return None
+            if self.sampling is not None:
+                return None
 
-                self.parsed_data.append(row_list)
+            size = os.path.getsize(self.filepath)
+            if size < self.byte_offset:
+                return None
+
+            with open(self.filepath, "rb") as file:
+                file.seek(self.byte_offset)
+                tail = file.read(size - self.byte_offset)
+
+            end = tail.rfind(b"\n") + 1
+            self.byte_offset += end
+            lines = [
+                line for line in tail[:end].decode("UTF-8").splitlines() if line.strip()
+            ]
+            if len(lines) == 0:
+                return 0
+
+            is_categorical = self.predicted_data_type == DataType.Categorical
+            first_column = 1 if is_categorical else 0
+            loadtxt_kwargs = {
+                "delimiter": delimiter,
+                "comments": None,
+                "quotechar": '"',
+            }
+            try:
+                values = np.loadtxt(
+                    lines,
+                    dtype=np.float64,
+                    usecols=range(first_column, first_column + self.values.shape[1]),
+                    ndmin=2,
+                    **loadtxt_kwargs,
+                )
+                if is_categorical:
+                    categories = np.loadtxt(
+                        lines, dtype=str, usecols=0, ndmin=1, **loadtxt_kwargs
+                    )
+            except ValueError:
+                logger.exception(f"Failed to parse appended rows of {self.filepath}")
+                return None
+
+            self.values = np.concatenate((self.values, values))
+            if is_categorical:
+                self.categories = np.concatenate((self.categories, categories))
+            self.lines = self.values.shape[0]
+            self.parsed_data = None
+            self.chart_data = None
+            # Ranges of columns are found by their count, keys of the old ranges would shift them
+            self.ranges = {}
+            self.__set_ranges(
+                np.column_stack(
+                    [self.values.min(axis=0), self.values.max(axis=0)]
+                ).tolist()
+            )
+            return len(values)
+
+        def is_sampled(self):
+            """Returns True if only part of the rows of the file were loaded"""
+            return describe_sampling(self.sampling) is not None
+
+        def __set_ranges(self, min_max):
+            """Sets ranges of axes from [min, max] of each numeric column"""
+            if self.predicted_data_type == DataType.Categorical:
+                # Categorical column is positioned by index of the category
+                min_max.insert(0, [0, self.lines - 1])
 
             self.ranges["x"] = min_max[0]
             if len(min_max) == 2 or self.predicted_data_type == DataType.Categorical:
@@ -233,8 +821,27 @@ class DataManager:
                         max(z_ranges, key=lambda x: x[1])[1],
                     ]
 
-            if self.predicted_data_type == DataType.Categorical:
-                self.ranges["x"] = [0, len(self.parsed_data) - 1]
+        @property
+        def parsed_data(self):
+            """
+            Rows of the data as lists, [category, values...] for categorical data. Built lazily
+            from the typed columns, as only the legacy charts need the row representation.
+            """
+            if self._parsed_data is None and self.values is not None:
+                if self.categories is not None:
+                    self._parsed_data = [
+                        [category, *row]
+                        for category, row in zip(
+                            self.categories.tolist(), self.values.tolist()
+                        )
+                    ]
+                else:
+                    self._parsed_data = self.values.tolist()
+            return self._parsed_data
+
+        @parsed_data.setter
+        def parsed_data(self, value):
+            self._parsed_data = value
 
         def get_parsed_data(self, subtype=None):
             if subtype:
@@ -259,10 +866,33 @@ class DataManager:
             else:
                 return self.parsed_data
 
+        def get_column(self, idx):
+            """
+            Returns column on index 'idx' of the rows in 'parsed_data' as array, taken from
+            the typed columns without building the rows
+            """
+            if self.categories is not None:
+                return self.categories if idx == 0 else self.values[:, idx - 1]
+            return self.values[:, idx]
+
+        def get_column_count(self):
+            """Returns number of columns of the rows in 'parsed_data'"""
+            if self.values is None:
+                return 0
+            return self.values.shape[1] + (1 if self.categories is not None else 0)
+
         def get_chart_data(self) -> typing.Optional[ChartData]:
-            if self.raw_data is None:
+            if self.values is None:
                 return None
-            return ChartData(self.parsed_data, self.labels if self.has_labels else [])
+            if self.chart_data is None:
+                self.chart_data = ChartData.from_columns(
+                    self.values,
+                    self.categories,
+                    self.labels if self.has_labels else [],
+                    self.sampling,
+                    self.filepath,
+                )
+            return self.chart_data
 
         def get_labels(self):
             return self.labels
@@ -289,7 +919,7 @@ class DataManager:
         def override(self, data_type, dims):
             if data_type != self.predicted_data_type or dims != self.dimensions:
                 if data_type == DataType.Categorical:
-                    self.ranges["x"] = (0, len(self.parsed_data) - 1)
+                    self.ranges["x"] = (0, self.lines - 1)
                 else:
                     if dims == 2 and self.dimensions == 3:
                         self.ranges["z"] = self.ranges["y"]
@@ -331,14 +961,6 @@ class DataManager:
                 for row in self.parsed_data:
                     print(row)
 
-        def __get_row_list(self, row):
-            if self.predicted_data_type == DataType.Categorical:
-                ret_list = [str(row[0])]
-                ret_list.extend([float(x) for x in row[1:]])
-                return ret_list
-            elif self.predicted_data_type == DataType.Numerical:
-                return [float(x) for x in row]
-
         def __calculate_subtypes(self):
             self.subtypes = []
             if self.dimensions == 2:
@@ -363,13 +985,22 @@ class DataManager:
                 self.animable,
             )
 
+    # How many rows are read to analyse the data type, header + first data row
+    SAMPLE_ROWS = 2
+
     instance = None
+    registry = DataRegistry()
 
     def __new__(cls):
         if not DataManager.instance:
             DataManager.instance = DataManager.__DataManager()
         return DataManager.instance
 
+    @staticmethod
+    def new_dataset():
+        """Creates new data holder, which is independent of the active data"""
+        return DataManager.__DataManager()
+
     def __getattr__(self, name):
         return getattr(self.instance, name)
 
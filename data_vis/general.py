@@ -4,11 +4,17 @@
 import bpy
 import math
 import typing
+import numpy as np
 
 from mathutils import Vector
 from .data_manager import DataManager, DataType
 from .icon_manager import IconManager
-from .utils.data_utils import find_axis_range, normalize_value
+from .utils.data_utils import (
+    find_axis_range,
+    normalize_value,
+    normalize_values,
+    range_mask,
+)
 from .colors import ColorType
 from .utils import data_vis_logging
 
@@ -24,7 +30,6 @@ class OBJECT_OT_GenericChart(bpy.types.Operator):
     bl_label = "Generic chart operator"
     bl_options = {"REGISTER", "UNDO", "INTERNAL"}
 
-    data = None
     axis_mat = None
     chart_id = 0
 
@@ -286,7 +291,20 @@ class OBJECT_OT_GenericChart(bpy.types.Operator):
             and self.prev_anim_setting != self.anim_settings.animate
         ):
             self.use_anim_range(self.anim_settings.animate)
-        self.data = self.dm.get_parsed_data(subtype=subtype)
+        self._data = None
+        self.data_subtype = subtype
+
+    @property
+    def data(self):
+        """
+        Rows of the data as lists, built only for charts working with rows, columns are
+        taken with 'self.dm.get_column'
+        """
+        if getattr(self, "_data", None) is None:
+            self._data = self.dm.get_parsed_data(
+                subtype=getattr(self, "data_subtype", None)
+            )
+        return self._data
 
     def init_labels(self):
         if not self.label_settings.create:
@@ -308,9 +326,9 @@ class OBJECT_OT_GenericChart(bpy.types.Operator):
                 self.label_settings.z_label,
             ]
 
-    def init_range(self, data):
-        self.axis_settings.x_range = find_axis_range(data, 0)
-        self.axis_settings.y_range = find_axis_range(data, 1)
+    def init_range(self):
+        self.axis_settings.x_range = find_axis_range(self.dm, 0)
+        self.axis_settings.y_range = find_axis_range(self.dm, 1)
 
     def in_axis_range_bounds_new(self, entry):
         """
@@ -340,6 +358,30 @@ class OBJECT_OT_GenericChart(bpy.types.Operator):
 
         return True
 
+    def in_axis_range_mask(self):
+        """
+        Returns boolean mask of the data entries that are within user selected axis range,
+        same as calling 'in_axis_range_bounds_new' on each of them
+        """
+        mask = np.ones(self.dm.lines, dtype=bool)
+        if self.dm.lines == 0:
+            return mask
+
+        entry_dims = self.dm.get_column_count()
+        if entry_dims >= 2:
+            if (
+                hasattr(self, "data_type")
+                and self.data_type_as_enum() != DataType.Numerical
+            ):
+                return mask
+
+            mask &= range_mask(self.dm.get_column(0), self.axis_settings.x_range)
+
+        if entry_dims >= 3:
+            mask &= range_mask(self.dm.get_column(1), self.axis_settings.y_range)
+
+        return mask
+
     def select_container(self):
         """Makes container object active and selects it"""
         bpy.ops.object.select_all(action="DESELECT")
@@ -373,24 +415,31 @@ class OBJECT_OT_GenericChart(bpy.types.Operator):
         """Returns chart container name"""
         return self.container_object.name
 
-    def normalize_value(self, value, direction):
-        axis_range = None
-        size = None
+    def get_axis_range_and_size(self, direction):
+        """Returns axis range and container size in 'direction', or (None, None)"""
         if direction == "x":
-            axis_range = self.axis_settings.x_range
-            size = self.container_size[0]
+            return self.axis_settings.x_range, self.container_size[0]
         elif direction == "y":
-            axis_range = self.axis_settings.y_range
-            size = self.container_size[1]
+            return self.axis_settings.y_range, self.container_size[1]
         elif direction == "z":
-            axis_range = self.axis_settings.z_range
-            size = self.container_size[2]
+            return self.axis_settings.z_range, self.container_size[2]
+        return None, None
 
+    def normalize_value(self, value, direction):
+        axis_range, size = self.get_axis_range_and_size(direction)
         if axis_range is None or size is None:
             return 0.5
 
         return size * normalize_value(value, axis_range[0], axis_range[1])
 
+    def normalize_array(self, values, direction):
+        """Normalizes all of the 'values' at once, see 'normalize_value'"""
+        axis_range, size = self.get_axis_range_and_size(direction)
+        if axis_range is None or size is None:
+            return np.full(len(values), 0.5)
+
+        return size * normalize_values(values, axis_range[0], axis_range[1])
+
 
 # Code inspired from thread at blender.stackexchange
 # https://blender.stackexchange.com/questions/109711/how-to-popup-simple-message-box-from-python-console
@@ -10,7 +10,7 @@ from .charts import (
     DV_GN_SurfaceChart,
     DV_GN_PieChart,
 )
-from .data import DV_DataProperties, DV_RegenerateData
+from .data import DV_DataProperties, DV_RegenerateData, DV_RegenerateAllCharts
 from .components import (
     DV_AddAxis,
     DV_AddDataLabels,
@@ -22,6 +22,7 @@ from .animations import (
     DV_AddDataTransitionAnimation,
 )
 from .modifier_utils import DV_RemoveModifier
+from .library import DV_RefreshLibrary
 from .panel import DV_ChartPanel, DV_AxisPanel, DV_DataLabelsPanel
 
 CLASSES = [
@@ -33,6 +34,8 @@ CLASSES = [
     DV_GN_SurfaceChart,
     DV_GN_PieChart,
     DV_RegenerateData,
+    DV_RegenerateAllCharts,
+    DV_RefreshLibrary,
     DV_AddAxis,
     DV_AddDataLabels,
     DV_ChartPanel,
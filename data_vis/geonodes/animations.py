@@ -1,11 +1,12 @@
 # ©copyright Zdenek Dolezal 2024-, License GPL
 
 import bpy
+import numpy as np
 from . import data
 from . import components
 from . import modifier_utils
 from . import library
-from ..utils import data_vis_logging
+from ..utils import data_vis_logging, ui_memo
 
 
 def is_column_sk(sk: bpy.types.ShapeKey) -> bool:
@@ -42,11 +43,14 @@ def get_shape_keys_z_range(
     end_idx = min(len(obj.data.shape_keys.key_blocks) - 1, end_idx)
 
     key_blocks = obj.data.shape_keys.key_blocks
+    co = np.empty(len(obj.data.vertices) * 3, dtype=np.float32)
     for i in range(start_idx, end_idx + 1):
-        sk = key_blocks[i]
-        for v in sk.data:
-            min_z = min(v.co.z, min_z)
-            max_z = max(v.co.z, max_z)
+        if len(co) == 0:
+            break
+        key_blocks[i].data.foreach_get("co", co)
+        z = co[2::3]
+        min_z = min(float(z.min()), min_z)
+        max_z = max(float(z.max()), max_z)
 
     return min_z, max_z
 
@@ -82,7 +86,12 @@ class DV_AnimationOperator(bpy.types.Operator):
         ):
             return False
 
-        return data.DataTypeValue.is_animated(data.get_chart_data_type(context.object))
+        obj = context.active_object
+        return ui_memo.memoize_id(
+            obj,
+            ("is_animated", obj.get(data.DATA_VERSION_PROPERTY, 0)),
+            lambda: data.DataTypeValue.is_animated(data.get_chart_data_type(obj)),
+        )
 
 
 @data_vis_logging.logged_operator
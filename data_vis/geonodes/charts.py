@@ -1,6 +1,8 @@
 # ©copyright Zdenek Dolezal 2024-, License GPL
 
 import bpy
+import json
+import typing
 import mathutils
 import numpy as np
 import colorsys
@@ -9,10 +11,14 @@ from . import components
 from . import data
 from .. import preferences
 from .. import utils
-from ..utils import data_vis_logging
+from ..utils import data_vis_logging, env_utils, ui_memo
 from . import modifier_utils
 from ..data_manager import DataManager
 
+# Materials with the same key are shared between charts, the key is made from the material
+# type and the colors set in the material.
+MATERIAL_KEY_PROPERTY = "DV_MaterialKey"
+
 
 @data_vis_logging.logged_operator
 class DV_GN_Chart(bpy.types.Operator):
@@ -50,54 +56,201 @@ class DV_GN_Chart(bpy.types.Operator):
         modifier: bpy.types.NodesModifier,
         type_: library.MaterialType,
     ) -> None:
-        material = library.load_material(type_).copy()
+        colors = self._get_material_colors(type_)
+        key = json.dumps([type_, [[round(c, 4) for c in color] for color in colors]])
+        material = self._find_pooled_material(key)
+        if material is None:
+            material = library.load_material(type_).copy()
+            self._set_material_colors(material, type_, colors)
+            material[MATERIAL_KEY_PROPERTY] = key
+
+        modifier_utils.set_input(modifier, "Material", material)
+
+    def _find_pooled_material(self, key: str) -> bpy.types.Material | None:
+        """Returns material created for a previous chart with the same type and colors"""
+        for material in bpy.data.materials:
+            if material.library is None and material.get(MATERIAL_KEY_PROPERTY) == key:
+                return material
+        return None
+
+    def _get_material_colors(
+        self, type_: library.MaterialType
+    ) -> typing.List[mathutils.Vector]:
         base_color = mathutils.Color(self.color)
-        if type_ == library.MaterialType.GradientRandom:
-            color_ramp = material.node_tree.nodes["Color Ramp"].color_ramp
-            color_ramp.elements[0].color = self._calc_hsv(*base_color.hsv)
-            color_ramp.elements[1].color = self._calc_hsv(
-                base_color.h - 0.16, base_color.s, base_color.v
-            )
-        elif type_ == library.MaterialType.Gradient:
+        if type_ in {
+            library.MaterialType.GradientRandom,
+            library.MaterialType.Gradient,
+        }:
+            return [
+                self._calc_hsv(*base_color.hsv),
+                self._calc_hsv(base_color.h - 0.16, base_color.s, base_color.v),
+            ]
+        elif type_ == library.MaterialType.Sign:
+            return [
+                self._calc_hsv(*base_color.hsv),
+                self._calc_hsv(base_color.h - 0.5, base_color.s, base_color.v),
+            ]
+        elif type_ in {library.MaterialType.Constant, library.MaterialType.HueRandom}:
+            return [mathutils.Vector([*self.color, 1.0])]
+        else:
+            raise ValueError(f"Unknown material type {type_}")
+
+    def _set_material_colors(
+        self,
+        material: bpy.types.Material,
+        type_: library.MaterialType,
+        colors: typing.List[mathutils.Vector],
+    ) -> None:
+        if type_ in {
+            library.MaterialType.GradientRandom,
+            library.MaterialType.Gradient,
+        }:
             color_ramp = material.node_tree.nodes["Color Ramp"].color_ramp
-            color_ramp.elements[0].color = self._calc_hsv(*base_color.hsv)
-            color_ramp.elements[1].color = self._calc_hsv(
-                base_color.h - 0.16, base_color.s, base_color.v
-            )
+            color_ramp.elements[0].color = colors[0]
+            color_ramp.elements[1].color = colors[1]
         elif type_ == library.MaterialType.Sign:
-            material.node_tree.nodes["Mix"].inputs["A"].default_value = self._calc_hsv(
-                *base_color.hsv
-            )
-            material.node_tree.nodes["Mix"].inputs["B"].default_value = self._calc_hsv(
-                base_color.h - 0.5, base_color.s, base_color.v
-            )
+            material.node_tree.nodes["Mix"].inputs["A"].default_value = colors[0]
+            material.node_tree.nodes["Mix"].inputs["B"].default_value = colors[1]
         elif type_ == library.MaterialType.Constant:
             material.node_tree.nodes["Principled BSDF"].inputs[0].default_value = (
-                mathutils.Vector([*self.color, 1.0])
+                colors[0]
             )
         elif type_ == library.MaterialType.HueRandom:
             material.node_tree.nodes["Hue/Saturation/Value"].inputs[
                 "Color"
-            ].default_value = mathutils.Vector([*self.color, 1.0])
+            ].default_value = colors[0]
         else:
             raise ValueError(f"Unknown material type {type_}")
 
-        modifier_utils.set_input(modifier, "Material", material)
-
     def _calc_hsv(self, h: float, s: float, v: float) -> mathutils.Vector:
         if h < 0:
             h = 1.0 - h
         return mathutils.Vector([*colorsys.hsv_to_rgb(h, s, v), 1.0])
 
     def _set_default_ranges(self, data_modifier: bpy.types.NodesModifier) -> None:
-        chart_data = data.DataManager().get_chart_data()
-        min_, max_ = chart_data.get_padded_min_max()
+        # Ranges stored on the chart differ from the loaded data for aggregated charts
+        chart_data_info = data.get_chart_data_info(data_modifier.id_data)
+        min_, max_ = chart_data_info["min"], chart_data_info["max"]
+        if len(min_) == 2:
+            min_, max_ = [*min_, 0], [*max_, 0]
         modifier_utils.set_input(data_modifier, "Min Range", mathutils.Vector(min_))
         modifier_utils.set_input(data_modifier, "Max Range", mathutils.Vector(max_))
 
 
+class DV_GN_DataObjectChartMixin:
+    """
+    Creates the chart from data object made by 'data.create_data_object', in a background job
+    with progress when invoked from the UI. Charts using this implement
+    '_get_data_object_args', returning the arguments of 'data.create_data_object', and
+    '_setup_chart', adding modifiers and materials to the created data object.
+    """
+
+    # Set when invoked from the UI, scripts and 'EXEC' calls create the chart right away
+    run_in_background: bpy.props.BoolProperty(
+        default=False, options={"HIDDEN", "SKIP_SAVE"}
+    )
+
+    def invoke(self, context: bpy.types.Context, event: bpy.types.Event):
+        self.run_in_background = preferences.get_preferences(
+            context
+        ).generate_in_background
+        self._invoked = True
+        return super().invoke(context, event)
+
+    def execute(self, context: bpy.types.Context):
+        # Redo runs execute again with the stored properties on a new instance, without
+        # invoke and possibly without a window, the job can only be started when invoked
+        if context.window is None or not getattr(self, "_invoked", False):
+            self.run_in_background = False
+
+        if self.run_in_background:
+            return self._start_job(context)
+
+        try:
+            obj = data.create_data_object(**self._get_data_object_args(context))
+        except ValueError as e:
+            self.report({"ERROR"}, str(e))
+            return {"CANCELLED"}
+
+        self._setup_chart(context, obj)
+        return {"FINISHED"}
+
+    def modal(self, context: bpy.types.Context, event: bpy.types.Event):
+        if event.type == "ESC":
+            self._job.cancel()
+            self._end_job(context)
+            self.report({"INFO"}, "Chart creation cancelled")
+            return {"CANCELLED"}
+
+        if event.type != "TIMER" or not self._job.finished:
+            context.window_manager.progress_update(int(self._job.progress * 100))
+            return {"PASS_THROUGH"}
+
+        self._end_job(context)
+        if self._job.error is not None:
+            self.report({"ERROR"}, str(self._job.error))
+            return {"CANCELLED"}
+
+        self._setup_chart(context, self._job.result)
+        return {"FINISHED"}
+
+    def _start_job(self, context: bpy.types.Context):
+        self._job = data.create_data_object_job(**self._get_data_object_args(context))
+        self._job.start()
+        wm = context.window_manager
+        wm.progress_begin(0, 100)
+        self._timer = wm.event_timer_add(0.1, window=context.window)
+        wm.modal_handler_add(self)
+        return {"RUNNING_MODAL"}
+
+    def _end_job(self, context: bpy.types.Context) -> None:
+        wm = context.window_manager
+        wm.event_timer_remove(self._timer)
+        wm.progress_end()
+
+
 @data_vis_logging.logged_operator
-class DV_GN_BarChart(DV_GN_Chart):
+class DV_GN_BinnedChart(DV_GN_DataObjectChartMixin, DV_GN_Chart):
+    """Chart that can aggregate dense data into bins before the geometry is created"""
+
+    aggregation: bpy.props.EnumProperty(
+        name="Aggregation",
+        items=data.Aggregation.as_enum_items(),
+        description="How the data points are reduced into one element per bin",
+    )
+
+    bins_x: bpy.props.IntProperty(
+        name="Bins X",
+        description="Number of bins across X axis",
+        min=1,
+        default=20,
+    )
+
+    bins_y: bpy.props.IntProperty(
+        name="Bins Y",
+        description="Number of bins across Y axis, 2D data are binned only across X",
+        min=1,
+        default=20,
+    )
+
+    def _draw_aggregation(self, layout: bpy.types.UILayout) -> None:
+        layout.prop(self, "aggregation")
+        if self.aggregation != data.Aggregation.NONE:
+            layout.prop(self, "bins_x")
+            if not data.DataTypeValue.is_2d(self.data_type):
+                layout.prop(self, "bins_y")
+
+    def _get_aggregation_config(self) -> data.AggregationConfig | None:
+        if self.aggregation == data.Aggregation.NONE:
+            return None
+
+        return data.AggregationConfig(
+            method=self.aggregation, bins_x=self.bins_x, bins_y=self.bins_y
+        )
+
+
+@data_vis_logging.logged_operator
+class DV_GN_BarChart(DV_GN_BinnedChart):
     bl_idname = "data_vis.geonodes_bar_chart"
     bl_label = "Bar Chart"
     bl_description = "Creates a bar chart from selected data"
@@ -126,10 +279,18 @@ class DV_GN_BarChart(DV_GN_Chart):
         layout.prop(self, "data_type")
         layout.prop(prefs, "color_type")
         layout.prop(self, "color")
+        self._draw_aggregation(layout)
 
-    def execute(self, context: bpy.types.Context):
+    def _get_data_object_args(self, context: bpy.types.Context) -> dict:
+        return {
+            "name": "DV_BarChart",
+            "data_type": self.data_type,
+            "animation_storage": preferences.get_preferences(context).animation_storage,
+            "aggregation_config": self._get_aggregation_config(),
+        }
+
+    def _setup_chart(self, context: bpy.types.Context, obj: bpy.types.Object) -> None:
         prefs = preferences.get_preferences(context)
-        obj: bpy.types.Object = data.create_data_object("DV_BarChart", self.data_type)
         data_nodegroup = library.load_data_nodegroup()
         data_modifier: bpy.types.NodesModifier = obj.modifiers.new("Data", "NODES")
         data_modifier.node_group = data_nodegroup
@@ -145,11 +306,10 @@ class DV_GN_BarChart(DV_GN_Chart):
         self._add_chart_to_scene(context, obj)
         self._apply_material(chart_modifier, prefs.color_type)
         modifier_utils.add_used_materials_to_object(chart_modifier, obj)
-        return {"FINISHED"}
 
 
 @utils.data_vis_logging.logged_operator
-class DV_GN_PointChart(DV_GN_Chart):
+class DV_GN_PointChart(DV_GN_BinnedChart):
     bl_idname = "data_vis.geonodes_point_chart"
     bl_label = "Point Chart"
 
@@ -180,10 +340,18 @@ class DV_GN_PointChart(DV_GN_Chart):
         layout.prop(self, "data_type")
         layout.prop(prefs, "color_type")
         layout.prop(self, "color")
+        self._draw_aggregation(layout)
 
-    def execute(self, context: bpy.types.Context):
+    def _get_data_object_args(self, context: bpy.types.Context) -> dict:
+        return {
+            "name": "DV_PointChart",
+            "data_type": self.data_type,
+            "animation_storage": preferences.get_preferences(context).animation_storage,
+            "aggregation_config": self._get_aggregation_config(),
+        }
+
+    def _setup_chart(self, context: bpy.types.Context, obj: bpy.types.Object) -> None:
         prefs = preferences.get_preferences(context)
-        obj: bpy.types.Object = data.create_data_object("DV_PointChart", self.data_type)
         data_nodegroup = library.load_data_nodegroup()
         data_modifier: bpy.types.NodesModifier = obj.modifiers.new("Data", "NODES")
         data_modifier.node_group = data_nodegroup
@@ -199,11 +367,10 @@ class DV_GN_PointChart(DV_GN_Chart):
         self._add_chart_to_scene(context, obj)
         self._apply_material(chart_modifier, prefs.color_type)
         modifier_utils.add_used_materials_to_object(chart_modifier, obj)
-        return {"FINISHED"}
 
 
 @utils.data_vis_logging.logged_operator
-class DV_GN_LineChart(DV_GN_Chart):
+class DV_GN_LineChart(DV_GN_DataObjectChartMixin, DV_GN_Chart):
     bl_idname = "data_vis.geonodes_line_chart"
     bl_label = "Line Chart"
     bl_description = (
@@ -226,18 +393,46 @@ class DV_GN_LineChart(DV_GN_Chart):
         ),
     )
 
+    downsampling_method: bpy.props.EnumProperty(
+        name="Downsampling",
+        items=utils.downsampling.METHODS_ENUM,
+        description="How the data points are reduced before the line is created",
+    )
+
+    downsampling_target: bpy.props.IntProperty(
+        name="Target Points",
+        description="Maximum number of points of the line after downsampling",
+        min=3,
+        default=2000,
+    )
+
     def draw(self, context: bpy.types.Context) -> None:
         prefs = preferences.get_preferences(context)
         layout = self.layout
         layout.prop(self, "data_type")
         layout.prop(prefs, "color_type")
         layout.prop(self, "color")
+        layout.prop(self, "downsampling_method")
+        if self.downsampling_method != utils.downsampling.Method.NONE:
+            layout.prop(self, "downsampling_target")
+
+    def _get_data_object_args(self, context: bpy.types.Context) -> dict:
+        downsampling_config = None
+        if self.downsampling_method != utils.downsampling.Method.NONE:
+            downsampling_config = data.DownsamplingConfig(
+                method=self.downsampling_method, target=self.downsampling_target
+            )
 
-    def execute(self, context: bpy.types.Context):
+        return {
+            "name": "DV_LineChart",
+            "data_type": self.data_type,
+            "connect_edges": True,
+            "animation_storage": preferences.get_preferences(context).animation_storage,
+            "downsampling_config": downsampling_config,
+        }
+
+    def _setup_chart(self, context: bpy.types.Context, obj: bpy.types.Object) -> None:
         prefs = preferences.get_preferences(context)
-        obj: bpy.types.Object = data.create_data_object(
-            "DV_LineChart", self.data_type, connect_edges=True
-        )
         data_nodegroup = library.load_data_nodegroup()
         data_modifier: bpy.types.NodesModifier = obj.modifiers.new("Data", "NODES")
         data_modifier.node_group = data_nodegroup
@@ -251,11 +446,10 @@ class DV_GN_LineChart(DV_GN_Chart):
         self._add_chart_to_scene(context, obj)
         self._apply_material(modifier, prefs.color_type)
         modifier_utils.add_used_materials_to_object(modifier, obj)
-        return {"FINISHED"}
 
 
 @utils.data_vis_logging.logged_operator
-class DV_GN_SurfaceChart(DV_GN_Chart):
+class DV_GN_SurfaceChart(DV_GN_DataObjectChartMixin, DV_GN_Chart):
     bl_idname = "data_vis.geonodes_surface_chart"
     bl_label = "Surface Chart"
     bl_description = (
@@ -277,12 +471,25 @@ class DV_GN_SurfaceChart(DV_GN_Chart):
         ),
     )
 
+    interpolation_engine: bpy.props.EnumProperty(
+        name="Interpolation Engine",
+        items=utils.interpolation.ENGINES_ENUM,
+        description="How the data points are interpolated into the grid",
+    )
+
     rbf_function: bpy.props.EnumProperty(
         name="Interpolation Method",
         items=utils.interpolation.TYPES_ENUM,
         description="See: https://docs.scipy.org/doc/scipy/reference/generated/scipy.interpolate.Rbf.html",
     )
 
+    neighbors: bpy.props.IntProperty(
+        name="Neighbors",
+        description="Number of the nearest data points used to interpolate each grid point",
+        min=3,
+        default=utils.interpolation.DEFAULT_NEIGHBORS,
+    )
+
     grid_x: bpy.props.IntProperty(
         name="Grid X",
         description="Size of the interpolated grid across X axis",
@@ -299,9 +506,9 @@ class DV_GN_SurfaceChart(DV_GN_Chart):
 
     @classmethod
     def poll(cls, context: bpy.types.Context):
-        try:
-            import scipy
-        except ImportError:
+        if not ui_memo.memoize(
+            "scipy_installed", lambda: env_utils.is_module_installed("scipy")
+        ):
             return False
 
         return super().poll(context)
@@ -312,19 +519,35 @@ class DV_GN_SurfaceChart(DV_GN_Chart):
         layout.prop(self, "data_type")
         layout.prop(prefs, "color_type")
         layout.prop(self, "color")
-        layout.prop(self, "rbf_function")
+        layout.prop(self, "interpolation_engine")
+        if self.interpolation_engine in {
+            utils.interpolation.Engine.RBF,
+            utils.interpolation.Engine.RBF_LOCAL,
+        }:
+            layout.prop(self, "rbf_function")
+        if self.interpolation_engine == utils.interpolation.Engine.RBF_LOCAL:
+            layout.prop(self, "neighbors")
         layout.prop(self, "grid_x")
         layout.prop(self, "grid_y")
 
-    def execute(self, context: bpy.types.Context):
+    def _get_data_object_args(self, context: bpy.types.Context) -> dict:
         prefs = preferences.get_preferences(context)
-        obj: bpy.types.Object = data.create_data_object(
-            "DV_SurfaceChart",
-            self.data_type,
-            interpolation_config=data.InterpolationConfig(
-                method=self.rbf_function, m=self.grid_x, n=self.grid_y
+        return {
+            "name": "DV_SurfaceChart",
+            "data_type": self.data_type,
+            "interpolation_config": data.InterpolationConfig(
+                method=self.rbf_function,
+                m=self.grid_x,
+                n=self.grid_y,
+                engine=self.interpolation_engine,
+                neighbors=self.neighbors,
             ),
-        )
+            "animation_storage": prefs.animation_storage,
+            "interpolation_workers": prefs.interpolation_workers,
+        }
+
+    def _setup_chart(self, context: bpy.types.Context, obj: bpy.types.Object) -> None:
+        prefs = preferences.get_preferences(context)
         data_nodegroup = library.load_data_nodegroup()
         data_modifier: bpy.types.NodesModifier = obj.modifiers.new("Data", "NODES")
         data_modifier.node_group = data_nodegroup
@@ -339,10 +562,9 @@ class DV_GN_SurfaceChart(DV_GN_Chart):
         self._apply_material(modifier, prefs.color_type)
         modifier_utils.add_used_materials_to_object(modifier, obj)
 
-        for f in obj.data.polygons:
-            f.use_smooth = True
-
-        return {"FINISHED"}
+        obj.data.polygons.foreach_set(
+            "use_smooth", np.ones(len(obj.data.polygons), dtype=bool)
+        )
 
 
 @utils.data_vis_logging.logged_operator
@@ -1,19 +1,97 @@
 # ©copyright Zdenek Dolezal 2024-, License GPL
 
 import bpy
+import os
 import typing
 import json
 import math
 import numpy as np
 import dataclasses
+import hashlib
+import struct
+import zlib
+import weakref
 from ..data_manager import DataManager, DataType, ChartData
-from ..utils import data_vis_logging
+from ..utils import (
+    data_vis_logging,
+    mesh_utils,
+    interpolation,
+    jobs,
+    downsampling,
+    ui_memo,
+)
 import logging
 
 logger = logging.getLogger("data_vis")
 
 W_ATTRIBUTE_NAME = "@w"
+# Animated Z columns stored as attributes are named "@z_0", "@z_1", ...
+Z_ATTRIBUTE_PREFIX = "@z_"
 DATA_TYPE_PROPERTY = "DV_DataType"
+# Bulk arrays of the chart data info, binary properties in a group, see '_pack_strings'
+DATA_ARRAYS_PROPERTY = "DV_DataArrays"
+# Incremented with each change of the chart data info, parsed info is cached for a version
+DATA_VERSION_PROPERTY = "DV_DataVersion"
+# Rows hashed together in the fingerprint of the data the chart was created from
+FINGERPRINT_CHUNK_ROWS = 4096
+# When regenerating in place, fewer changed rows are written one by one, more rows are
+# written with one 'foreach_set' of the whole layer
+PATCH_ROWS_LIMIT = 1024
+FINGERPRINT_DIGEST_SIZE = 8
+# Parsed chart data info for pointer of the object -> (version, info)
+_chart_data_info_cache: typing.Dict[
+    int, typing.Tuple[int, typing.Dict[str, typing.Any]]
+] = {}
+CHART_DATA_INFO_CACHE_SIZE = 512
+# Pointers of objects are reused in other files, forget everything when the memo is cleared
+ui_memo.add_invalidate_callback(_chart_data_info_cache.clear)
+
+
+class AnimationStorage:
+    """How the animated Z columns of the data are stored on the data object"""
+
+    SHAPE_KEYS = "SHAPE_KEYS"
+    ATTRIBUTES = "ATTRIBUTES"
+
+    @classmethod
+    def as_enum_items(cls):
+        return [
+            (
+                cls.SHAPE_KEYS,
+                "Shape Keys",
+                "Each animated column is a shape key, charts can be animated by the addon",
+            ),
+            (
+                cls.ATTRIBUTES,
+                "Attributes",
+                "Each animated column is a float point attribute named '@z_<column>', "
+                "lighter for large data, but the animation has to be set up manually",
+            ),
+        ]
+
+
+class Aggregation:
+    """How the values of the data points falling into one bin are reduced"""
+
+    NONE = "NONE"
+    COUNT = "COUNT"
+    MEAN = "MEAN"
+    MAX = "MAX"
+    SUM_W = "SUM_W"
+
+    @classmethod
+    def as_enum_items(cls):
+        return [
+            (cls.NONE, "None", "[DEFAULT] Each data point is one element of the chart"),
+            (cls.COUNT, "Count", "Number of data points in each bin"),
+            (cls.MEAN, "Mean", "Mean Z value of the data points in each bin"),
+            (cls.MAX, "Max", "Maximum Z value of the data points in each bin"),
+            (
+                cls.SUM_W,
+                "Sum of W",
+                "Sum of the W values of the data points in each bin, requires data with weights",
+            ),
+        ]
 
 
 class DataTypeValue:
@@ -48,10 +126,27 @@ class DataTypeValue:
         return "2D" in data
 
 
+# Data types detected for the ChartData instance, the DataManager keeps one ChartData per loaded
+# file, so a different instance means different data were loaded. The reference is weak, so
+# data evicted from the registry aren't kept alive.
+_data_types_cache: typing.Tuple[
+    weakref.ReferenceType[ChartData] | None, typing.Set[str]
+] = (None, set())
+
+
 def get_data_types() -> typing.Set[str]:
-    types = set()
+    global _data_types_cache
     dm = DataManager()
-    shape = dm.get_chart_data().parsed_data.shape
+    chart_data = dm.get_chart_data()
+    if chart_data is None:
+        return set()
+
+    cached_chart_data_ref, cached_types = _data_types_cache
+    if cached_chart_data_ref is not None and cached_chart_data_ref() is chart_data:
+        return set(cached_types)
+
+    types = set()
+    shape = chart_data.parsed_data.shape
     if dm.predicted_data_type == DataType.Numerical:
         if shape[1] > 1:
             types.update({DataTypeValue.Data2D})
@@ -67,7 +162,8 @@ def get_data_types() -> typing.Set[str]:
         if shape[1] > 2:
             types.update({DataTypeValue.CATEGORIC_Data2DA})
 
-    return types
+    _data_types_cache = (weakref.ref(chart_data), types)
+    return set(types)
 
 
 class DV_DataProperties(bpy.types.PropertyGroup):
@@ -148,32 +244,184 @@ def _store_chart_data_info(
     data_type: str,
     connect_edges: bool = False,
     interpolation_config: typing.Optional["InterpolationConfig"] = None,
+    animation_storage: str = AnimationStorage.SHAPE_KEYS,
+    downsampling_config: typing.Optional["DownsamplingConfig"] = None,
+    aggregation_config: typing.Optional["AggregationConfig"] = None,
 ) -> None:
+    min_, max_ = list(chart_data.min_), list(chart_data.max_)
+    if aggregation_config is not None:
+        # Aggregated values have their own range, 2D data columns are [x, z, (w)]
+        z_index = 1 if DataTypeValue.is_2d(data_type) else 2
+        min_[z_index] = float(data.vert_positions[:, 2].min(initial=0.0))
+        max_[z_index] = float(data.vert_positions[:, 2].max(initial=0.0))
+
     data_dict = {
         "data_type": data_type,
         "shape": verts.shape,
-        "min": list(chart_data.min_),
-        "max": list(chart_data.max_),
+        "min": min_,
+        "max": max_,
         "connect_edges": connect_edges,
+        "animation_storage": animation_storage,
     }
+    data_dict["fingerprint"] = _data_fingerprint(chart_data)
+    data_dict["content_hash"] = _content_hash(data_dict["fingerprint"])
     if interpolation_config is not None:
         data_dict["interpolation"] = dataclasses.asdict(interpolation_config)
+    if downsampling_config is not None:
+        data_dict["downsampling"] = dataclasses.asdict(downsampling_config)
+    if aggregation_config is not None:
+        data_dict["aggregation"] = dataclasses.asdict(aggregation_config)
+    if chart_data.filepath is not None:
+        data_dict["filepath"] = chart_data.filepath
+    if chart_data.sampling is not None:
+        data_dict["sampling"] = chart_data.sampling
     if data is not None:
         if data.categories is not None:
             data_dict["categories"] = data.categories.tolist()
         if data.axis_labels is not None:
             data_dict["axis_labels"] = data.axis_labels
 
-    obj[DATA_TYPE_PROPERTY] = json.dumps(data_dict)
+    _write_chart_data_info(obj, data_dict)
+
+
+def _pack_strings(strings: typing.Iterable[str]) -> bytes:
+    """Compressed count of the strings followed by the strings separated by NUL"""
+    strings = [str(string).encode("UTF-8") for string in strings]
+    return zlib.compress(struct.pack("<I", len(strings)) + b"\0".join(strings))
+
+
+def _unpack_strings(packed: bytes) -> typing.List[str]:
+    content = zlib.decompress(packed)
+    (count,) = struct.unpack_from("<I", content)
+    if count == 0:
+        return []
+    return [string.decode("UTF-8") for string in content[4:].split(b"\0")]
+
+
+def _write_chart_data_info(
+    obj: bpy.types.Object, data_dict: typing.Dict[str, typing.Any]
+) -> None:
+    """
+    Stores small fixed header of 'data_dict' as JSON, the arrays that grow with the data
+    are stored as binary properties, so the header stays cheap to parse.
+    """
+    header = dict(data_dict)
+    arrays = {}
+    for key in ("categories", "axis_labels"):
+        if key in header:
+            arrays[key] = _pack_strings(header.pop(key))
+    if "fingerprint" in header:
+        header["fingerprint"] = dict(header["fingerprint"])
+        hashes = header["fingerprint"].pop("hashes")
+        arrays["hashes"] = bytes.fromhex("".join(hashes))
+
+    version = obj.get(DATA_VERSION_PROPERTY, 0) + 1
+    obj[DATA_TYPE_PROPERTY] = json.dumps(header)
+    obj[DATA_ARRAYS_PROPERTY] = arrays
+    obj[DATA_VERSION_PROPERTY] = version
+    _cache_chart_data_info(obj, version, data_dict)
+
+
+def _cache_chart_data_info(
+    obj: bpy.types.Object, version: int, info: typing.Dict[str, typing.Any]
+) -> None:
+    if len(_chart_data_info_cache) >= CHART_DATA_INFO_CACHE_SIZE:
+        _chart_data_info_cache.clear()
+    _chart_data_info_cache[obj.as_pointer()] = (version, info)
+
+
+def _data_fingerprint(chart_data: ChartData) -> typing.Dict[str, typing.Any]:
+    """
+    Row count, column count and hashes of chunks of rows of the parsed data. Computed once
+    for the loaded data and stored on 'chart_data', charts of one file share it.
+    """
+    if chart_data.fingerprint is not None:
+        return chart_data.fingerprint
+
+    parsed_data = chart_data.parsed_data
+    hashes = []
+    for start in range(0, len(parsed_data), FINGERPRINT_CHUNK_ROWS):
+        chunk = parsed_data[start : start + FINGERPRINT_CHUNK_ROWS]
+        hasher = hashlib.blake2b(digest_size=FINGERPRINT_DIGEST_SIZE)
+        if chunk.dtype == object:
+            # Categorical data keep the category strings next to the values
+            hasher.update("\0".join(chunk[:, 0].tolist()).encode())
+            hasher.update(chunk[:, 1:].astype(np.float64).tobytes())
+        else:
+            hasher.update(np.ascontiguousarray(chunk).tobytes())
+        hashes.append(hasher.hexdigest())
+
+    chart_data.fingerprint = {
+        "rows": len(parsed_data),
+        "columns": parsed_data.shape[1],
+        "chunk_rows": FINGERPRINT_CHUNK_ROWS,
+        "hashes": hashes,
+    }
+    return chart_data.fingerprint
+
+
+def _content_hash(fingerprint: typing.Dict[str, typing.Any]) -> str:
+    """Hash of the whole data, made from the hashes of their chunks"""
+    content = json.dumps([fingerprint["columns"], fingerprint["hashes"]]).encode()
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def _changed_rows(
+    old_fingerprint: typing.Dict[str, typing.Any],
+    new_fingerprint: typing.Dict[str, typing.Any],
+) -> np.ndarray:
+    """Returns indices of the rows of the old data that are different in the new data"""
+    chunk_rows = old_fingerprint["chunk_rows"]
+    old_rows = old_fingerprint["rows"]
+    changed_chunks = [
+        i
+        for i, hash_ in enumerate(old_fingerprint["hashes"])
+        if i >= len(new_fingerprint["hashes"]) or new_fingerprint["hashes"][i] != hash_
+    ]
+    if len(changed_chunks) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    return np.concatenate(
+        [
+            np.arange(i * chunk_rows, min((i + 1) * chunk_rows, old_rows))
+            for i in changed_chunks
+        ]
+    )
 
 
 def get_chart_data_info(obj: bpy.types.Object) -> typing.Dict[str, typing.Any]:
+    """
+    Returns the stored chart data info, parsed only when its version changes. The returned
+    dictionary is shared and must not be modified.
+    """
+    if DATA_TYPE_PROPERTY not in obj:
+        return {}
+
+    version = obj.get(DATA_VERSION_PROPERTY, 0)
+    cached = _chart_data_info_cache.get(obj.as_pointer(), None)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
     try:
-        return json.loads(obj.get(DATA_TYPE_PROPERTY, "{}"))
+        info = json.loads(obj[DATA_TYPE_PROPERTY])
+        # Charts created before the arrays were split have everything in the header
+        arrays = obj.get(DATA_ARRAYS_PROPERTY, {})
+        for key in ("categories", "axis_labels"):
+            if key in arrays:
+                info[key] = _unpack_strings(arrays[key])
+        if "hashes" in arrays:
+            hashes = bytes(arrays["hashes"])
+            info["fingerprint"]["hashes"] = [
+                hashes[i : i + FINGERPRINT_DIGEST_SIZE].hex()
+                for i in range(0, len(hashes), FINGERPRINT_DIGEST_SIZE)
+            ]
     except Exception:
         logger.exception(f"Failed to parse stored data on {obj.name}")
         return None
 
+    _cache_chart_data_info(obj, version, info)
+    return info
+
 
 def get_chart_data_type(obj: bpy.types.Object) -> str:
     chart_data_info = get_chart_data_info(obj)
@@ -225,11 +473,136 @@ def _preprocess_data(data, data_type: str) -> PreprocessedData:
     return PreprocessedData(vert_positions, ws, z_ns, categories, axis_labels=[])
 
 
+@dataclasses.dataclass
+class AggregationConfig:
+    method: str
+    bins_x: int
+    bins_y: int
+
+
+def _bin_indices(values: np.ndarray, bins: int) -> tuple[np.ndarray, np.ndarray]:
+    """Returns index of the bin of each value and centers of the 'bins' equal bins"""
+    min_, max_ = values.min(), values.max()
+    edges = np.linspace(min_, max_, bins + 1)
+    centers = (edges[:-1] + edges[1:]) / 2.0
+    if max_ == min_:
+        return np.zeros(len(values), dtype=np.int64), centers
+
+    indices = ((values - min_) / (max_ - min_) * bins).astype(np.int64)
+    return np.clip(indices, 0, bins - 1), centers
+
+
+def _reduce_bins(
+    bin_ids: np.ndarray, counts: np.ndarray, values: np.ndarray, method: str
+) -> np.ndarray:
+    """Reduces 'values' of shape (N, K) into (bins, K) array by 'bin_ids'"""
+    reduced = np.empty((len(counts), values.shape[1]))
+    for i, column in enumerate(values.T):
+        if method == Aggregation.MAX:
+            reduced[:, i] = -np.inf
+            np.maximum.at(reduced[:, i], bin_ids, column)
+        else:
+            reduced[:, i] = np.bincount(bin_ids, column, minlength=len(counts))
+            if method == Aggregation.MEAN:
+                reduced[:, i] /= np.maximum(counts, 1)
+    return reduced
+
+
+def _aggregate_data(
+    data: PreprocessedData, data_type: str, aggregation_config: AggregationConfig
+) -> PreprocessedData:
+    """
+    Bins the data points into a grid over X and Y and returns one point for each non-empty
+    bin, positioned in the center of the bin with Z being the reduced value. 2D data are
+    binned only over X.
+    """
+    method = aggregation_config.method
+    if DataTypeValue.is_categorical(data_type):
+        raise ValueError("Categorical data can't be aggregated")
+    if method == Aggregation.SUM_W and data.ws is None:
+        raise ValueError("Sum of W aggregation requires data with weights")
+
+    bins_y = 1 if DataTypeValue.is_2d(data_type) else aggregation_config.bins_y
+    x_ids, x_centers = _bin_indices(
+        data.vert_positions[:, 0], aggregation_config.bins_x
+    )
+    y_ids, y_centers = _bin_indices(data.vert_positions[:, 1], bins_y)
+    if bins_y == 1:
+        y_centers[:] = 0.0
+    bin_ids = x_ids * bins_y + y_ids
+    counts = np.bincount(bin_ids, minlength=aggregation_config.bins_x * bins_y)
+    filled = counts > 0
+
+    if method == Aggregation.COUNT:
+        values = counts[:, np.newaxis].astype(np.float64)
+    elif method == Aggregation.SUM_W:
+        values = _reduce_bins(bin_ids, counts, data.ws[:, np.newaxis], method)
+    else:
+        columns = data.vert_positions[:, 2:3]
+        if data.z_ns is not None:
+            columns = np.hstack((columns, data.z_ns))
+        values = _reduce_bins(bin_ids, counts, columns, method)
+    values = values[filled]
+
+    xs, ys = np.meshgrid(x_centers, y_centers, indexing="ij")
+    vert_positions = np.column_stack((xs.ravel(), ys.ravel(), np.zeros(len(counts))))
+    vert_positions = vert_positions[filled]
+    vert_positions[:, 2] = values[:, 0]
+
+    ws = None
+    if data.ws is not None:
+        ws = values[:, 0]
+        if method != Aggregation.SUM_W:
+            ws = _reduce_bins(
+                bin_ids, counts, data.ws[:, np.newaxis], Aggregation.MEAN
+            )[filled, 0]
+
+    z_ns = None
+    if data.z_ns is not None:
+        if values.shape[1] > 1:
+            z_ns = values[:, 1:]
+        else:
+            # Count and sum of W don't change in time
+            z_ns = np.repeat(values, data.z_ns.shape[1], axis=1)
+
+    return PreprocessedData(vert_positions, ws, z_ns, None, data.axis_labels)
+
+
 @dataclasses.dataclass
 class InterpolationConfig:
     method: str
     m: int
     n: int
+    engine: str = interpolation.Engine.RBF
+    neighbors: int = interpolation.DEFAULT_NEIGHBORS
+
+
+@dataclasses.dataclass
+class DownsamplingConfig:
+    method: str
+    target: int
+
+
+def _downsample_data(
+    data: PreprocessedData, downsampling_config: DownsamplingConfig
+) -> None:
+    """Keeps only the rows of 'data' picked by the downsampling, Z is used as the value"""
+    indices = downsampling.downsample_indices(
+        data.vert_positions[:, 0],
+        data.vert_positions[:, 2],
+        downsampling_config.target,
+        downsampling_config.method,
+    )
+    if len(indices) == len(data.vert_positions):
+        return
+
+    data.vert_positions = data.vert_positions[indices]
+    if data.ws is not None:
+        data.ws = data.ws[indices]
+    if data.z_ns is not None:
+        data.z_ns = data.z_ns[indices]
+    if data.categories is not None:
+        data.categories = data.categories[indices]
 
 
 def _convert_data_to_geometry(
@@ -237,19 +610,20 @@ def _convert_data_to_geometry(
     chart_data: ChartData,
     connect_edges: bool = False,
     interpolation_config: InterpolationConfig | None = None,
-) -> tuple[list, list, list, PreprocessedData]:
+    interpolation_workers: int = 0,
+    downsampling_config: DownsamplingConfig | None = None,
+    aggregation_config: AggregationConfig | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, PreprocessedData]:
     data = _preprocess_data(chart_data.parsed_data, data_type)
     data.axis_labels = chart_data.labels
-    verts = []
-    edges = []
-    faces = []
+    if aggregation_config is not None:
+        data = _aggregate_data(data, data_type, aggregation_config)
+    if downsampling_config is not None:
+        _downsample_data(data, downsampling_config)
+    edges = np.empty((0, 2), dtype=np.int32)
+    faces = np.empty((0, 4), dtype=np.int32)
     # 1D array of categories in order of their values
     if interpolation_config is not None:
-        try:
-            from scipy import interpolate
-            import numpy as np
-        except ImportError:
-            raise RuntimeError("SciPy is required for this operation")
         x = np.linspace(
             data.vert_positions[:, 0].min(),
             data.vert_positions[:, 0].max(),
@@ -260,97 +634,492 @@ def _convert_data_to_geometry(
             data.vert_positions[:, 1].max(),
             interpolation_config.n,
         )
-        X, Y = np.meshgrid(x, y)
-
-        # Interpolate data points into a grid
-        data_x = data.vert_positions[:, 0]
-        data_y = data.vert_positions[:, 1]
-        res = interpolate.Rbf(
-            data_x,
-            data_y,
-            data.vert_positions[:, 2],
-            function=interpolation_config.method,
-        )(X, Y)
 
+        # Interpolate data points and all of the animated columns into a grid at once
+        columns = data.vert_positions[:, 2:3]
         if data.z_ns is not None:
-            # Interpolate data points for animation into a grid
-            data.z_ns = np.array(
-                [
-                    interpolate.Rbf(
-                        data_x,
-                        data_y,
-                        z,
-                        function=interpolation_config.method,
-                    )(X, Y).reshape(-1)
-                    for z in data.z_ns.T
-                ]
-            ).T
-
-        for row in range(interpolation_config.m):
-            for col in range(interpolation_config.n):
-                verts.append(
-                    (
-                        col / interpolation_config.m,
-                        row / interpolation_config.n,
-                        res[col][row],
-                    )
-                )
-                if (
-                    row < interpolation_config.m - 1
-                    and col < interpolation_config.n - 1
-                ):
-                    faces.append(
-                        (
-                            col * interpolation_config.m + row,
-                            (col + 1) * interpolation_config.m + row,
-                            (col + 1) * interpolation_config.m + 1 + row,
-                            col * interpolation_config.m + 1 + row,
-                        )
-                    )
+            columns = np.hstack((columns, data.z_ns))
+
+        interpolated = interpolation.interpolate_grid(
+            data.vert_positions[:, 0],
+            data.vert_positions[:, 1],
+            columns,
+            x,
+            y,
+            engine=interpolation_config.engine,
+            function=interpolation_config.method,
+            neighbors=interpolation_config.neighbors,
+            workers=interpolation_workers,
+        )
+        res = interpolated[..., 0]
+        if data.z_ns is not None:
+            data.z_ns = interpolated[..., 1:].reshape(-1, data.z_ns.shape[1])
 
-        return np.array(verts), edges, faces, data
+        m, n = interpolation_config.m, interpolation_config.n
+        rows, cols = np.meshgrid(np.arange(m), np.arange(n), indexing="ij")
+        verts = np.column_stack((cols.ravel() / m, rows.ravel() / n, res.T.ravel()))
+        return verts, edges, mesh_utils.grid_faces(m, n), data
     else:
         if connect_edges:
-            edges = [(i, i + 1) for i in range(len(data.vert_positions) - 1)]
+            indices = np.arange(len(data.vert_positions))
+            edges = np.column_stack((indices[:-1], indices[1:]))
 
         return data.vert_positions, edges, faces, data
 
 
+def _iter_animation_shape_keys(
+    obj: bpy.types.Object, z_ns: np.ndarray
+) -> typing.Iterator[int]:
+    """Adds one shape key for each column of 'z_ns', changing Z of the basis positions"""
+    mesh: bpy.types.Mesh = obj.data
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    co = co.reshape(-1, 3)
+
+    obj.shape_key_add(name="Basis")
+    mesh.shape_keys.name = "DV_Animation"
+    for i, z_col in enumerate(z_ns.T):
+        sk = obj.shape_key_add(name=f"Column: {i}", from_mix=False)
+        sk.value = 0
+        co[:, 2] = z_col
+        # Whole key is written at once, per vertex writes are too slow for large data
+        sk.data.foreach_set("co", co.ravel())
+        yield i
+
+
+def _iter_animation_attributes(
+    mesh: bpy.types.Mesh, z_ns: np.ndarray
+) -> typing.Iterator[int]:
+    """Stores each column of 'z_ns' as a float point attribute"""
+    for i, z_col in enumerate(z_ns.T):
+        attr = mesh.attributes.new(f"{Z_ATTRIBUTE_PREFIX}{i}", "FLOAT", "POINT")
+        attr.data.foreach_set("value", np.ascontiguousarray(z_col, dtype=np.float32))
+        yield i
+
+
+def _iter_animation_data(
+    obj: bpy.types.Object, z_ns: np.ndarray | None, animation_storage: str
+) -> typing.Iterator[int]:
+    """Adds the animated columns to 'obj', yields index of each added column"""
+    if z_ns is None:
+        return
+
+    if animation_storage == AnimationStorage.SHAPE_KEYS:
+        yield from _iter_animation_shape_keys(obj, z_ns)
+    elif animation_storage == AnimationStorage.ATTRIBUTES:
+        yield from _iter_animation_attributes(obj.data, z_ns)
+    else:
+        raise ValueError(f"Unknown animation storage {animation_storage}")
+
+
+def _add_animation_data(
+    obj: bpy.types.Object, z_ns: np.ndarray | None, animation_storage: str
+) -> None:
+    for _ in _iter_animation_data(obj, z_ns, animation_storage):
+        pass
+
+
+def get_animation_attribute_names(obj: bpy.types.Object) -> typing.List[str]:
+    """Returns names of attributes with animated Z columns in order of the columns"""
+    names = [
+        attr.name
+        for attr in obj.data.attributes
+        if attr.name.startswith(Z_ATTRIBUTE_PREFIX)
+    ]
+    return sorted(names, key=lambda name: int(name[len(Z_ATTRIBUTE_PREFIX) :]))
+
+
+def _write_rows(
+    collection: bpy.types.bpy_prop_collection,
+    prop: str,
+    values: np.ndarray,
+    rows: np.ndarray,
+) -> None:
+    """
+    Writes 'prop' of the items of 'collection' at 'rows', 'values' contain one value for each
+    item of the collection and have to be of the property type.
+    """
+    if len(rows) > PATCH_ROWS_LIMIT:
+        collection.foreach_set(prop, np.ascontiguousarray(values).ravel())
+        return
+
+    for row in rows:
+        setattr(collection[row], prop, values[row].tolist())
+
+
+def _update_data_object(
+    obj: bpy.types.Object,
+    chart_data: ChartData,
+    chart_data_info: typing.Dict[str, typing.Any],
+    data_type: str,
+    connect_edges: bool,
+    animation_storage: str,
+) -> typing.Optional[typing.Tuple[int, int]]:
+    """
+    Patches the data object with rows of 'chart_data' that changed or were appended since
+    the chart was created, based on the fingerprint stored in 'chart_data_info'. Returns
+    number of the updated and appended rows, or None if the object has to be rebuilt.
+    """
+    old_fingerprint = chart_data_info.get("fingerprint")
+    if old_fingerprint is None or any(
+        key in chart_data_info
+        for key in ("interpolation", "downsampling", "aggregation")
+    ):
+        return None
+
+    new_fingerprint = _data_fingerprint(chart_data)
+    old_rows, new_rows = old_fingerprint["rows"], new_fingerprint["rows"]
+    mesh: bpy.types.Mesh = obj.data
+    if (
+        old_fingerprint["columns"] != new_fingerprint["columns"]
+        or old_fingerprint["chunk_rows"] != new_fingerprint["chunk_rows"]
+        or old_rows == 0
+        or new_rows < old_rows
+        or len(mesh.vertices) != old_rows
+        or len(mesh.polygons) > 0
+    ):
+        return None
+
+    # Shape keys aren't resized when vertices are added to the mesh
+    if new_rows > old_rows and mesh.shape_keys is not None:
+        return None
+
+    data = _preprocess_data(chart_data.parsed_data, data_type)
+    data.axis_labels = chart_data.labels
+    if animation_storage == AnimationStorage.SHAPE_KEYS:
+        z_layers = [] if mesh.shape_keys is None else mesh.shape_keys.key_blocks[1:]
+    else:
+        z_layers = [
+            mesh.attributes[name] for name in get_animation_attribute_names(obj)
+        ]
+    if len(z_layers) != (0 if data.z_ns is None else data.z_ns.shape[1]):
+        return None
+
+    changed = _changed_rows(old_fingerprint, new_fingerprint)
+    appended = np.arange(old_rows, new_rows)
+    rows = np.concatenate((changed, appended))
+    positions = np.ascontiguousarray(data.vert_positions, dtype=np.float32)
+    if len(appended) > 0:
+        mesh.vertices.add(len(appended))
+        if connect_edges:
+            indices = np.arange(new_rows, dtype=np.int32)
+            edges = np.column_stack((indices[:-1], indices[1:]))
+            mesh.edges.add(len(appended))
+            _write_rows(mesh.edges, "vertices", edges, appended - 1)
+
+    _write_rows(mesh.vertices, "co", positions, rows)
+    if data.ws is not None:
+        _write_rows(
+            mesh.attributes[W_ATTRIBUTE_NAME].data,
+            "value",
+            data.ws.astype(np.float32),
+            rows,
+        )
+
+    if mesh.shape_keys is not None:
+        _write_rows(mesh.shape_keys.key_blocks[0].data, "co", positions, rows)
+    for layer, z_col in zip(z_layers, () if data.z_ns is None else data.z_ns.T):
+        if animation_storage == AnimationStorage.SHAPE_KEYS:
+            co = positions.copy()
+            co[:, 2] = z_col
+            _write_rows(layer.data, "co", co, rows)
+        else:
+            _write_rows(layer.data, "value", z_col.astype(np.float32), rows)
+
+    mesh.update()
+    _store_chart_data_info(
+        obj,
+        data.vert_positions,
+        chart_data,
+        data,
+        data_type,
+        connect_edges,
+        animation_storage=animation_storage,
+    )
+    return len(changed), len(appended)
+
+
+def build_data_object(
+    name: str,
+    data_type: str,
+    chart_data: ChartData,
+    geometry: tuple[np.ndarray, np.ndarray, np.ndarray, PreprocessedData],
+    connect_edges: bool = False,
+    interpolation_config: InterpolationConfig | None = None,
+    animation_storage: str = AnimationStorage.SHAPE_KEYS,
+    downsampling_config: DownsamplingConfig | None = None,
+    aggregation_config: AggregationConfig | None = None,
+) -> jobs.ApplySteps:
+    """
+    Creates the data object from 'geometry' returned by '_convert_data_to_geometry'. Yields
+    progress after each written chunk, the created object is returned when finished. If
+    closed before that, the partially created object is removed.
+    """
+    verts, edges, faces, data = geometry
+    columns = 0 if data.z_ns is None else data.z_ns.shape[1]
+    mesh = bpy.data.meshes.new(name)
+    obj = None
+    try:
+        mesh_utils.fill_mesh(mesh, verts, edges, faces)
+        if data.ws is not None:
+            attr = mesh.attributes.new(W_ATTRIBUTE_NAME, "FLOAT", "POINT")
+            attr.data.foreach_set("value", data.ws)
+
+        obj = bpy.data.objects.new(name, mesh)
+        obj.location = (0, 0, 0)
+        obj.scale = (1, 1, 1)
+        yield 1 / (columns + 1)
+
+        for i in _iter_animation_data(obj, data.z_ns, animation_storage):
+            yield (i + 2) / (columns + 1)
+
+        _store_chart_data_info(
+            obj,
+            verts,
+            chart_data,
+            data,
+            data_type,
+            connect_edges,
+            interpolation_config,
+            animation_storage,
+            downsampling_config,
+            aggregation_config,
+        )
+    except BaseException:
+        if obj is not None:
+            bpy.data.objects.remove(obj)
+        bpy.data.meshes.remove(mesh)
+        raise
+
+    return obj
+
+
 def create_data_object(
     name: str,
     data_type: str,
     connect_edges: bool = False,
     interpolation_config: InterpolationConfig | None = None,
+    animation_storage: str = AnimationStorage.SHAPE_KEYS,
+    interpolation_workers: int = 0,
+    downsampling_config: DownsamplingConfig | None = None,
+    aggregation_config: AggregationConfig | None = None,
 ) -> bpy.types.Object:
     chart_data = DataManager().get_chart_data()
-    verts, edges, faces, data = _convert_data_to_geometry(
-        data_type, chart_data, connect_edges, interpolation_config
+    geometry = _convert_data_to_geometry(
+        data_type,
+        chart_data,
+        connect_edges,
+        interpolation_config,
+        interpolation_workers,
+        downsampling_config,
+        aggregation_config,
+    )
+    return jobs.run_steps(
+        build_data_object(
+            name,
+            data_type,
+            chart_data,
+            geometry,
+            connect_edges,
+            interpolation_config,
+            animation_storage,
+            downsampling_config,
+            aggregation_config,
+        )
     )
-    mesh = bpy.data.meshes.new(name)
-    mesh.from_pydata(vertices=verts, edges=edges, faces=faces)
-    if data.ws is not None:
-        attr = mesh.attributes.new(W_ATTRIBUTE_NAME, "FLOAT", "POINT")
-        attr.data.foreach_set("value", data.ws)
 
-    obj = bpy.data.objects.new(name, mesh)
-    obj.location = (0, 0, 0)
-    obj.scale = (1, 1, 1)
 
-    if data.z_ns is not None:
-        # Create shape keys
-        obj.shape_key_add(name="Basis")
-        for i, z_col in enumerate(data.z_ns.transpose()):
-            sk = obj.shape_key_add(name=f"Column: {i}")
-            sk.value = 0
-            for j, z in enumerate(z_col):
-                sk.data[j].co.z = z
+def create_data_object_job(
+    name: str,
+    data_type: str,
+    connect_edges: bool = False,
+    interpolation_config: InterpolationConfig | None = None,
+    animation_storage: str = AnimationStorage.SHAPE_KEYS,
+    interpolation_workers: int = 0,
+    downsampling_config: DownsamplingConfig | None = None,
+    aggregation_config: AggregationConfig | None = None,
+) -> jobs.BackgroundJob:
+    """
+    Same as 'create_data_object', but the data are converted in a background thread and the
+    object is created in chunks from timers. The job has to be started.
+    """
+    chart_data = DataManager().get_chart_data()
+    return jobs.BackgroundJob(
+        lambda: _convert_data_to_geometry(
+            data_type,
+            chart_data,
+            connect_edges,
+            interpolation_config,
+            interpolation_workers,
+            downsampling_config,
+            aggregation_config,
+        ),
+        lambda geometry: build_data_object(
+            name,
+            data_type,
+            chart_data,
+            geometry,
+            connect_edges,
+            interpolation_config,
+            animation_storage,
+            downsampling_config,
+            aggregation_config,
+        ),
+    )
 
-        obj.data.shape_keys.name = "DV_Animation"
 
+def regenerate_data_object(
+    obj: bpy.types.Object,
+    chart_data: ChartData,
+    chart_data_info: typing.Dict[str, typing.Any],
+    interpolation_workers: int = 0,
+) -> typing.Optional[typing.Tuple[int, int]]:
+    """
+    Recomputes data object 'obj' from 'chart_data' with the settings stored in
+    'chart_data_info'. If only rows of the data changed, the object is patched in place and
+    number of the updated and appended rows is returned. Otherwise the mesh is replaced and
+    None is returned. Raises ValueError if the stored settings are invalid.
+    """
+    data_type = chart_data_info["data_type"]
+    interpolation_cfg_dict = chart_data_info.get("interpolation")
+    interpolation_cfg = None
+    if interpolation_cfg_dict is not None:
+        try:
+            interpolation_cfg = InterpolationConfig(
+                method=interpolation_cfg_dict.get("method"),
+                m=int(interpolation_cfg_dict.get("m")),
+                n=int(interpolation_cfg_dict.get("n")),
+                # Charts created before the engines were added used RBF
+                engine=interpolation_cfg_dict.get("engine", interpolation.Engine.RBF),
+                neighbors=int(
+                    interpolation_cfg_dict.get(
+                        "neighbors", interpolation.DEFAULT_NEIGHBORS
+                    )
+                ),
+            )
+        except Exception as exc:
+            raise ValueError("Invalid interpolation config stored on chart.") from exc
+    else:
+        interpolation_cfg = _infer_interpolation_config(obj)
+
+    connect_edges = chart_data_info.get("connect_edges")
+    if connect_edges is None:
+        connect_edges = _infer_connect_edges(obj)
+    connect_edges = bool(connect_edges)
+
+    downsampling_cfg = None
+    downsampling_cfg_dict = chart_data_info.get("downsampling")
+    if downsampling_cfg_dict is not None:
+        try:
+            downsampling_cfg = DownsamplingConfig(
+                method=downsampling_cfg_dict["method"],
+                target=int(downsampling_cfg_dict["target"]),
+            )
+        except Exception as exc:
+            raise ValueError("Invalid downsampling config stored on chart.") from exc
+
+    aggregation_cfg = None
+    aggregation_cfg_dict = chart_data_info.get("aggregation")
+    if aggregation_cfg_dict is not None:
+        try:
+            aggregation_cfg = AggregationConfig(
+                method=aggregation_cfg_dict["method"],
+                bins_x=int(aggregation_cfg_dict["bins_x"]),
+                bins_y=int(aggregation_cfg_dict["bins_y"]),
+            )
+        except Exception as exc:
+            raise ValueError("Invalid aggregation config stored on chart.") from exc
+
+    animation_storage = chart_data_info.get(
+        "animation_storage", AnimationStorage.SHAPE_KEYS
+    )
+    updated = _update_data_object(
+        obj,
+        chart_data,
+        chart_data_info,
+        data_type,
+        connect_edges,
+        animation_storage,
+    )
+    if updated is not None:
+        return updated
+
+    verts, edges, faces, preprocessed_data = _convert_data_to_geometry(
+        data_type,
+        chart_data,
+        connect_edges=connect_edges,
+        interpolation_config=interpolation_cfg,
+        interpolation_workers=interpolation_workers,
+        downsampling_config=downsampling_cfg,
+        aggregation_config=aggregation_cfg,
+    )
+
+    old_mesh = obj.data
+    old_mesh_name = old_mesh.name
+    old_materials = [mat for mat in old_mesh.materials]
+    new_mesh = bpy.data.meshes.new(old_mesh.name)
+    mesh_utils.fill_mesh(new_mesh, verts, edges, faces)
+    if preprocessed_data.ws is not None:
+        attr = new_mesh.attributes.new(W_ATTRIBUTE_NAME, "FLOAT", "POINT")
+        attr.data.foreach_set("value", preprocessed_data.ws)
+    for mat in old_materials:
+        if mat is not None:
+            new_mesh.materials.append(mat)
+
+    obj.data = new_mesh
+
+    _add_animation_data(obj, preprocessed_data.z_ns, animation_storage)
     _store_chart_data_info(
-        obj, verts, chart_data, data, data_type, connect_edges, interpolation_config
+        obj,
+        verts,
+        chart_data,
+        preprocessed_data,
+        data_type,
+        connect_edges,
+        interpolation_cfg,
+        animation_storage,
+        downsampling_cfg,
+        aggregation_cfg,
     )
-    return obj
+
+    if old_mesh != new_mesh and old_mesh.users == 0:
+        bpy.data.meshes.remove(old_mesh)
+        new_mesh.name = old_mesh_name
+
+    return None
+
+
+def _infer_interpolation_config(
+    obj: bpy.types.Object,
+) -> typing.Optional[InterpolationConfig]:
+    verts_count = len(obj.data.vertices)
+    faces_count = len(obj.data.polygons)
+    if verts_count == 0 or faces_count == 0:
+        return None
+
+    limit = int(math.sqrt(verts_count)) + 2
+    for m in range(2, limit):
+        if verts_count % m != 0:
+            continue
+        n = verts_count // m
+        if (m - 1) * (n - 1) == faces_count:
+            return InterpolationConfig(method="multiquadric", m=m, n=n)
+
+    return None
+
+
+def _infer_connect_edges(obj: bpy.types.Object) -> bool:
+    from . import components
+
+    for mod in obj.modifiers:
+        if (
+            mod.type == "NODES"
+            and mod.node_group is not None
+            and components.remove_duplicate_suffix(mod.node_group.name)
+            == "DV_LineChart"
+        ):
+            return True
+    return False
 
 
 @data_vis_logging.logged_operator
@@ -374,6 +1143,8 @@ class DV_RegenerateData(bpy.types.Operator):
         return components.is_chart(obj)
 
     def execute(self, context: bpy.types.Context):
+        from .. import preferences
+
         obj: bpy.types.Object = context.active_object
         chart_data = DataManager().get_chart_data()
         if chart_data is None:
@@ -397,115 +1168,92 @@ class DV_RegenerateData(bpy.types.Operator):
             )
             return {"CANCELLED"}
 
-        interpolation_cfg_dict = chart_data_info.get("interpolation")
-        interpolation_cfg = None
-        if interpolation_cfg_dict is not None:
-            try:
-                interpolation_cfg = InterpolationConfig(
-                    method=interpolation_cfg_dict.get("method"),
-                    m=int(interpolation_cfg_dict.get("m")),
-                    n=int(interpolation_cfg_dict.get("n")),
-                )
-            except Exception:
-                logger.exception("Failed to parse stored interpolation config")
-                self.report({"ERROR"}, "Invalid interpolation config stored on chart.")
-                return {"CANCELLED"}
-        else:
-            interpolation_cfg = self._infer_interpolation_config(obj)
-
-        connect_edges = chart_data_info.get("connect_edges")
-        if connect_edges is None:
-            connect_edges = self._infer_connect_edges(obj)
-        connect_edges = bool(connect_edges)
-
         try:
-            verts, edges, faces, preprocessed_data = _convert_data_to_geometry(
-                data_type,
+            updated = regenerate_data_object(
+                obj,
                 chart_data,
-                connect_edges=connect_edges,
-                interpolation_config=interpolation_cfg,
+                chart_data_info,
+                preferences.get_preferences(context).interpolation_workers,
             )
         except Exception as exc:
             logger.exception("Failed to regenerate chart data")
             self.report({"ERROR"}, str(exc))
             return {"CANCELLED"}
 
-        old_mesh = obj.data
-        old_mesh_name = old_mesh.name
-        old_materials = [mat for mat in old_mesh.materials]
-        new_mesh = bpy.data.meshes.new(old_mesh.name)
-        new_mesh.from_pydata(vertices=verts, edges=edges, faces=faces)
-        if preprocessed_data.ws is not None:
-            attr = new_mesh.attributes.new(W_ATTRIBUTE_NAME, "FLOAT", "POINT")
-            attr.data.foreach_set("value", preprocessed_data.ws)
-        for mat in old_materials:
-            if mat is not None:
-                new_mesh.materials.append(mat)
-
-        obj.data = new_mesh
-
-        if preprocessed_data.z_ns is not None:
-            obj.shape_key_add(name="Basis")
-            for i, z_col in enumerate(preprocessed_data.z_ns.transpose()):
-                sk = obj.shape_key_add(name=f"Column: {i}")
-                sk.value = 0
-                for j, z in enumerate(z_col):
-                    sk.data[j].co.z = z
-
-            obj.data.shape_keys.name = "DV_Animation"
-
-        _store_chart_data_info(
-            obj,
-            verts,
-            chart_data,
-            preprocessed_data,
-            data_type,
-            connect_edges,
-            interpolation_cfg,
-        )
-
-        if old_mesh != new_mesh and old_mesh.users == 0:
-            bpy.data.meshes.remove(old_mesh)
-            new_mesh.name = old_mesh_name
+        if updated is not None:
+            changed, appended = updated
+            self.report(
+                {"INFO"}, f"Updated {changed} and appended {appended} rows of the chart"
+            )
 
         return {"FINISHED"}
 
-    def _infer_interpolation_config(
-        self, obj: bpy.types.Object
-    ) -> typing.Optional[InterpolationConfig]:
-        verts_count = len(obj.data.vertices)
-        faces_count = len(obj.data.polygons)
-        if verts_count == 0 or faces_count == 0:
-            return None
-
-        limit = int(math.sqrt(verts_count)) + 2
-        for m in range(2, limit):
-            if verts_count % m != 0:
-                continue
-            n = verts_count // m
-            if (m - 1) * (n - 1) == faces_count:
-                return InterpolationConfig(method="multiquadric", m=m, n=n)
 
-        return None
+@data_vis_logging.logged_operator
+class DV_RegenerateAllCharts(bpy.types.Operator):
+    bl_idname = "data_vis.regenerate_all_charts"
+    bl_label = "Regenerate All Charts"
+    bl_description = (
+        "Recomputes mesh data of all charts from the files they were created from, each "
+        "file is read only once and unchanged charts are skipped"
+    )
+    bl_options = {"REGISTER", "UNDO"}
 
-    def _infer_connect_edges(self, obj: bpy.types.Object) -> bool:
+    def execute(self, context: bpy.types.Context):
         from . import components
+        from .. import preferences
 
-        for mod in obj.modifiers:
-            if (
-                mod.type == "NODES"
-                and mod.node_group is not None
-                and components.remove_duplicate_suffix(mod.node_group.name)
-                == "DV_LineChart"
-            ):
-                return True
-        return False
+        prefs = preferences.get_preferences(context)
+        charts_by_source: typing.Dict[str, typing.List[bpy.types.Object]] = {}
+        for obj in bpy.data.objects:
+            if obj.type != "MESH" or not components.is_chart(obj):
+                continue
+            filepath = (get_chart_data_info(obj) or {}).get("filepath")
+            if filepath is None:
+                continue
+            key = os.path.normcase(os.path.abspath(filepath))
+            charts_by_source.setdefault(key, []).append(obj)
+
+        regenerated = 0
+        up_to_date = 0
+        failed = 0
+        for filepath, charts in charts_by_source.items():
+            chart_data = DataManager.registry.get_chart_data(
+                filepath,
+                use_cache=prefs.cache_data,
+                stream=preferences.get_stream_settings(context),
+            )
+            if chart_data is None:
+                logger.error(f"Failed to load {filepath} for {len(charts)} charts")
+                failed += len(charts)
+                continue
 
+            content_hash = _content_hash(_data_fingerprint(chart_data))
+            for obj in charts:
+                chart_data_info = get_chart_data_info(obj)
+                if chart_data_info.get("content_hash") == content_hash:
+                    up_to_date += 1
+                    continue
+                try:
+                    regenerate_data_object(
+                        obj, chart_data, chart_data_info, prefs.interpolation_workers
+                    )
+                    regenerated += 1
+                except Exception:
+                    logger.exception(f"Failed to regenerate chart {obj.name}")
+                    failed += 1
+
+        message = (
+            f"Regenerated {regenerated} charts from {len(charts_by_source)} files, "
+            f"{up_to_date} up to date"
+        )
+        if failed > 0:
+            self.report({"WARNING"}, f"{message}, {failed} failed, see console")
+        else:
+            self.report({"INFO"}, message)
+        return {"FINISHED"}
 
-def is_data_suitable(acceptable: typing.Set[str]):
-    chart_data = DataManager().get_chart_data()
-    if chart_data is None:
-        return False
 
-    types = get_data_types()
+def is_data_suitable(acceptable: typing.Set[str]):
+    types = ui_memo.memoize("data_types", lambda: frozenset(get_data_types()))
     return len(acceptable & types) > 0
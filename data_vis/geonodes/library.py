@@ -2,6 +2,11 @@
 
 import bpy
 import os
+import typing
+import logging
+from ..utils import data_vis_logging
+
+logger = logging.getLogger("data_vis")
 
 
 class MaterialType:
@@ -30,7 +35,21 @@ GEONODES_BLENDS_PATH = os.path.abspath(
 )
 
 
-def _load_nodegroup(name: str, link: bool = True) -> bpy.types.NodeTree:
+# Modification time and size of the library file when it was last (re)loaded in this session
+_library_stamp: typing.Optional[typing.Tuple[int, int]] = None
+
+
+def _get_library_stamp() -> typing.Tuple[int, int]:
+    stat = os.stat(GEONODES_BLENDS_PATH)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _get_library(force_reload: bool = False) -> typing.Optional[bpy.types.Library]:
+    """
+    Returns the linked library if it was already linked. The library is reloaded only if the
+    file changed since it was loaded, reloading re-reads all of the linked datablocks.
+    """
+    global _library_stamp
     if not os.path.isfile(GEONODES_BLENDS_PATH):
         raise FileNotFoundError(
             f"Geometry nodes library couldn't be found at {GEONODES_BLENDS_PATH}"
@@ -39,11 +58,27 @@ def _load_nodegroup(name: str, link: bool = True) -> bpy.types.NodeTree:
     library: bpy.types.Library = bpy.data.libraries.get(
         os.path.basename(GEONODES_BLENDS_PATH)
     )
-    if library is not None:
+    stamp = _get_library_stamp()
+    if library is None:
+        # The library is read from the disk when it is linked for the first time
+        _library_stamp = stamp
+        return None
+
+    if force_reload or (_library_stamp is not None and _library_stamp != stamp):
+        logger.info(f"Reloading geometry nodes library {GEONODES_BLENDS_PATH}")
         library.reload()
 
-        if (name, library.filepath) in bpy.data.node_groups:
-            return bpy.data.node_groups[(name, library.filepath)]
+    # If the stamp isn't known, the library was read when the .blend file was opened
+    _library_stamp = stamp
+    return library
+
+
+def _load_nodegroup(name: str, link: bool = True) -> bpy.types.NodeTree:
+    library = _get_library()
+    if library is not None:
+        node_group = bpy.data.node_groups.get((name, library.filepath))
+        if node_group is not None:
+            return node_group
 
     with bpy.data.libraries.load(GEONODES_BLENDS_PATH, link=link) as (
         data_from,
@@ -56,19 +91,11 @@ def _load_nodegroup(name: str, link: bool = True) -> bpy.types.NodeTree:
 
 
 def load_material(name: str, link: bool = True) -> bpy.types.Material:
-    if not os.path.isfile(GEONODES_BLENDS_PATH):
-        raise FileNotFoundError(
-            f"Geometry nodes library couldn't be found at {GEONODES_BLENDS_PATH}"
-        )
-
-    library: bpy.types.Library = bpy.data.libraries.get(
-        os.path.basename(GEONODES_BLENDS_PATH)
-    )
+    library = _get_library()
     if library is not None:
-        library.reload()
-
-        if (name, library.filepath) in bpy.data.materials:
-            return bpy.data.materials[(name, library.filepath)]
+        material = bpy.data.materials.get((name, library.filepath))
+        if material is not None:
+            return material
 
     with bpy.data.libraries.load(GEONODES_BLENDS_PATH, link=link) as (
         data_from,
@@ -80,6 +107,25 @@ def load_material(name: str, link: bool = True) -> bpy.types.Material:
     return data_to.materials[0]
 
 
+@data_vis_logging.logged_operator
+class DV_RefreshLibrary(bpy.types.Operator):
+    bl_idname = "data_vis.refresh_library"
+    bl_label = "Refresh Library"
+    bl_description = (
+        "Reloads node groups and materials linked from the addon library, "
+        "use after changing the library file"
+    )
+    bl_options = {"REGISTER", "UNDO"}
+
+    def execute(self, context: bpy.types.Context):
+        if _get_library(force_reload=True) is None:
+            self.report({"INFO"}, "Library isn't linked in this file")
+            return {"CANCELLED"}
+
+        self.report({"INFO"}, "Library reloaded")
+        return {"FINISHED"}
+
+
 def load_data_nodegroup(link: bool = True) -> bpy.types.NodeTree:
     return _load_nodegroup("DV_Data", link)
 
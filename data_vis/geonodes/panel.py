@@ -1,11 +1,13 @@
 # ©copyright Zdenek Dolezal 2024-, License GPL
 
 import bpy
+import os
 from . import modifier_utils
 from . import components
 from . import animations
 from . import data
 from .. import preferences
+from .. import data_manager
 from ..icon_manager import IconManager
 
 
@@ -42,6 +44,16 @@ class DV_ChartPanel(bpy.types.Panel, DV_GN_PanelMixin):
             layout.label(text="Active object is not a valid chart")
             return
 
+        chart_data_info = data.get_chart_data_info(obj) or {}
+        sampling_text = data_manager.describe_sampling(
+            chart_data_info.get("sampling", None)
+        )
+        if sampling_text is not None:
+            layout.label(text=sampling_text, icon="INFO")
+        filepath = chart_data_info.get("filepath", None)
+        if filepath is not None:
+            layout.label(text=os.path.basename(filepath), icon="FILE")
+
         for mod in filter(
             lambda m: m.type == "NODES"
             and components.remove_duplicate_suffix(m.node_group.name) == "DV_Data",
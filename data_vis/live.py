@@ -0,0 +1,115 @@
+# ©copyright Zdenek Dolezal 2024-, License GPL
+# Live data mode. Files of the data list are polled for changes from a timer, rows appended
+# to them are parsed and the charts created from them are updated in place.
+
+import bpy
+import os
+import time
+import typing
+import logging
+
+from .data_manager import DataManager
+from .geonodes import components, data
+from . import preferences
+
+logger = logging.getLogger("data_vis")
+
+# Files seen by the poller, normalized filepath -> (mtime, size)
+_file_stamps: typing.Dict[str, typing.Tuple[int, int]] = {}
+# When were the charts of each file last updated, normalized filepath -> time.monotonic()
+_last_updates: typing.Dict[str, float] = {}
+
+
+def _normalize_path(filepath: str) -> str:
+    return os.path.normcase(os.path.abspath(filepath))
+
+
+def _get_charts(filepath: str) -> typing.List[bpy.types.Object]:
+    """Returns charts which data were loaded from 'filepath'"""
+    charts = []
+    for obj in bpy.data.objects:
+        if obj.type != "MESH" or not components.is_chart(obj):
+            continue
+        chart_data_info = data.get_chart_data_info(obj)
+        chart_filepath = (chart_data_info or {}).get("filepath")
+        if chart_filepath is not None and _normalize_path(chart_filepath) == filepath:
+            charts.append(obj)
+    return charts
+
+
+def update_file(
+    context: bpy.types.Context, item: bpy.types.PropertyGroup
+) -> typing.List[bpy.types.Object]:
+    """
+    Reads rows appended to the file of data list 'item' and updates charts created from it.
+    The file is read whole if it can't be only extended. Returns the updated charts.
+    """
+    if DataManager.registry.read_tail(item.filepath) is None:
+        logger.info(f"Reading changed file {item.filepath} again")
+    chart_data = item.get_chart_data()
+    if chart_data is None:
+        return []
+
+    data_list = context.scene.data_list
+    index = context.scene.data_list_index
+    if 0 <= index < len(data_list) and data_list[index].filepath == item.filepath:
+        # Active data are a copy of the dataset, refresh them from the registry
+        item.load()
+
+    interpolation_workers = preferences.get_preferences(context).interpolation_workers
+    updated = []
+    for obj in _get_charts(_normalize_path(item.filepath)):
+        try:
+            data.regenerate_data_object(
+                obj, chart_data, data.get_chart_data_info(obj), interpolation_workers
+            )
+            updated.append(obj)
+        except Exception:
+            logger.exception(f"Failed to update chart {obj.name} from live data")
+    return updated
+
+
+def _poll() -> float:
+    context = bpy.context
+    prefs = preferences.get_preferences(context)
+    if not prefs.live_data or context.scene is None:
+        return prefs.live_poll_interval
+
+    now = time.monotonic()
+    for item in context.scene.data_list:
+        filepath = _normalize_path(item.filepath)
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            continue
+
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        previous_stamp = _file_stamps.setdefault(filepath, stamp)
+        if stamp == previous_stamp:
+            continue
+
+        # Keep the change pending until the charts of the file can be updated again
+        if now - _last_updates.get(filepath, -float("inf")) < (
+            1.0 / prefs.live_max_update_rate
+        ):
+            continue
+
+        _file_stamps[filepath] = stamp
+        _last_updates[filepath] = now
+        try:
+            update_file(context, item)
+        except Exception:
+            logger.exception(f"Failed to update live data from {item.filepath}")
+
+    return prefs.live_poll_interval
+
+
+def register():
+    bpy.app.timers.register(_poll, first_interval=0.0, persistent=True)
+
+
+def unregister():
+    if bpy.app.timers.is_registered(_poll):
+        bpy.app.timers.unregister(_poll)
+    _file_stamps.clear()
+    _last_updates.clear()
@@ -1,6 +1,7 @@
 # ©copyright Zdenek Dolezal 2024-, License GPL
 
 import bpy
+import numpy as np
 
 from ..general import OBJECT_OT_GenericChart
 from ..properties import (
@@ -13,7 +14,16 @@ from ..properties import (
 from .features.axis import AxisFactory
 from ..data_manager import DataManager, DataType
 from ..icon_manager import IconManager
-from ..colors import ColoringFactory, ColorType
+from ..colors import (
+    ColoringFactory,
+    ColorType,
+    get_value_colors,
+    create_attribute_material,
+)
+from ..utils import mesh_utils
+
+# Face attribute with colors of the bars, when all bars are created as a single mesh
+BAR_COLOR_ATTRIBUTE = "DV_Color"
 
 
 class OBJECT_OT_BarChart(OBJECT_OT_GenericChart):
@@ -64,6 +74,15 @@ class OBJECT_OT_BarChart(OBJECT_OT_GenericChart):
 
     custom_obj_name: bpy.props.StringProperty(name="Custom")
 
+    single_mesh: bpy.props.BoolProperty(
+        name="Single Mesh",
+        description="Creates all bars as one mesh, much faster for large data. Colors are "
+        "stored in a face attribute read by one material instead of per bar materials, "
+        "'Use Shader' doesn't apply and Solid view shows the colors only with the "
+        "'Attribute' color",
+        default=False,
+    )
+
     @classmethod
     def poll(cls, context):
         dm = DataManager()
@@ -89,6 +108,7 @@ class OBJECT_OT_BarChart(OBJECT_OT_GenericChart):
         col.prop(self, "use_obj")
         if self.use_obj == "Custom":
             col.prop_search(self, "custom_obj_name", context.scene, "objects")
+        col.prop(self, "single_mesh")
 
         row = box.row()
         row.prop(self, "bar_size")
@@ -108,85 +128,82 @@ class OBJECT_OT_BarChart(OBJECT_OT_GenericChart):
         self.dm.override(self.data_type_as_enum(), int(self.dimensions))
 
         self.create_container()
-        color_factory = ColoringFactory(
-            self.get_name(),
-            self.color_settings.color_shade,
-            ColorType.str_to_type(self.color_settings.color_type),
-            self.color_settings.use_shader,
-        )
-        color_gen = color_factory.create(
-            self.axis_settings.z_range,
-            2 * self.container_size[2],
-            self.container_object.location[2],
-        )
-
         if self.dimensions == "2":
             value_index = 1
         else:
             value_index = 2
+        indices, x_norm, y_norm = self.get_bars_coordinates()
+        if self.data_type_as_enum() == DataType.Categorical:
+            tick_labels = self.dm.get_column(0)[indices].tolist()
+
+        if self.single_mesh:
+            if not self.create_bars_mesh(context, value_index, indices, x_norm, y_norm):
+                return {"CANCELLED"}
+        else:
+            color_factory = ColoringFactory(
+                self.get_name(),
+                self.color_settings.color_shade,
+                ColorType.str_to_type(self.color_settings.color_type),
+                self.color_settings.use_shader,
+            )
+            color_gen = color_factory.create(
+                self.axis_settings.z_range,
+                2 * self.container_size[2],
+                self.container_object.location[2],
+            )
 
-        for i, entry in enumerate(self.data):
-            if not self.in_axis_range_bounds_new(entry):
-                continue
-
-            if self.use_obj == "Bar" or (
-                self.use_obj == "Custom" and self.custom_obj_name == ""
-            ):
-                bpy.ops.mesh.primitive_cube_add()
-                bar_obj = context.active_object
-            elif self.use_obj == "Cylinder":
-                bpy.ops.mesh.primitive_cylinder_add(vertices=16)
-                bar_obj = context.active_object
-            elif self.use_obj == "Custom":
-                if self.custom_obj_name not in bpy.data.objects:
-                    self.report(
-                        {"ERROR"}, "Selected object is part of the chart or is deleted!"
+            z_values = self.dm.get_column(value_index)
+            z_norms = self.get_bars_heights(value_index, indices)
+            animate = self.anim_settings.animate and self.dm.tail_length != 0
+            if animate:
+                dif = 2 if self.dimensions == "2" else 1
+                anim_z_norms = [
+                    self.get_bars_heights(j, indices)
+                    for j in range(
+                        value_index + 1, value_index + self.dm.tail_length + dif
                     )
-                    return {"CANCELLED"}
-                src_obj = bpy.data.objects[self.custom_obj_name]
-                bar_obj = src_obj.copy()
-                bar_obj.data = src_obj.data.copy()
-                context.collection.objects.link(bar_obj)
-
-            if self.data_type_as_enum() == DataType.Numerical:
-                x_value = entry[0]
-            else:
-                tick_labels.append(entry[0])
-                x_value = i
-
-            x_norm = self.normalize_value(x_value, "x")
-            z_norm = self.normalize_value(entry[value_index], "z")
-            if z_norm >= 0.0 and z_norm <= 0.0005:
-                z_norm = 0.0005
-            if self.dimensions == "2":
-                bar_obj.scale = (self.bar_size[0], self.bar_size[1], z_norm * 0.5)
-                bar_obj.location = (x_norm, 0.0, z_norm * 0.5)
-            else:
-                y_norm = self.normalize_value(entry[1], "y")
+                ]
+
+            for k, i in enumerate(indices):
+                if self.use_obj == "Bar" or (
+                    self.use_obj == "Custom" and self.custom_obj_name == ""
+                ):
+                    bpy.ops.mesh.primitive_cube_add()
+                    bar_obj = context.active_object
+                elif self.use_obj == "Cylinder":
+                    bpy.ops.mesh.primitive_cylinder_add(vertices=16)
+                    bar_obj = context.active_object
+                elif self.use_obj == "Custom":
+                    if self.custom_obj_name not in bpy.data.objects:
+                        self.report(
+                            {"ERROR"},
+                            "Selected object is part of the chart or is deleted!",
+                        )
+                        return {"CANCELLED"}
+                    src_obj = bpy.data.objects[self.custom_obj_name]
+                    bar_obj = src_obj.copy()
+                    bar_obj.data = src_obj.data.copy()
+                    context.collection.objects.link(bar_obj)
+
+                z_norm = z_norms[k]
                 bar_obj.scale = (self.bar_size[0], self.bar_size[1], z_norm * 0.5)
-                bar_obj.location = (x_norm, y_norm, z_norm * 0.5)
+                bar_obj.location = (x_norm[k], y_norm[k], z_norm * 0.5)
 
-            mat = color_gen.get_material(entry[value_index])
-            bar_obj.data.materials.append(mat)
-            bar_obj.active_material = mat
-            bar_obj.parent = self.container_object
+                mat = color_gen.get_material(z_values[i])
+                bar_obj.data.materials.append(mat)
+                bar_obj.active_material = mat
+                bar_obj.parent = self.container_object
 
-            if self.anim_settings.animate and self.dm.tail_length != 0:
-                frame_n = context.scene.frame_current
-                bar_obj.keyframe_insert(data_path="location", frame=frame_n)
-                bar_obj.keyframe_insert(data_path="scale", frame=frame_n)
-                dif = 2 if self.dimensions == "2" else 1
-                for j in range(
-                    value_index + 1, value_index + self.dm.tail_length + dif
-                ):
-                    frame_n += self.anim_settings.key_spacing
-                    zn_norm = self.normalize_value(self.data[i][j], "z")
-                    if zn_norm >= 0.0 and zn_norm <= 0.0005:
-                        zn_norm = 0.0005
-                    bar_obj.scale[2] = zn_norm * 0.5
-                    bar_obj.location[2] = zn_norm * 0.5
+                if animate:
+                    frame_n = context.scene.frame_current
                     bar_obj.keyframe_insert(data_path="location", frame=frame_n)
                     bar_obj.keyframe_insert(data_path="scale", frame=frame_n)
+                    for column_z_norms in anim_z_norms:
+                        frame_n += self.anim_settings.key_spacing
+                        bar_obj.scale[2] = column_z_norms[k] * 0.5
+                        bar_obj.location[2] = column_z_norms[k] * 0.5
+                        bar_obj.keyframe_insert(data_path="location", frame=frame_n)
+                        bar_obj.keyframe_insert(data_path="scale", frame=frame_n)
 
         if self.axis_settings.create:
             AxisFactory.create(
@@ -203,3 +220,123 @@ class OBJECT_OT_BarChart(OBJECT_OT_GenericChart):
             self.create_header()
         self.select_container()
         return {"FINISHED"}
+
+    def create_bars_mesh(self, context, value_index, indices, x_norm, y_norm):
+        """
+        Creates bars of entries on 'indices' as one mesh built from NumPy arrays. Colors of
+        the bars are stored in the face attribute. Returns False if the bars can't be created.
+        """
+        template = self.get_bar_template()
+        if template is None:
+            self.report(
+                {"ERROR"}, "Selected object is part of the chart or is deleted!"
+            )
+            return False
+
+        template_verts, loop_vertices, loop_starts, rotation = template
+        count = len(indices)
+
+        def get_bars_verts(column):
+            z_norm = self.get_bars_heights(column, indices)
+            scale = np.column_stack(
+                (
+                    np.full(count, self.bar_size[0]),
+                    np.full(count, self.bar_size[1]),
+                    z_norm * 0.5,
+                )
+            )
+            location = np.column_stack((x_norm, y_norm, z_norm * 0.5))
+            verts = (template_verts[np.newaxis] * scale[:, np.newaxis]) @ rotation.T
+            return (verts + location[:, np.newaxis]).reshape(-1, 3)
+
+        mesh = bpy.data.meshes.new("DV_Bars")
+        mesh_utils.fill_mesh_polygons(
+            mesh,
+            get_bars_verts(value_index),
+            *mesh_utils.tile_polygons(
+                loop_vertices, loop_starts, len(template_verts), count
+            ),
+        )
+
+        colors = get_value_colors(
+            self.color_settings.color_shade,
+            ColorType.str_to_type(self.color_settings.color_type),
+            self.axis_settings.z_range,
+            self.dm.get_column(value_index)[indices],
+        )
+        color_attribute = mesh.attributes.new(
+            BAR_COLOR_ATTRIBUTE, "FLOAT_COLOR", "FACE"
+        )
+        color_attribute.data.foreach_set(
+            "color", np.repeat(colors, len(loop_starts), axis=0).ravel()
+        )
+        # Makes the colors visible in Solid view with the 'Attribute' color
+        mesh.color_attributes.active_color_name = BAR_COLOR_ATTRIBUTE
+        mesh.materials.append(create_attribute_material(BAR_COLOR_ATTRIBUTE))
+
+        obj = bpy.data.objects.new("DV_Bars", mesh)
+        context.collection.objects.link(obj)
+        obj.parent = self.container_object
+
+        if self.anim_settings.animate and self.dm.tail_length != 0:
+            sk_basis = obj.shape_key_add(name="Basis")
+            frame_n = context.scene.frame_current
+            sk_basis.keyframe_insert(data_path="value", frame=frame_n)
+
+            dif = 2 if self.dimensions == "2" else 1
+            for j in range(value_index + 1, value_index + self.dm.tail_length + dif):
+                sk = obj.shape_key_add(name="Column: " + str(j))
+                sk.value = 0
+                sk.data.foreach_set("co", get_bars_verts(j).astype(np.float32).ravel())
+
+            for sk in obj.data.shape_keys.key_blocks:
+                frame_n += self.anim_settings.key_spacing
+                sk.value = 1
+                sk.keyframe_insert(data_path="value", frame=frame_n)
+                for sko in obj.data.shape_keys.key_blocks:
+                    if sko != sk:
+                        sko.value = 0
+                        sko.keyframe_insert(data_path="value", frame=frame_n)
+
+        return True
+
+    def get_bars_coordinates(self):
+        """
+        Returns indices of entries within the axis range and their normalized x and y
+        coordinates
+        """
+        in_range = self.in_axis_range_mask()
+        indices = np.flatnonzero(in_range)
+        if self.data_type_as_enum() == DataType.Numerical:
+            x_norm = self.normalize_array(self.dm.get_column(0)[in_range], "x")
+        else:
+            x_norm = self.normalize_array(indices, "x")
+
+        if self.dimensions == "2":
+            y_norm = np.zeros(len(indices))
+        else:
+            y_norm = self.normalize_array(self.dm.get_column(1)[in_range], "y")
+        return indices, x_norm, y_norm
+
+    def get_bars_heights(self, column, indices):
+        """Returns normalized heights of bars from 'column' of entries on 'indices'"""
+        z_norm = self.normalize_array(self.dm.get_column(column)[indices], "z")
+        # Keep zero height bars visible
+        return np.where((z_norm >= 0.0) & (z_norm <= 0.0005), 0.0005, z_norm)
+
+    def get_bar_template(self):
+        """
+        Returns vertices, loop vertices, loop starts and rotation of the mesh used for
+        one bar, or None if the custom object doesn't exist
+        """
+        if self.use_obj == "Cylinder":
+            return (*mesh_utils.cylinder_polygons(16), np.identity(3))
+
+        if self.use_obj == "Custom" and self.custom_obj_name != "":
+            src_obj = bpy.data.objects.get(self.custom_obj_name)
+            if src_obj is None or src_obj.type != "MESH":
+                return None
+            rotation = np.array(src_obj.matrix_basis.to_quaternion().to_matrix())
+            return (*mesh_utils.get_mesh_polygons(src_obj.data), rotation)
+
+        return (*mesh_utils.cube_polygons(), np.identity(3))
@@ -1,6 +1,7 @@
 # ©copyright Zdenek Dolezal 2024-, License GPL
 
 import bpy
+import numpy as np
 
 from ..general import OBJECT_OT_GenericChart
 from ..properties import (
@@ -10,10 +11,11 @@ from ..properties import (
     DV_HeaderPropertyGroup,
     DV_LabelPropertyGroup,
 )
-from ..colors import ColoringFactory, ColorType
+from ..colors import ColoringFactory, ColorType, get_value_colors
 from .features.axis import AxisFactory
+from .features import point_instances
 from ..data_manager import DataManager, DataType, DataSubtype
-from ..utils.data_utils import normalize_value
+from ..utils.data_utils import normalize_values
 
 
 class OBJECT_OT_BubbleChart(OBJECT_OT_GenericChart):
@@ -51,6 +53,13 @@ class OBJECT_OT_BubbleChart(OBJECT_OT_GenericChart):
         name="Animated Property", items=(("size", "Size", "size"), ("z", "Z", "z"))
     )
 
+    use_instancing: bpy.props.BoolProperty(
+        name="Point Cloud",
+        description="Creates all bubbles as one point cloud mesh, with spheres instanced "
+        "on the points by geometry nodes, much faster for large data",
+        default=False,
+    )
+
     def __init__(self):
         super().__init__()
         self.only_2d = False if self.dm.has_subtype(DataSubtype.XYZW) else True
@@ -69,6 +78,7 @@ class OBJECT_OT_BubbleChart(OBJECT_OT_GenericChart):
         layout = self.layout
         box = layout.box()
         box.prop(self, "bubble_size")
+        box.prop(self, "use_instancing")
 
     def extend_anim_draw(self, box):
         if self.anim_settings.animate:
@@ -78,78 +88,69 @@ class OBJECT_OT_BubbleChart(OBJECT_OT_GenericChart):
         self.init_data(subtype=self.determine_subtype())
         self.create_container()
 
-        color_factory = ColoringFactory(
-            self.get_name(),
-            self.color_settings.color_shade,
-            ColorType.str_to_type(self.color_settings.color_type),
-            self.color_settings.use_shader,
-        )
-        color_gen = color_factory.create(
-            self.axis_settings.z_range,
-            self.container_size[2],
-            self.container_object.location[2],
-        )
-
-        w_idx = 2 if self.dimensions == "2" else 3
-        w_range = self.dm.get_range("w")
-        v_idx = w_idx - 1
-        for i, entry in enumerate(self.data):
-            if not self.in_axis_range_bounds_new(entry):
-                continue
-
-            bpy.ops.mesh.primitive_uv_sphere_add(segments=16, ring_count=8)
-            bubble_obj = context.active_object
-
-            bubble_obj.scale *= (
-                self.bubble_size[1] - self.bubble_size[0]
-            ) * normalize_value(
-                entry[w_idx], w_range[0], w_range[1]
-            ) + self.bubble_size[
-                0
-            ]
-
-            x_norm = self.normalize_value(entry[0], "x")
-            z_norm = self.normalize_value(entry[v_idx], "z")
-            if self.dimensions == "2":
-                bubble_obj.location = (x_norm, 0.0, z_norm)
-            else:
-                y_norm = self.normalize_value(entry[1], "y")
-                bubble_obj.location = (x_norm, y_norm, z_norm)
-
-            mat = color_gen.get_material(entry[v_idx])
-            bubble_obj.data.materials.append(mat)
-            bubble_obj.active_material = mat
-
-            bubble_obj.parent = self.container_object
+        if self.use_instancing:
+            self.create_point_instances(context)
+        else:
+            color_factory = ColoringFactory(
+                self.get_name(),
+                self.color_settings.color_shade,
+                ColorType.str_to_type(self.color_settings.color_type),
+                self.color_settings.use_shader,
+            )
+            color_gen = color_factory.create(
+                self.axis_settings.z_range,
+                self.container_size[2],
+                self.container_object.location[2],
+            )
 
+            w_idx = 2 if self.dimensions == "2" else 3
+            v_idx = w_idx - 1
+            in_range = self.in_axis_range_mask()
+            indices = np.flatnonzero(in_range)
+            positions = self.get_positions(in_range, v_idx)
+            z_values = self.dm.get_column(v_idx)[in_range]
+            sizes = self.get_sizes(self.dm.get_column(w_idx)[in_range])
             if self.anim_settings.animate:
-                frame_n = context.scene.frame_current
-
+                anim_data = self.get_anim_data(indices, w_idx)
                 if self.anim_type == "z":
-                    bubble_obj.keyframe_insert(data_path="location", frame=frame_n)
-                elif self.anim_type == "size":
-                    bubble_obj.keyframe_insert(data_path="scale", frame=frame_n)
+                    anim_values = self.normalize_array(anim_data.ravel(), "z")
+                else:
+                    anim_values = self.get_sizes(anim_data.ravel())
+                anim_values = anim_values.reshape(anim_data.shape)
+
+            for k, i in enumerate(indices):
+                bpy.ops.mesh.primitive_uv_sphere_add(segments=16, ring_count=8)
+                bubble_obj = context.active_object
+
+                bubble_obj.scale *= sizes[k]
+                bubble_obj.location = positions[k]
+
+                mat = color_gen.get_material(z_values[k])
+                bubble_obj.data.materials.append(mat)
+                bubble_obj.active_material = mat
 
-                anim_data = self.dm.parsed_data[i][w_idx + 1 :]
-                for j in range(len(anim_data)):
-                    frame_n += self.anim_settings.key_spacing
-                    zn_norm = self.normalize_value(anim_data[j], "z")
+                bubble_obj.parent = self.container_object
+
+                if self.anim_settings.animate:
+                    frame_n = context.scene.frame_current
 
                     if self.anim_type == "z":
-                        bubble_obj.location[2] = zn_norm
                         bubble_obj.keyframe_insert(data_path="location", frame=frame_n)
-
                     elif self.anim_type == "size":
-                        scale = (
-                            self.bubble_size[1] - self.bubble_size[0]
-                        ) * normalize_value(
-                            anim_data[j], w_range[0], w_range[1]
-                        ) + self.bubble_size[
-                            0
-                        ]
-                        bubble_obj.scale = (scale, scale, scale)
                         bubble_obj.keyframe_insert(data_path="scale", frame=frame_n)
 
+                    for value in anim_values[k]:
+                        frame_n += self.anim_settings.key_spacing
+                        if self.anim_type == "z":
+                            bubble_obj.location[2] = value
+                            bubble_obj.keyframe_insert(
+                                data_path="location", frame=frame_n
+                            )
+
+                        elif self.anim_type == "size":
+                            bubble_obj.scale = (value, value, value)
+                            bubble_obj.keyframe_insert(data_path="scale", frame=frame_n)
+
         if self.axis_settings.create:
             AxisFactory.create(
                 self.container_object,
@@ -163,6 +164,76 @@ class OBJECT_OT_BubbleChart(OBJECT_OT_GenericChart):
         self.select_container()
         return {"FINISHED"}
 
+    def create_point_instances(self, context):
+        """Creates all of the bubbles as one point cloud with spheres instanced on them"""
+        w_idx = 2 if self.dimensions == "2" else 3
+        v_idx = w_idx - 1
+        in_range = self.in_axis_range_mask()
+        positions = self.get_positions(in_range, v_idx)
+        z_values = self.dm.get_column(v_idx)[in_range]
+        obj = point_instances.create_point_instances(
+            context,
+            self.container_object,
+            positions,
+            self.get_sizes(self.dm.get_column(w_idx)[in_range]),
+            get_value_colors(
+                self.color_settings.color_shade,
+                ColorType.str_to_type(self.color_settings.color_type),
+                self.axis_settings.z_range,
+                z_values,
+            ),
+        )
+
+        if not self.anim_settings.animate or len(z_values) == 0:
+            return
+
+        anim_data = self.get_anim_data(np.flatnonzero(in_range), w_idx)
+        frame_n = context.scene.frame_current
+        if self.anim_type == "z":
+            point_instances.animate_positions(
+                obj,
+                (
+                    np.column_stack(
+                        (positions[:, :2], self.normalize_array(column, "z"))
+                    )
+                    for column in anim_data.T
+                ),
+                frame_n,
+                self.anim_settings.key_spacing,
+            )
+        elif self.anim_type == "size":
+            point_instances.animate_sizes(
+                obj,
+                (self.get_sizes(column) for column in anim_data.T),
+                frame_n,
+                self.anim_settings.key_spacing,
+            )
+
+    def get_positions(self, in_range, v_idx):
+        """Returns normalized positions of entries in 'in_range' mask"""
+        x_norm = self.normalize_array(self.dm.get_column(0)[in_range], "x")
+        if self.dimensions == "2":
+            y_norm = np.zeros(len(x_norm))
+        else:
+            y_norm = self.normalize_array(self.dm.get_column(1)[in_range], "y")
+        z_norm = self.normalize_array(self.dm.get_column(v_idx)[in_range], "z")
+        return np.column_stack((x_norm, y_norm, z_norm))
+
+    def get_sizes(self, w_values):
+        """Returns sizes of bubbles with 'w_values' mapped into the bubble size range"""
+        w_range = self.dm.get_range("w")
+        w_norm = normalize_values(w_values, w_range[0], w_range[1])
+        return (self.bubble_size[1] - self.bubble_size[0]) * w_norm + self.bubble_size[
+            0
+        ]
+
+    def get_anim_data(self, indices, w_idx):
+        """Returns (len(indices), frames) array of animated values of entries on 'indices'"""
+        columns = range(w_idx + 1, self.dm.get_column_count())
+        if len(indices) == 0 or len(columns) == 0:
+            return np.empty((len(indices), 0))
+        return np.column_stack([self.dm.get_column(j)[indices] for j in columns])
+
     def determine_subtype(self):
         """Determines data subtype by user input"""
         if self.dimensions == "2":
@@ -7,8 +7,10 @@
 from enum import Enum
 import bpy
 import math
+import numpy as np
 
 from ...utils.data_utils import float_range
+from ...utils import mesh_utils
 
 CATEGORICAL_AXIS_DEFAULT_TICKS = 10
 
@@ -147,7 +149,7 @@ class Axis:
         self.create_materials(chart_id)
 
         self.text_objs = []
-        self.tick_objs = []
+        self.ticks_obj = None
         self.axis_obj = None
 
     def create_format_string(self, number_format, decimal_places):
@@ -175,10 +177,9 @@ class Axis:
 
     def create_container(self):
         """Creates container for axis, with default name 'Axis_Container_DIM' where DIM is X, Y or Z"""
-        bpy.ops.object.empty_add()
-        self.axis_cont = bpy.context.object
-        self.axis_cont.name = "Axis_Container_" + str(self.dir)
-        self.axis_cont.location = (0, 0, 0)
+        self.axis_cont = bpy.data.objects.new("Axis_Container_" + str(self.dir), None)
+        self.axis_cont.empty_display_type = "PLAIN_AXES"
+        bpy.context.collection.objects.link(self.axis_cont)
         self.axis_cont.parent = self.parent_object
 
     def create_axis_line(self, length):
@@ -187,44 +188,61 @@ class Axis:
         The line is created in x direction
         returns - line obj
         """
-        bpy.ops.mesh.primitive_cube_add()
-        obj = bpy.context.active_object
-        obj.parent = self.axis_cont
-        obj.location = (0, 0, 0)
-
+        obj = self.create_cubes_object(
+            "Cube", np.zeros((1, 3)), (1.0, 1.0, 1.0), self.axis_mat
+        )
         obj.scale = (length, self.thickness, self.thickness)
         obj.location.x += length
-        obj.data.materials.append(self.axis_mat)
-        obj.active_material = self.axis_mat
         self.axis_obj = obj
         return obj
 
-    def create_tick_mark(self, x_location):
+    def create_tick_marks(self, x_locations):
         """
-        Creates tick mark at x_location of self.thickness size and height of self.mark_height and
-        ads it to axis container
-        x_location - location of mark along x axis
+        Creates all tick marks as one mesh, each mark is of self.thickness size and height of
+        self.mark_height and the object is added to axis container
+        x_locations - locations of marks along x axis
         """
-        bpy.ops.mesh.primitive_cube_add()
-        obj = bpy.context.active_object
-        obj.scale = (self.thickness, self.thickness, self.mark_height)
-        obj.location = (0, 0, 0)
-        obj.location.x += x_location - self.thickness * 0.5
+        centers = np.zeros((len(x_locations), 3))
+        centers[:, 0] = np.asarray(x_locations) - self.thickness * 0.5
+        self.ticks_obj = self.create_cubes_object(
+            "Ticks",
+            centers,
+            (self.thickness, self.thickness, self.mark_height),
+            self.tick_mat,
+        )
+
+    def create_cubes_object(self, name, centers, scale, material):
+        """Creates object with cubes scaled by 'scale' at 'centers' in one mesh"""
+        verts, loop_vertices, loop_starts = mesh_utils.cube_polygons()
+        cubes_verts = verts[np.newaxis] * scale + centers[:, np.newaxis]
+        mesh = bpy.data.meshes.new(name)
+        mesh_utils.fill_mesh_polygons(
+            mesh,
+            cubes_verts.reshape(-1, 3),
+            *mesh_utils.tile_polygons(
+                loop_vertices, loop_starts, len(verts), len(centers)
+            ),
+        )
+        mesh.materials.append(material)
+        obj = bpy.data.objects.new(name, mesh)
+        bpy.context.collection.objects.link(obj)
         obj.parent = self.axis_cont
-        obj.data.materials.append(self.tick_mat)
-        obj.active_material = self.tick_mat
-        self.tick_objs.append(obj)
+        return obj
 
     def create_ticks(self, start_pos):
         """
         Creates tick marks from self.range with stepsize of self.step
         start_pos - starting position for all ticks (so it can start with offset)
         """
-        for value in float_range(self.range[0], self.range[1], self.step):
-            tick_location = self.size * (
-                start_pos + (value - self.range[0]) / (self.range[1] - self.range[0])
-            )
-            self.create_tick_mark(tick_location)
+        values = np.array(
+            list(float_range(self.range[0], self.range[1], self.step)),
+            dtype=np.float64,
+        )
+        tick_locations = self.size * (
+            start_pos + (values - self.range[0]) / (self.range[1] - self.range[0])
+        )
+        self.create_tick_marks(tick_locations)
+        for value, tick_location in zip(values.tolist(), tick_locations.tolist()):
             if len(self.tick_labels) == 0:
                 self.create_tick_label(value, tick_location)
             else:
@@ -299,8 +317,9 @@ class Axis:
             obj.location = (x_location, 0, -0.2)
 
     def create_text_object(self, value):
-        bpy.ops.object.text_add()
-        obj = bpy.context.object
+        curve = bpy.data.curves.new("Text", type="FONT")
+        obj = bpy.data.objects.new("Text", curve)
+        bpy.context.collection.objects.link(obj)
         if type(value) is float:
             obj.data.body = self.number_fmt.format(value)
         else:
@@ -0,0 +1,177 @@
+# ©copyright Zdenek Dolezal 2024-, License GPL
+# Point cloud backend of the legacy charts. All points are vertices of one mesh carrying size
+# and color attributes, the marker geometry is instanced on them by geometry nodes.
+
+import bpy
+import typing
+import numpy as np
+
+from ...utils import mesh_utils
+from ...colors import create_attribute_material
+
+POINT_SIZE_ATTRIBUTE = "DV_Size"
+POINT_COLOR_ATTRIBUTE = "DV_Color"
+
+
+def create_point_instances(
+    context: bpy.types.Context,
+    parent: bpy.types.Object,
+    positions: np.ndarray,
+    sizes: np.ndarray,
+    colors: np.ndarray,
+    marker: typing.Optional[bpy.types.Object] = None,
+) -> bpy.types.Object:
+    """
+    Creates object with one vertex for each of the 'positions', with their 'sizes' and RGBA
+    'colors' stored as point attributes. UV Sphere or the 'marker' object is instanced on
+    each point.
+    """
+    mesh = bpy.data.meshes.new("DV_Points")
+    mesh_utils.fill_mesh(mesh, positions)
+
+    size_attribute = mesh.attributes.new(POINT_SIZE_ATTRIBUTE, "FLOAT", "POINT")
+    size_attribute.data.foreach_set(
+        "value", np.ascontiguousarray(sizes, dtype=np.float32)
+    )
+    color_attribute = mesh.attributes.new(POINT_COLOR_ATTRIBUTE, "FLOAT_COLOR", "POINT")
+    color_attribute.data.foreach_set(
+        "color", np.ascontiguousarray(colors, dtype=np.float32).ravel()
+    )
+
+    obj = bpy.data.objects.new("DV_Points", mesh)
+    context.collection.objects.link(obj)
+    obj.parent = parent
+
+    material = create_attribute_material(POINT_COLOR_ATTRIBUTE, "INSTANCER")
+    modifier = obj.modifiers.new("DV_PointInstances", "NODES")
+    modifier.node_group = _create_instancing_node_group(material, marker)
+    return obj
+
+
+def animate_positions(
+    obj: bpy.types.Object,
+    positions: typing.Iterable[np.ndarray],
+    frame_start: int,
+    key_spacing: int,
+) -> None:
+    """Animates the points through 'positions' of each frame using shape keys"""
+    sk_basis = obj.shape_key_add(name="Basis")
+    sk_basis.keyframe_insert(data_path="value", frame=frame_start)
+    for i, frame_positions in enumerate(positions, start=1):
+        sk = obj.shape_key_add(name="Column: " + str(i))
+        sk.value = 0
+        sk.data.foreach_set(
+            "co", np.ascontiguousarray(frame_positions, dtype=np.float32).ravel()
+        )
+
+    frame_n = frame_start
+    for sk in obj.data.shape_keys.key_blocks:
+        frame_n += key_spacing
+        sk.value = 1
+        sk.keyframe_insert(data_path="value", frame=frame_n)
+        for sko in obj.data.shape_keys.key_blocks:
+            if sko != sk:
+                sko.value = 0
+                sko.keyframe_insert(data_path="value", frame=frame_n)
+
+
+def animate_sizes(
+    obj: bpy.types.Object,
+    sizes: typing.Iterable[np.ndarray],
+    frame_start: int,
+    key_spacing: int,
+) -> None:
+    """
+    Animates the size attribute of the points through 'sizes' of each frame. Keyframes of
+    each point are written at once, but each point still needs its own F-curve.
+    """
+    frames = np.vstack(
+        [_get_sizes(obj)]
+        + [np.asarray(frame_sizes, dtype=np.float32) for frame_sizes in sizes]
+    )
+    mesh = obj.data
+    if mesh.animation_data is None:
+        mesh.animation_data_create()
+    if mesh.animation_data.action is None:
+        mesh.animation_data.action = bpy.data.actions.new(f"{mesh.name}Action")
+
+    co = np.empty((len(frames), 2), dtype=np.float32)
+    co[:, 0] = frame_start + key_spacing * np.arange(len(frames))
+    for i in range(frames.shape[1]):
+        fcurve = _ensure_fcurve(
+            mesh, f'attributes["{POINT_SIZE_ATTRIBUTE}"].data[{i}].value'
+        )
+        co[:, 1] = frames[:, i]
+        fcurve.keyframe_points.add(len(frames))
+        fcurve.keyframe_points.foreach_set("co", co.ravel())
+        fcurve.update()
+
+
+def _ensure_fcurve(id_data: bpy.types.ID, data_path: str) -> bpy.types.FCurve:
+    action = id_data.animation_data.action
+    if bpy.app.version >= (4, 4, 0):
+        return action.fcurve_ensure_for_datablock(id_data, data_path)
+    return action.fcurves.new(data_path)
+
+
+def _get_sizes(obj: bpy.types.Object) -> np.ndarray:
+    size_attribute = obj.data.attributes[POINT_SIZE_ATTRIBUTE]
+    values = np.empty(len(size_attribute.data), dtype=np.float32)
+    size_attribute.data.foreach_get("value", values)
+    return values
+
+
+def _create_instancing_node_group(
+    material: bpy.types.Material, marker: typing.Optional[bpy.types.Object] = None
+) -> bpy.types.NodeTree:
+    tree = bpy.data.node_groups.new("DV_PointInstances", "GeometryNodeTree")
+    if bpy.app.version < (4, 0, 0):
+        tree.inputs.new("NodeSocketGeometry", "Geometry")
+        tree.outputs.new("NodeSocketGeometry", "Geometry")
+    else:
+        tree.interface.new_socket(
+            "Geometry", in_out="INPUT", socket_type="NodeSocketGeometry"
+        )
+        tree.interface.new_socket(
+            "Geometry", in_out="OUTPUT", socket_type="NodeSocketGeometry"
+        )
+
+    nodes = tree.nodes
+    links = tree.links
+    group_input = nodes.new("NodeGroupInput")
+    group_input.location = (-600, 0)
+    group_output = nodes.new("NodeGroupOutput")
+    group_output.location = (400, 0)
+
+    instance_node = nodes.new("GeometryNodeInstanceOnPoints")
+    instance_node.location = (200, 0)
+
+    if marker is None:
+        marker_node = nodes.new("GeometryNodeMeshUVSphere")
+        marker_node.inputs["Segments"].default_value = 16
+        marker_node.inputs["Rings"].default_value = 8
+        marker_geometry = marker_node.outputs["Mesh"]
+    else:
+        marker_node = nodes.new("GeometryNodeObjectInfo")
+        marker_node.inputs["Object"].default_value = marker
+        marker_geometry = marker_node.outputs["Geometry"]
+        links.new(marker_node.outputs["Rotation"], instance_node.inputs["Rotation"])
+    marker_node.location = (-400, -200)
+
+    material_node = nodes.new("GeometryNodeSetMaterial")
+    material_node.location = (-200, -200)
+    material_node.inputs["Material"].default_value = material
+
+    size_node = nodes.new("GeometryNodeInputNamedAttribute")
+    size_node.location = (-200, -400)
+    size_node.data_type = "FLOAT"
+    size_node.inputs["Name"].default_value = POINT_SIZE_ATTRIBUTE
+    # Older versions have one output for each data type, only the current one is enabled
+    size_output = next(output for output in size_node.outputs if output.enabled)
+
+    links.new(group_input.outputs[0], instance_node.inputs["Points"])
+    links.new(marker_geometry, material_node.inputs["Geometry"])
+    links.new(material_node.outputs["Geometry"], instance_node.inputs["Instance"])
+    links.new(size_output, instance_node.inputs["Scale"])
+    links.new(instance_node.outputs["Instances"], group_output.inputs[0])
+    return tree
@@ -2,11 +2,12 @@
 
 import bpy
 import math
+import numpy as np
 
 
 from ..utils.data_utils import (
-    normalize_value,
-    get_data_in_range,
+    normalize_values,
+    range_mask,
 )
 from .features.axis import AxisFactory
 from ..general import OBJECT_OT_GenericChart
@@ -129,32 +130,22 @@ class OBJECT_OT_LineChart(OBJECT_OT_GenericChart):
 
         self.create_container()
 
-        if self.data_type_as_enum() == DataType.Numerical:
-            self.data = get_data_in_range(self.data, self.axis_settings.x_range)
-            sorted_data = sorted(self.data, key=lambda x: x[0])
-        else:
-            sorted_data = self.data
-
         tick_labels = []
         if self.data_type_as_enum() == DataType.Numerical:
-            normalized_vert_list = [
-                (
-                    self.normalize_value(entry[0], "x"),
-                    0.0,
-                    self.normalize_value(entry[1], "z"),
-                )
-                for entry in sorted_data
-            ]
+            x_values = self.dm.get_column(0)
+            in_range = range_mask(x_values, self.axis_settings.x_range)
+            order = np.argsort(x_values[in_range], kind="stable")
+            x_norm = self.normalize_array(x_values[in_range][order], "x")
+            z_values = self.dm.get_column(1)[in_range][order]
+            z_norm = self.normalize_array(z_values, "z")
         else:
-            normalized_vert_list = [
-                (
-                    normalize_value(i, 0, len(self.data)),
-                    0.0,
-                    self.normalize_value(entry[1], "z"),
-                )
-                for i, entry in enumerate(sorted_data)
-            ]
-            tick_labels = list(zip(*sorted_data))[0]
+            x_norm = normalize_values(np.arange(self.dm.lines), 0, self.dm.lines)
+            z_norm = self.normalize_array(self.dm.get_column(1), "z")
+            tick_labels = self.dm.get_column(0).tolist()
+
+        normalized_vert_list = np.column_stack(
+            (x_norm, np.zeros(len(x_norm)), z_norm)
+        ).tolist()
 
         edges = [[i - 1, i] for i in range(1, len(normalized_vert_list))]
 
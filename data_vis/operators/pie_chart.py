@@ -13,6 +13,7 @@ from ..properties import (
 from ..data_manager import DataManager, DataType
 from ..colors import ColorGen, ColorType
 from .features.legend import Legend
+from ..utils import mesh_utils
 
 logger = logging.getLogger("data_vis")
 
@@ -119,7 +120,6 @@ class OBJECT_OT_PieChart(OBJECT_OT_GenericChart):
             box.prop(self, "text_size")
 
     def execute(self, context):
-        self.slices = []
         self.materials = []
         self.init_data()
 
@@ -139,17 +139,6 @@ class OBJECT_OT_PieChart(OBJECT_OT_GenericChart):
 
         self.create_container()
 
-        # create cylinder from triangles
-        rot = 0
-        rot_inc = 2.0 * math.pi / self.vertices
-        scale = 1.0 / self.vertices * math.pi
-        for i in range(0, self.vertices):
-            cyl_slice = self.create_slice()
-            cyl_slice.scale.y *= scale
-            cyl_slice.rotation_euler.z = rot
-            rot += rot_inc
-            self.slices.append(cyl_slice)
-
         values_sum = sum(float(entry[1]) for entry in self.data)
         color_gen = ColorGen(
             self.color_shade, ColorType.str_to_type(self.color_type), (0, data_len)
@@ -171,7 +160,7 @@ class OBJECT_OT_PieChart(OBJECT_OT_GenericChart):
                 continue
 
             portion_end_i = prev_i + increment
-            slice_obj = self.join_slices(prev_i, portion_end_i)
+            slice_obj = self.create_slice(prev_i, portion_end_i)
             if slice_obj is None:
                 raise RuntimeError(
                     'Error occurred, try to increase number of vertices, i_from" {}, i_to: {}, inc: {}, val: {}'.format(
@@ -211,60 +200,27 @@ class OBJECT_OT_PieChart(OBJECT_OT_GenericChart):
         self.select_container()
         return {"FINISHED"}
 
-    def join_slices(self, i_from, i_to):
-        bpy.ops.object.select_all(action="DESELECT")
-        if i_to > len(self.slices) - 1:
-            i_to = len(self.slices)
-        for i in range(i_from, i_to):
-            if i > len(self.slices) - 1:
-                logger.error(
-                    "IndexError: Cannot portion slices properly: i: {}, len(slices): {}, i_from: {}, i_to: {}".format(
-                        i, len(self.slices), i_from, i_to
-                    )
-                )
-                break
-            self.slices[i].select_set(state=True)
-            bpy.context.view_layer.objects.active = self.slices[i]
-        if len(bpy.context.selected_objects) > 0:
-            bpy.ops.object.join()
-            return bpy.context.active_object
-        else:
-            return None
-
-    def create_slice(self):
+    def create_slice(self, i_from, i_to):
         """
-        Creates a triangle (slice of pie chart)
+        Creates slice of the pie chart covering segments [i_from, i_to), returns None if
+        there are no segments left
         """
-        slice_size = 0.5
-        verts = [
-            (0, 0, 0.1),
-            (-slice_size, slice_size, 0.1),
-            (-slice_size, -slice_size, 0.1),
-            (0, 0, 0),
-            (-slice_size, slice_size, 0),
-            (-slice_size, -slice_size, 0),
-        ]
-
-        faces = [
-            [0, 1, 2],
-            [3, 4, 5],
-            [0, 1, 3],
-            [1, 3, 4],
-            [0, 2, 3],
-            [2, 3, 5],
-            [1, 2, 4],
-            [2, 4, 5],
-        ]
+        i_to = min(i_to, self.vertices)
+        if i_from >= i_to:
+            logger.error(
+                "Cannot portion slices properly: vertices: {}, i_from: {}, i_to: {}".format(
+                    self.vertices, i_from, i_to
+                )
+            )
+            return None
 
         mesh = bpy.data.meshes.new("pie_mesh")
+        mesh_utils.fill_mesh_polygons(
+            mesh, *mesh_utils.pie_slice_polygons(i_from, i_to, self.vertices, 0.5, 0.1)
+        )
         obj = bpy.data.objects.new(mesh.name, mesh)
         bpy.context.scene.collection.objects.link(obj)
         obj.parent = self.container_object
-        bpy.context.view_layer.objects.active = obj
-
-        mesh.from_pydata(verts, [], faces)
-        mesh.update()
-
         return obj
 
     def get_formated_text(self, label, value, portion):
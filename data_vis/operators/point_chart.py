@@ -1,6 +1,7 @@
 # ©copyright Zdenek Dolezal 2024-, License GPL
 
 import bpy
+import numpy as np
 from mathutils import Vector
 
 from ..general import OBJECT_OT_GenericChart
@@ -12,7 +13,8 @@ from ..properties import (
     DV_HeaderPropertyGroup,
 )
 from .features.axis import AxisFactory
-from ..colors import ColoringFactory, ColorType
+from .features import point_instances
+from ..colors import ColoringFactory, ColorType, get_value_colors
 from ..data_manager import DataManager, DataType
 
 
@@ -53,6 +55,13 @@ class OBJECT_OT_PointChart(OBJECT_OT_GenericChart):
 
     custom_obj_name: bpy.props.StringProperty(name="Custom")
 
+    use_instancing: bpy.props.BoolProperty(
+        name="Point Cloud",
+        description="Creates all points as one point cloud mesh, with the object instanced "
+        "on the points by geometry nodes, much faster for large data",
+        default=False,
+    )
+
     @classmethod
     def poll(cls, context):
         return DataManager().is_type(DataType.Numerical, [2, 3])
@@ -67,6 +76,7 @@ class OBJECT_OT_PointChart(OBJECT_OT_GenericChart):
             box.prop_search(self, "custom_obj_name", context.scene, "objects")
 
         box.prop(self, "point_scale")
+        box.prop(self, "use_instancing")
 
     def execute(self, context):
         self.init_data()
@@ -74,74 +84,73 @@ class OBJECT_OT_PointChart(OBJECT_OT_GenericChart):
         if self.dimensions == "2":
             value_index = 1
         else:
-            if len(self.data[0]) == 2:
+            if self.dm.get_column_count() == 2:
                 self.report({"ERROR"}, "Data are only 2D!")
                 return {"CANCELLED"}
             value_index = 2
 
         self.create_container()
-        color_factory = ColoringFactory(
-            self.get_name(),
-            self.color_settings.color_shade,
-            ColorType.str_to_type(self.color_settings.color_type),
-            self.color_settings.use_shader,
-        )
-        color_gen = color_factory.create(
-            self.axis_settings.z_range,
-            self.container_size[2],
-            self.container_object.location[2],
-        )
-
-        for i, entry in enumerate(self.data):
-
-            # skip values outside defined axis range
-            if not self.in_axis_range_bounds_new(entry):
-                continue
-
-            if self.use_obj == "Sphere" or self.custom_obj_name == "":
-                bpy.ops.mesh.primitive_uv_sphere_add(segments=16, ring_count=8)
-                point_obj = context.active_object
-            else:
-                if self.custom_obj_name not in bpy.data.objects:
-                    self.report(
-                        {"ERROR"}, "Selected object is part of the chart or is deleted!"
-                    )
-                    return {"CANCELLED"}
-                src_obj = bpy.data.objects[self.custom_obj_name]
-                point_obj = src_obj.copy()
-                point_obj.data = src_obj.data.copy()
-                context.collection.objects.link(point_obj)
-
-            point_obj.scale = Vector(
-                (self.point_scale, self.point_scale, self.point_scale)
+        if self.use_instancing:
+            if not self.create_point_instances(context, value_index):
+                return {"CANCELLED"}
+        else:
+            color_factory = ColoringFactory(
+                self.get_name(),
+                self.color_settings.color_shade,
+                ColorType.str_to_type(self.color_settings.color_type),
+                self.color_settings.use_shader,
+            )
+            color_gen = color_factory.create(
+                self.axis_settings.z_range,
+                self.container_size[2],
+                self.container_object.location[2],
             )
 
-            mat = color_gen.get_material(entry[value_index])
-            point_obj.data.materials.append(mat)
-            point_obj.active_material = mat
-
-            # normalize height
-            x_norm = self.normalize_value(entry[0], "x")
-            z_norm = self.normalize_value(entry[value_index], "z")
-            if self.dimensions == "2":
-                point_obj.location = (x_norm, 0.0, z_norm)
-            else:
-                y_norm = self.normalize_value(entry[1], "y")
-                point_obj.location = (x_norm, y_norm, z_norm)
-
-            point_obj.parent = self.container_object
-
-            if self.anim_settings.animate and self.dm.tail_length != 0:
-                frame_n = context.scene.frame_current
-                point_obj.keyframe_insert(data_path="location", frame=frame_n)
-                dif = 2 if self.dimensions == "2" else 1
-                for j in range(
-                    value_index + 1, value_index + self.dm.tail_length + dif
-                ):
-                    frame_n += self.anim_settings.key_spacing
-                    zn_norm = self.normalize_value(self.data[i][j], "z")
-                    point_obj.location[2] = zn_norm
+            in_range = self.in_axis_range_mask()
+            z_values = self.dm.get_column(value_index)[in_range]
+            xy_norm = self.get_xy_norm(in_range)
+            positions = self.get_positions(in_range, value_index, xy_norm)
+            animate = self.anim_settings.animate and self.dm.tail_length != 0
+            if animate:
+                anim_positions = [
+                    self.get_positions(in_range, j, xy_norm)
+                    for j in self.get_anim_columns(value_index)
+                ]
+
+            for k, i in enumerate(np.flatnonzero(in_range)):
+                if self.use_obj == "Sphere" or self.custom_obj_name == "":
+                    bpy.ops.mesh.primitive_uv_sphere_add(segments=16, ring_count=8)
+                    point_obj = context.active_object
+                else:
+                    if self.custom_obj_name not in bpy.data.objects:
+                        self.report(
+                            {"ERROR"},
+                            "Selected object is part of the chart or is deleted!",
+                        )
+                        return {"CANCELLED"}
+                    src_obj = bpy.data.objects[self.custom_obj_name]
+                    point_obj = src_obj.copy()
+                    point_obj.data = src_obj.data.copy()
+                    context.collection.objects.link(point_obj)
+
+                point_obj.scale = Vector(
+                    (self.point_scale, self.point_scale, self.point_scale)
+                )
+
+                mat = color_gen.get_material(z_values[k])
+                point_obj.data.materials.append(mat)
+                point_obj.active_material = mat
+
+                point_obj.location = positions[k]
+                point_obj.parent = self.container_object
+
+                if animate:
+                    frame_n = context.scene.frame_current
                     point_obj.keyframe_insert(data_path="location", frame=frame_n)
+                    for column_positions in anim_positions:
+                        frame_n += self.anim_settings.key_spacing
+                        point_obj.location[2] = column_positions[k, 2]
+                        point_obj.keyframe_insert(data_path="location", frame=frame_n)
 
         if self.axis_settings.create:
             AxisFactory.create(
@@ -157,3 +166,71 @@ class OBJECT_OT_PointChart(OBJECT_OT_GenericChart):
             self.create_header()
         self.select_container()
         return {"FINISHED"}
+
+    def create_point_instances(self, context, value_index):
+        """
+        Creates all of the points as one point cloud with the object instanced on them.
+        Returns False if the points can't be created.
+        """
+        marker = None
+        if self.use_obj == "Custom" and self.custom_obj_name != "":
+            marker = bpy.data.objects.get(self.custom_obj_name)
+            if marker is None:
+                self.report(
+                    {"ERROR"}, "Selected object is part of the chart or is deleted!"
+                )
+                return False
+
+        in_range = self.in_axis_range_mask()
+        z_values = self.dm.get_column(value_index)[in_range]
+        xy_norm = self.get_xy_norm(in_range)
+        obj = point_instances.create_point_instances(
+            context,
+            self.container_object,
+            self.get_positions(in_range, value_index, xy_norm),
+            np.full(len(z_values), self.point_scale),
+            get_value_colors(
+                self.color_settings.color_shade,
+                ColorType.str_to_type(self.color_settings.color_type),
+                self.axis_settings.z_range,
+                z_values,
+            ),
+            marker,
+        )
+
+        if self.anim_settings.animate and self.dm.tail_length != 0:
+            point_instances.animate_positions(
+                obj,
+                (
+                    self.get_positions(in_range, j, xy_norm)
+                    for j in self.get_anim_columns(value_index)
+                ),
+                context.scene.frame_current,
+                self.anim_settings.key_spacing,
+            )
+
+        return True
+
+    def get_xy_norm(self, in_range):
+        """Returns normalized x and y coordinates of entries in 'in_range' mask"""
+        x_norm = self.normalize_array(self.dm.get_column(0)[in_range], "x")
+        if self.dimensions == "2":
+            y_norm = np.zeros(len(x_norm))
+        else:
+            y_norm = self.normalize_array(self.dm.get_column(1)[in_range], "y")
+        return np.column_stack((x_norm, y_norm))
+
+    def get_positions(self, in_range, value_index, xy_norm=None):
+        """
+        Returns normalized positions of entries in 'in_range' mask with height from
+        'value_index' column, 'xy_norm' from 'get_xy_norm' are reused when given
+        """
+        if xy_norm is None:
+            xy_norm = self.get_xy_norm(in_range)
+        z_norm = self.normalize_array(self.dm.get_column(value_index)[in_range], "z")
+        return np.column_stack((xy_norm, z_norm))
+
+    def get_anim_columns(self, value_index):
+        """Returns indices of columns with values of the animation frames"""
+        dif = 2 if self.dimensions == "2" else 1
+        return range(value_index + 1, value_index + self.dm.tail_length + dif)
@@ -12,7 +12,8 @@ from ..properties import (
 from ..colors import NodeShader
 from .features.axis import AxisFactory
 from ..data_manager import DataManager, DataType
-from ..utils import env_utils, interpolation
+from ..utils import env_utils, interpolation, mesh_utils
+from ..preferences import get_preferences
 
 
 class OBJECT_OT_SurfaceChart(OBJECT_OT_GenericChart):
@@ -33,12 +34,25 @@ class OBJECT_OT_SurfaceChart(OBJECT_OT_GenericChart):
         default=20,
     )
 
+    interpolation_engine: bpy.props.EnumProperty(
+        name="Interpolation Engine",
+        items=interpolation.ENGINES_ENUM,
+        description="How the data points are interpolated into the grid",
+    )
+
     rbf_function: bpy.props.EnumProperty(
         name="Interpolation Method",
         items=interpolation.TYPES_ENUM,
         description="See: https://docs.scipy.org/doc/scipy/reference/generated/scipy.interpolate.Rbf.html",
     )
 
+    neighbors: bpy.props.IntProperty(
+        name="Neighbors",
+        description="Number of the nearest data points used to interpolate each grid point",
+        min=3,
+        default=interpolation.DEFAULT_NEIGHBORS,
+    )
+
     axis_settings: bpy.props.PointerProperty(type=DV_AxisPropertyGroup)
 
     label_settings: bpy.props.PointerProperty(type=DV_LabelPropertyGroup)
@@ -73,56 +87,75 @@ class OBJECT_OT_SurfaceChart(OBJECT_OT_GenericChart):
         box.prop(self, "color_shade")
 
         row = layout.row()
-        row.prop(self, "rbf_function")
+        row.prop(self, "interpolation_engine")
+
+        if self.interpolation_engine in {
+            interpolation.Engine.RBF,
+            interpolation.Engine.RBF_LOCAL,
+        }:
+            row = layout.row()
+            row.prop(self, "rbf_function")
+
+        if self.interpolation_engine == interpolation.Engine.RBF_LOCAL:
+            row = layout.row()
+            row.prop(self, "neighbors")
 
         row = layout.row()
         row.prop(self, "density")
 
-    def face(self, column, row):
-        return (
-            column * self.density + row,
-            (column + 1) * self.density + row,
-            (column + 1) * self.density + 1 + row,
-            column * self.density + 1 + row,
-        )
-
     def execute(self, context):
         import numpy as np
-        from scipy import interpolate
 
         self.init_data()
 
-        self.create_container()
-
         x = np.linspace(
             self.axis_settings.x_range[0], self.axis_settings.x_range[1], self.density
         )
         y = np.linspace(
             self.axis_settings.x_range[0], self.axis_settings.y_range[1], self.density
         )
-        X, Y = np.meshgrid(x, y)
 
         px = [entry[0] for entry in self.data]
         py = [entry[1] for entry in self.data]
-        f = [entry[2] for entry in self.data]
-
-        rbfi = interpolate.Rbf(px, py, f, function=self.rbf_function)
-        res = rbfi(X, Y)
-
-        faces = []
-        verts = []
-        for row in range(self.density):
-            for col in range(self.density):
-                x_norm = self.container_size[0] * (row / self.density)
-                y_norm = self.container_size[1] * (col / self.density)
-                z_norm = self.normalize_value(res[row][col], "z")
-                verts.append((x_norm, y_norm, z_norm))
-                if row < self.density - 1 and col < self.density - 1:
-                    fac = self.face(col, row)
-                    faces.append(fac)
+
+        # The animated columns are interpolated together with the values, so the
+        # interpolation is computed only once
+        columns = [2]
+        if self.anim_settings.animate:
+            columns += list(range(3, 3 + self.dm.tail_length))
+
+        try:
+            interpolated = interpolation.interpolate_grid(
+                px,
+                py,
+                [[entry[i] for i in columns] for entry in self.data],
+                x,
+                y,
+                engine=self.interpolation_engine,
+                function=self.rbf_function,
+                neighbors=self.neighbors,
+                workers=get_preferences(context).interpolation_workers,
+            )
+        except ValueError as e:
+            self.report({"ERROR"}, str(e))
+            return {"CANCELLED"}
+
+        res = interpolated[..., 0]
+
+        self.create_container()
+
+        rows, cols = np.meshgrid(
+            np.arange(self.density), np.arange(self.density), indexing="ij"
+        )
+        verts = np.empty((self.density * self.density, 3))
+        verts[:, 0] = self.container_size[0] * (rows.ravel() / self.density)
+        verts[:, 1] = self.container_size[1] * (cols.ravel() / self.density)
+        verts[:, 2] = self.normalize_value(res.ravel(), "z")
 
         mesh = bpy.data.meshes.new("DV_SurfaceChart_Mesh")
-        mesh.from_pydata(verts, [], faces)
+        mesh_utils.fill_mesh(
+            mesh, verts, faces=mesh_utils.grid_faces(self.density, self.density)
+        )
 
         obj = bpy.data.objects.new("SurfaceChart_Mesh_Obj", mesh)
         bpy.context.scene.collection.objects.link(obj)
@@ -138,27 +171,17 @@ class OBJECT_OT_SurfaceChart(OBJECT_OT_GenericChart):
         obj.active_material = mat
 
         if self.anim_settings.animate:
-            verts = obj.data.vertices
+            co = verts.astype(np.float32)
             sk_basis = obj.shape_key_add(name="Basis")
             frame_n = context.scene.frame_current
             sk_basis.keyframe_insert(data_path="value", frame=frame_n)
 
-            start_idx = 3  # cause of 3 dimensions supported and already parsed
-
             # Create shape keys
-            for n in range(start_idx, start_idx + self.dm.tail_length):
-                f = [entry[n] for entry in self.data]
-                rbfi = interpolate.Rbf(px, py, f, function=self.rbf_function)
-                res = rbfi(X, Y)
-
+            for i, n in enumerate(columns[1:], start=1):
                 sk = obj.shape_key_add(name="Column: " + str(n))
-
-                for i in range(len(verts)):
-                    z_norm = self.normalize_value(
-                        res[i % self.density][i // self.density], "z"
-                    )
-                    sk.data[i].co.z = z_norm
-                    sk.value = 0
+                sk.value = 0
+                co[:, 2] = self.normalize_value(interpolated[..., i].T.ravel(), "z")
+                sk.data.foreach_set("co", co.ravel())
 
                 # add animation
 
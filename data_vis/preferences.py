@@ -2,12 +2,14 @@
 
 import os
 import bpy
+import typing
 import logging
 
 logger = logging.getLogger("data_vis")
 
-from .geonodes.data import DV_DataProperties
+from .geonodes.data import DV_DataProperties, AnimationStorage
 from .geonodes.library import MaterialType
+from .data_manager import DataManager, StreamSettings
 
 
 EXAMPLE_DATA_FOLDER = "example_data"
@@ -40,6 +42,11 @@ def update_region_type(self, context):
     _try_update_classes_prop(self, "bl_region_type", "ui_region_type")
 
 
+def update_data_memory_budget(self, context):
+    DataManager.registry.memory_budget = self.data_memory_budget * 1024 * 1024
+    DataManager.registry.evict()
+
+
 def get_example_data_path() -> str:
     return os.path.abspath(os.path.join(os.path.dirname(__file__), EXAMPLE_DATA_FOLDER))
 
@@ -62,6 +69,66 @@ class DV_Preferences(bpy.types.AddonPreferences):
 
     debug: bpy.props.BoolProperty(name="Toggle Debug Options", default=False)
 
+    cache_data: bpy.props.BoolProperty(
+        name="Cache Parsed Data",
+        description="Stores parsed data in a binary cache, unchanged files are then loaded "
+        "from the cache without parsing them again",
+        default=True,
+    )
+
+    data_memory_budget: bpy.props.IntProperty(
+        name="Loaded Data Memory (MB)",
+        description="How much memory can data of loaded files take, least recently used "
+        "files are released from memory when exceeded",
+        default=1024,
+        min=1,
+        update=update_data_memory_budget,
+    )
+
+    stream_data: bpy.props.BoolProperty(
+        name="Stream Large Files",
+        description="Reads files in chunks and loads only a sample of their rows, so files "
+        "larger than memory can be visualised. Settings apply to newly loaded files",
+        default=False,
+    )
+
+    stream_row_budget: bpy.props.IntProperty(
+        name="Row Budget",
+        description="Maximum number of rows loaded from a streamed file, reading stops "
+        "when reached, 0 loads all of the rows",
+        default=1000000,
+        min=0,
+    )
+
+    stream_stride: bpy.props.IntProperty(
+        name="Row Stride",
+        description="Only every n-th row of a streamed file is loaded",
+        default=1,
+        min=1,
+    )
+
+    live_data: bpy.props.BoolProperty(
+        name="Live Data",
+        description="Watches loaded files for changes, rows appended to them are read and "
+        "charts created from them are updated",
+        default=False,
+    )
+
+    live_poll_interval: bpy.props.FloatProperty(
+        name="Poll Interval (s)",
+        description="How often are the loaded files checked for changes",
+        default=1.0,
+        min=0.1,
+    )
+
+    live_max_update_rate: bpy.props.FloatProperty(
+        name="Max Updates per Second",
+        description="How many times per second can charts of one file be updated at most, "
+        "changes made in between are applied together",
+        default=1.0,
+        min=0.01,
+    )
+
     show_data_examples: bpy.props.BoolProperty(
         name="Show Data Examples",
         description="If true then data examples are shown and can be loaded",
@@ -93,6 +160,29 @@ class DV_Preferences(bpy.types.AddonPreferences):
         items=MaterialType.as_enum_items(),
     )
 
+    generate_in_background: bpy.props.BoolProperty(
+        name="Generate Charts in Background",
+        description="Charts created from the UI are computed in the background and "
+        "the progress is shown, the creation can be cancelled with Esc",
+        default=True,
+    )
+
+    interpolation_workers: bpy.props.IntProperty(
+        name="Interpolation Processes",
+        description="Number of processes used to interpolate animated surface charts, "
+        "0 or 1 interpolates in Blender itself. Starting the processes has an overhead, "
+        "it pays off only for large data with many animated columns",
+        default=0,
+        min=0,
+        max=64,
+    )
+
+    animation_storage: bpy.props.EnumProperty(
+        name="Animation Storage",
+        description="How animated columns of the data are stored on new charts",
+        items=AnimationStorage.as_enum_items(),
+    )
+
     def get_addon_mode(self, context: bpy.types.Context):
         ret = []
         if bpy.app.version >= (4, 2, 0):
@@ -146,8 +236,38 @@ class DV_Preferences(bpy.types.AddonPreferences):
 
         box = layout.box()
         box.label(text="Other Settings", icon="PLUGIN")
-        box.prop(self, "debug")
+        row = box.row()
+        row.prop(self, "debug")
+        if self.debug:
+            row.operator("data_vis.refresh_library", icon="FILE_REFRESH")
+        row = box.row()
+        row.prop(self, "cache_data")
+        row.operator("data_vis.clear_data_cache", icon="TRASH")
+        box.prop(self, "data_memory_budget")
+        box.prop(self, "stream_data")
+        if self.stream_data:
+            row = box.row()
+            row.prop(self, "stream_row_budget")
+            row.prop(self, "stream_stride")
+        box.prop(self, "live_data")
+        if self.live_data:
+            row = box.row()
+            row.prop(self, "live_poll_interval")
+            row.prop(self, "live_max_update_rate")
+        box.prop(self, "animation_storage")
+        box.prop(self, "generate_in_background")
+        box.prop(self, "interpolation_workers")
 
 
 def get_preferences(context):
     return context.preferences.addons[__package__].preferences
+
+
+def get_stream_settings(context) -> typing.Optional[StreamSettings]:
+    """Returns settings of the streaming mode from preferences, None if it is disabled"""
+    preferences = get_preferences(context)
+    if not preferences.stream_data:
+        return None
+    return StreamSettings(
+        row_budget=preferences.stream_row_budget, stride=preferences.stream_stride
+    )
@@ -0,0 +1,111 @@
+# ©copyright Zdenek Dolezal 2024-, License GPL
+# Binary sidecar cache of parsed data, so files don't have to be parsed again when reloaded
+
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import typing
+import logging
+import numpy as np
+
+logger = logging.getLogger("data_vis")
+
+# Increase when the stored format changes, sidecars with other version are ignored
+CACHE_VERSION = 1
+CACHE_FOLDER = os.path.join(tempfile.gettempdir(), "data_vis_cache")
+
+
+def _get_entry_folder(filepath: str) -> str:
+    path_hash = hashlib.sha1(os.path.abspath(filepath).encode("UTF-8")).hexdigest()
+    return os.path.join(CACHE_FOLDER, path_hash[:16])
+
+
+def _get_stamp(filepath: str) -> str:
+    """Identifies the file version by its modification time and size"""
+    stat = os.stat(filepath)
+    return f"{stat.st_mtime_ns}_{stat.st_size}"
+
+
+def load(
+    filepath: str,
+) -> typing.Optional[
+    typing.Tuple[typing.Dict[str, typing.Any], np.ndarray, typing.Optional[np.ndarray]]
+]:
+    """
+    Returns (metadata, values, categories) stored for the current version of 'filepath'. The
+    arrays are memory mapped, so they are read from the disk only when accessed. Returns None
+    if there is no valid sidecar.
+    """
+    folder = _get_entry_folder(filepath)
+    stamp = _get_stamp(filepath)
+    meta_path = os.path.join(folder, f"{stamp}.json")
+    if not os.path.isfile(meta_path):
+        return None
+
+    try:
+        with open(meta_path, "r", encoding="UTF-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != CACHE_VERSION:
+            return None
+
+        values = np.load(os.path.join(folder, f"{stamp}.values.npy"), mmap_mode="r")
+        categories = None
+        if meta.get("has_categories", False):
+            categories = np.load(
+                os.path.join(folder, f"{stamp}.categories.npy"), mmap_mode="r"
+            )
+    except Exception:
+        logger.exception(f"Failed to read cached data for {filepath}")
+        return None
+
+    logger.debug(f"Loaded cached data for {filepath} from {folder}")
+    return meta, values, categories
+
+
+def store(
+    filepath: str,
+    meta: typing.Dict[str, typing.Any],
+    values: np.ndarray,
+    categories: typing.Optional[np.ndarray] = None,
+) -> None:
+    """Stores parsed columns of 'filepath' with its metadata, replaces older versions"""
+    folder = _get_entry_folder(filepath)
+    stamp = _get_stamp(filepath)
+    try:
+        os.makedirs(folder, exist_ok=True)
+        np.save(os.path.join(folder, f"{stamp}.values.npy"), values)
+        if categories is not None:
+            np.save(os.path.join(folder, f"{stamp}.categories.npy"), categories)
+
+        # Metadata are written last, the entry is valid only if they exist
+        meta = {
+            **meta,
+            "version": CACHE_VERSION,
+            "filepath": os.path.abspath(filepath),
+            "has_categories": categories is not None,
+        }
+        with open(os.path.join(folder, f"{stamp}.json"), "w", encoding="UTF-8") as f:
+            json.dump(meta, f)
+    except Exception:
+        logger.exception(f"Failed to cache data for {filepath}")
+        return
+
+    _remove_stale(folder, stamp)
+
+
+def _remove_stale(folder: str, stamp: str) -> None:
+    for filename in os.listdir(folder):
+        if filename.startswith(f"{stamp}."):
+            continue
+        try:
+            os.remove(os.path.join(folder, filename))
+        except OSError:
+            # The file can still be memory mapped (Windows), it will be removed next time
+            logger.debug(f"Couldn't remove stale cache file {filename}")
+
+
+def clear() -> None:
+    """Removes all cached data"""
+    shutil.rmtree(CACHE_FOLDER, ignore_errors=True)
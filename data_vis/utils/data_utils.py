@@ -3,59 +3,54 @@
 
 import math
 import logging
+import numpy as np
 
 logger = logging.getLogger("data_vis")
 
 
-def find_axis_range(data, val_idx):
+def range_mask(values, value_range):
+    """Returns boolean mask of 'values' that are in the inclusive range (min, max)"""
+    return (values >= value_range[0]) & (values <= value_range[1])
+
+
+def find_axis_range(dm, val_idx):
     """
     Finds range of data on index
     Parameters:
-    data - data to find range in
-    val_idx - idx where to access for data
+    dm - DataManager with the data to find range in
+    val_idx - idx of the column in the data
     """
-    return (
-        min(data, key=lambda x: x[val_idx])[val_idx],
-        max(data, key=lambda x: x[val_idx])[val_idx],
-    )
+    values = dm.get_column(val_idx)
+    return (values.min().item(), values.max().item())
 
 
-def get_data_in_range(data, range_x):
+def get_data_in_range(dm, range_x):
     """
-    Returns data in specified range
+    Returns rows of data in specified range
     Parameters:
-    data - data to search in
+    dm - DataManager with the data to search in
     range_x - range of result data
     """
-    return list(filter(lambda val: range_x[0] <= val[0] <= range_x[1], data))
+    mask = range_mask(dm.get_column(0), range_x)
+    rows = dm.get_parsed_data()
+    return [rows[i] for i in np.flatnonzero(mask)]
 
 
-def find_data_range(data, range_x, range_y=None):
+def find_data_range(dm, range_x, range_y=None):
     """
     Finds data value range in parameter data in space defined by range_x and range_yy
-    data - data defined as list of lists, each row consist of [x, (y), top]
+    dm - DataManager with data, each row consist of [x, (y), top]
     range_x - bounds in x direction (min, max)
     range_y - bounds in y direction (min, max)
 
     returns - (min, max) of data
     """
-    if range_y is None:
-        filtered_data = list(
-            filter(lambda row: range_x[0] <= row[0] <= range_x[1], data)
-        )
-    else:
-        filtered_data = list(
-            filter(
-                lambda val: range_x[0] <= val[0] <= range_x[1]
-                and range_y[0] <= val[1] <= range_y[1],
-                data,
-            )
-        )
+    mask = range_mask(dm.get_column(0), range_x)
+    if range_y is not None:
+        mask &= range_mask(dm.get_column(1), range_y)
     top_index = 1 if range_y is None else 2
-    return (
-        min(filtered_data, key=lambda x: x[top_index])[top_index],
-        max(filtered_data, key=lambda x: x[top_index])[top_index],
-    )
+    values = dm.get_column(top_index)[mask]
+    return (values.min().item(), values.max().item())
 
 
 def float_range(start, stop=None, step=None, precision=0.00001):
@@ -95,3 +90,13 @@ def normalize_value(value, minimum, maximum):
         return 1.0
 
     return (value - minimum) / (maximum - minimum)
+
+
+def normalize_values(values, minimum, maximum):
+    """Normalizes all of the 'values' array at once, see 'normalize_value'"""
+    values = np.asarray(values, dtype=np.float64)
+    if math.isclose(maximum - minimum, 0):
+        logger.error("Division by zero in normalize value!")
+        return np.ones_like(values)
+
+    return (values - minimum) / (maximum - minimum)
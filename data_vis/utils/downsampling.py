@@ -0,0 +1,101 @@
+# ©copyright Zdenek Dolezal 2024-, License GPL
+# Downsampling of large series for the line charts, picks a subset of the rows that keeps
+# the visual shape of the line. This module can't depend on bpy, it is used from the
+# background jobs.
+
+import numpy as np
+
+
+class Method:
+    NONE = "NONE"
+    LTTB = "LTTB"
+    MIN_MAX = "MIN_MAX"
+
+
+METHODS_ENUM = [
+    (Method.NONE, "None", "[DEFAULT] All of the data points are used"),
+    (
+        Method.LTTB,
+        "LTTB",
+        "Largest Triangle Three Buckets, keeps the points that contribute the most to the "
+        "shape of the line",
+    ),
+    (
+        Method.MIN_MAX,
+        "Min / Max",
+        "Keeps the lowest and the highest point of each bucket, preserves spikes in the data",
+    ),
+]
+
+
+def downsample_indices(
+    x: np.ndarray, y: np.ndarray, target: int, method: str = Method.LTTB
+) -> np.ndarray:
+    """
+    Returns sorted indices of at most 'target' points of the series given by 'x' and 'y'.
+    The first and the last point are always kept. All indices are returned if the series
+    has at most 'target' points or if the method is NONE.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    count = len(x)
+    if method == Method.NONE or count <= target or target <= 0:
+        return np.arange(count)
+    if target < 3:
+        return np.array([0, count - 1])[:target]
+
+    if method == Method.LTTB:
+        return _lttb(x, y, target)
+    elif method == Method.MIN_MAX:
+        return _min_max(y, target)
+    else:
+        raise ValueError(f"Unknown downsampling method {method}")
+
+
+def _bucket_bounds(count: int, buckets: int) -> np.ndarray:
+    """Bounds of 'buckets' buckets splitting points between the first and the last one"""
+    return np.linspace(1, count - 1, buckets + 1).astype(np.int64)
+
+
+def _lttb(x: np.ndarray, y: np.ndarray, target: int) -> np.ndarray:
+    bounds = _bucket_bounds(len(x), target - 2)
+    indices = np.empty(target, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = len(x) - 1
+    selected = 0
+    for i in range(target - 2):
+        start, end = bounds[i], bounds[i + 1]
+        # Third point of the triangle is the average of the next bucket
+        if i + 2 < len(bounds):
+            next_start, next_end = bounds[i + 1], bounds[i + 2]
+            next_x = x[next_start:next_end].mean()
+            next_y = y[next_start:next_end].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+
+        # Doubled area of triangles formed by the selected point, each point of the bucket
+        # and the average of the next bucket
+        areas = np.abs(
+            (x[selected] - next_x) * (y[start:end] - y[selected])
+            - (x[selected] - x[start:end]) * (next_y - y[selected])
+        )
+        selected = start + int(np.argmax(areas))
+        indices[i + 1] = selected
+
+    return indices
+
+
+def _min_max(y: np.ndarray, target: int) -> np.ndarray:
+    count = len(y)
+    buckets = (target - 2) // 2
+    if buckets == 0:
+        return np.array([0, count - 1])
+
+    bounds = _bucket_bounds(count, buckets)
+    bucket_ids = np.repeat(np.arange(buckets), np.diff(bounds))
+    # Points of each bucket ordered by value, so the minimum is the first one of the bucket
+    # and the maximum the last one
+    order = np.lexsort((y[1:-1], bucket_ids)) + 1
+    starts = bounds[:-1] - 1
+    ends = bounds[1:] - 2
+    return np.unique(np.concatenate(([0, count - 1], order[starts], order[ends])))
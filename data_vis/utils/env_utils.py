@@ -8,6 +8,7 @@ import typing
 import threading
 import subprocess
 import logging
+from . import ui_memo
 
 logger = logging.getLogger("data_vis")
 
@@ -57,6 +58,8 @@ def ensure_python_module(module_name: str):
 def ensure_python_modules(module_names: typing.List[str]):
     for module_name in module_names:
         ensure_python_module(module_name)
+    # Polls remember which modules are available
+    ui_memo.invalidate()
 
 
 def ensure_python_modules_new_thread(module_names: typing.List[str]):
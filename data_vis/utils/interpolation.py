@@ -1,4 +1,15 @@
 # ©copyright Zdenek Dolezal 2024-, License GPL
+# Interpolation of scattered data into grids. This module can't depend on bpy or on the rest
+# of the addon, it is imported by itself in the worker processes.
+
+import os
+import sys
+import contextlib
+import importlib
+import logging
+import numpy as np
+
+logger = logging.getLogger("data_vis")
 
 TYPES_ENUM = [
     ("multiquadric", "Multiquadric", "[DEFAULT] sqrt((r/self.epsilon)**2 + 1"),
@@ -9,3 +20,280 @@ TYPES_ENUM = [
     ("quintic", "Quintic", "r**5"),
     ("thin_plate", "Thin Plate", "r**2 * log(r)"),
 ]
+
+
+class Engine:
+    RBF = "RBF"
+    RBF_LOCAL = "RBF_LOCAL"
+    LINEAR = "LINEAR"
+    CUBIC = "CUBIC"
+    REGULAR_GRID = "REGULAR_GRID"
+
+
+ENGINES_ENUM = [
+    (
+        Engine.RBF,
+        "RBF",
+        "[DEFAULT] Exact radial basis function interpolation through all of the data points, "
+        "slow and memory heavy for more than a few thousand points",
+    ),
+    (
+        Engine.RBF_LOCAL,
+        "RBF (Local)",
+        "Radial basis function interpolation using only the nearest data points, "
+        "suitable for large data",
+    ),
+    (
+        Engine.LINEAR,
+        "Linear",
+        "Piecewise linear interpolation on a triangulation of the data points, fastest",
+    ),
+    (
+        Engine.CUBIC,
+        "Cubic",
+        "Piecewise cubic interpolation on a triangulation of the data points",
+    ),
+    (
+        Engine.REGULAR_GRID,
+        "Regular Grid",
+        "Fast path for data that are already sampled on a regular X, Y grid",
+    ),
+]
+
+DEFAULT_NEIGHBORS = 64
+
+# Names of the 'scipy.interpolate.Rbf' functions in 'scipy.interpolate.RBFInterpolator'
+_RBF_INTERPOLATOR_KERNELS = {
+    "multiquadric": "multiquadric",
+    "inverse": "inverse_multiquadric",
+    "gaussian": "gaussian",
+    "linear": "linear",
+    "cubic": "cubic",
+    "quintic": "quintic",
+    "thin_plate": "thin_plate_spline",
+}
+
+
+def _rbf_epsilon(x: np.ndarray, y: np.ndarray) -> float:
+    """Default epsilon of 'scipy.interpolate.Rbf', average distance between the points"""
+    edges = np.array([np.ptp(x), np.ptp(y)])
+    edges = edges[edges > 0]
+    if len(edges) == 0:
+        return 1.0
+    return float(np.power(np.prod(edges) / len(x), 1.0 / len(edges)))
+
+
+def _regular_grid_values(
+    x: np.ndarray, y: np.ndarray, values: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns unique x, unique y and values reshaped to [x, y, ...] if the points form a grid"""
+    unique_x, x_idx = np.unique(x, return_inverse=True)
+    unique_y, y_idx = np.unique(y, return_inverse=True)
+    grid = np.full((len(unique_x), len(unique_y), *values.shape[1:]), np.nan)
+    grid[x_idx, y_idx] = values
+    if len(x) != len(unique_x) * len(unique_y) or np.isnan(grid).any():
+        raise ValueError(
+            "Data aren't on a regular grid, each X, Y combination has to have exactly one value"
+        )
+
+    return unique_x, unique_y, grid
+
+
+def interpolate_grid(
+    x: np.ndarray,
+    y: np.ndarray,
+    values: np.ndarray,
+    grid_x: np.ndarray,
+    grid_y: np.ndarray,
+    engine: str = Engine.RBF,
+    function: str = "multiquadric",
+    neighbors: int = DEFAULT_NEIGHBORS,
+    workers: int = 0,
+) -> np.ndarray:
+    """
+    Interpolates 'values' sampled at scattered 'x', 'y' points into a grid given by 'grid_x'
+    and 'grid_y' coordinates. Returns array of shape (len(grid_y), len(grid_x)), same as
+    calling 'scipy.interpolate.Rbf' on 'np.meshgrid(grid_x, grid_y)'. 'function' is used
+    only by the RBF engines.
+
+    'values' can be also of shape (N, K), then all K columns are interpolated at once, the
+    interpolant is built only once for all of them, and (len(grid_y), len(grid_x), K) array
+    is returned. If 'workers' is more than 1, the columns are split between that many
+    processes instead.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    is_single_column = values.ndim == 1
+    if is_single_column:
+        values = values.reshape(-1, 1)
+
+    if workers > 1 and values.shape[1] > 1:
+        try:
+            return _interpolate_columns_in_processes(
+                x, y, values, grid_x, grid_y, engine, function, neighbors, workers
+            )
+        except (OSError, RuntimeError, ImportError):
+            # ValueError is not caught, it is an issue with the data, not with the processes
+            logger.exception(
+                "Interpolation in processes failed, interpolating serially"
+            )
+
+    X, Y = np.meshgrid(grid_x, grid_y)
+    res = _interpolate_columns(x, y, values, X, Y, engine, function, neighbors)
+    return res[..., 0] if is_single_column else res
+
+
+def _interpolate_columns(
+    x: np.ndarray,
+    y: np.ndarray,
+    values: np.ndarray,
+    X: np.ndarray,
+    Y: np.ndarray,
+    engine: str,
+    function: str,
+    neighbors: int,
+) -> np.ndarray:
+    """Interpolates (N, K) 'values' into (*X.shape, K) array"""
+    try:
+        from scipy import interpolate
+    except ImportError:
+        raise RuntimeError("SciPy is required for this operation")
+
+    if engine == Engine.RBF:
+        # The 'N-D' mode solves the system for all of the columns at once
+        rbf = interpolate.Rbf(x, y, values, function=function, mode="N-D")
+        return rbf(X, Y).reshape(*X.shape, values.shape[1])
+
+    if engine == Engine.RBF_LOCAL:
+        kernel = _RBF_INTERPOLATOR_KERNELS.get(function)
+        if kernel is None:
+            raise ValueError(f"Unknown interpolation function {function}")
+        # Rbf divides the distance by epsilon, RBFInterpolator multiplies it
+        rbf = interpolate.RBFInterpolator(
+            np.column_stack((x, y)),
+            values,
+            neighbors=min(neighbors, len(x)),
+            kernel=kernel,
+            epsilon=1.0 / _rbf_epsilon(x, y),
+        )
+        res = rbf(np.column_stack((X.ravel(), Y.ravel())))
+        return res.reshape(*X.shape, values.shape[1])
+
+    if engine in {Engine.LINEAR, Engine.CUBIC}:
+        points = np.column_stack((x, y))
+        res = interpolate.griddata(points, values, (X, Y), method=engine.lower())
+        # Corners of the grid can be outside of the convex hull of the points
+        outside = np.isnan(res).any(axis=-1)
+        if outside.any():
+            res[outside] = interpolate.griddata(
+                points, values, (X[outside], Y[outside]), method="nearest"
+            )
+        return res
+
+    if engine == Engine.REGULAR_GRID:
+        unique_x, unique_y, grid = _regular_grid_values(x, y, values)
+        rgi = interpolate.RegularGridInterpolator(
+            (unique_x, unique_y), grid, bounds_error=False, fill_value=None
+        )
+        return rgi((X, Y))
+
+    raise ValueError(f"Unknown interpolation engine {engine}")
+
+
+def _interpolate_into_shared_memory(
+    shm_name: str,
+    shape: tuple[int, int, int],
+    start: int,
+    stop: int,
+    x: np.ndarray,
+    y: np.ndarray,
+    values: np.ndarray,
+    grid_x: np.ndarray,
+    grid_y: np.ndarray,
+    engine: str,
+    function: str,
+    neighbors: int,
+) -> None:
+    """Runs in a worker process, writes columns [start, stop) of the result into 'shm_name'"""
+    from multiprocessing import shared_memory
+
+    X, Y = np.meshgrid(grid_x, grid_y)
+    res = _interpolate_columns(x, y, values, X, Y, engine, function, neighbors)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        out = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        out[..., start:stop] = res
+        del out
+    finally:
+        shm.close()
+
+
+@contextlib.contextmanager
+def _worker_module():
+    """
+    Yields this module imported as a top level module. The workers are plain Python
+    processes, importing the addon package there would fail on missing bpy. The folder is on
+    'sys.path' only while the workers are started, they inherit it.
+    """
+    folder = os.path.dirname(os.path.abspath(__file__))
+    sys.path.insert(0, folder)
+    try:
+        yield importlib.import_module(os.path.splitext(os.path.basename(__file__))[0])
+    finally:
+        sys.path.remove(folder)
+
+
+def _interpolate_columns_in_processes(
+    x: np.ndarray,
+    y: np.ndarray,
+    values: np.ndarray,
+    grid_x: np.ndarray,
+    grid_y: np.ndarray,
+    engine: str,
+    function: str,
+    neighbors: int,
+    workers: int,
+) -> np.ndarray:
+    import multiprocessing
+    import concurrent.futures
+    from multiprocessing import shared_memory
+    from . import env_utils
+
+    shape = (len(grid_y), len(grid_x), values.shape[1])
+    workers = min(workers, values.shape[1])
+    bounds = np.linspace(0, values.shape[1], workers + 1).astype(int)
+    # Results are written by the workers directly to the shared memory, only the inputs
+    # are sent to them.
+    shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * 8)
+    try:
+        mp_context = multiprocessing.get_context("spawn")
+        mp_context.set_executable(env_utils.get_python_path())
+        with _worker_module() as worker_module, concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, mp_context=mp_context
+        ) as executor:
+            futures = [
+                executor.submit(
+                    worker_module._interpolate_into_shared_memory,
+                    shm.name,
+                    shape,
+                    start,
+                    stop,
+                    x,
+                    y,
+                    values[:, start:stop],
+                    grid_x,
+                    grid_y,
+                    engine,
+                    function,
+                    neighbors,
+                )
+                for start, stop in zip(bounds[:-1], bounds[1:])
+            ]
+            for future in futures:
+                future.result()
+
+        return np.ndarray(shape, dtype=np.float64, buffer=shm.buf).copy()
+    finally:
+        shm.close()
+        shm.unlink()
@@ -0,0 +1,112 @@
+# ©copyright Zdenek Dolezal 2024-, License GPL
+# Jobs that compute in a background thread and then write to Blender data in small chunks,
+# so the UI stays responsive.
+
+import bpy
+import time
+import typing
+import threading
+import logging
+
+logger = logging.getLogger("data_vis")
+
+# How long one timer tick can write to Blender data
+STEP_BUDGET = 0.02
+
+T = typing.TypeVar("T")
+R = typing.TypeVar("R")
+# Generator that applies the prepared result, yields progress <0, 1> after each chunk and
+# returns the final result.
+ApplySteps = typing.Generator[float, None, R]
+
+
+def run_steps(steps: ApplySteps) -> R:
+    """Runs all of the 'steps' at once and returns their result"""
+    while True:
+        try:
+            next(steps)
+        except StopIteration as e:
+            return e.value
+
+
+class BackgroundJob(typing.Generic[T, R]):
+    """
+    Runs 'prepare' in a background thread. The function can't touch any Blender data. Its
+    result is passed to 'apply', which is advanced from 'bpy.app.timers' in chunks limited by
+    STEP_BUDGET. If the job is cancelled while applying, the 'apply' generator is closed, it
+    should remove the data it already created.
+    """
+
+    def __init__(
+        self,
+        prepare: typing.Callable[[], T],
+        apply: typing.Callable[[T], ApplySteps],
+    ):
+        self.prepare = prepare
+        self.apply = apply
+        self.result: typing.Optional[R] = None
+        self.error: typing.Optional[Exception] = None
+        self.progress = 0.0
+        self.finished = False
+        self.cancelled = False
+        self._prepared: typing.Optional[T] = None
+        self._steps: typing.Optional[ApplySteps] = None
+        self._thread = threading.Thread(target=self._run_prepare, daemon=True)
+        # Timers are identified by the function object, bound method is created on each access
+        self._timer = self._tick
+
+    def start(self) -> None:
+        self._thread.start()
+        bpy.app.timers.register(self._timer, first_interval=0.0)
+
+    def cancel(self) -> None:
+        """Stops the job, the thread can't be interrupted, its result is thrown away"""
+        if self.finished:
+            return
+        self.cancelled = True
+        if bpy.app.timers.is_registered(self._timer):
+            bpy.app.timers.unregister(self._timer)
+        self._finish()
+
+    def _run_prepare(self) -> None:
+        try:
+            self._prepared = self.prepare()
+        except Exception as e:
+            logger.exception("Background job failed")
+            self.error = e
+
+    def _tick(self) -> typing.Optional[float]:
+        if self.finished:
+            return None
+
+        if self._thread.is_alive():
+            return 0.1
+
+        if self.error is not None:
+            self._finish()
+            return None
+
+        try:
+            if self._steps is None:
+                self._steps = self.apply(self._prepared)
+
+            start = time.perf_counter()
+            while time.perf_counter() - start < STEP_BUDGET:
+                self.progress = next(self._steps)
+        except StopIteration as e:
+            self.result = e.value
+            self.progress = 1.0
+            self._finish()
+            return None
+        except Exception as e:
+            logger.exception("Background job failed")
+            self.error = e
+            self._finish()
+            return None
+
+        return 0.0
+
+    def _finish(self) -> None:
+        self.finished = True
+        if self._steps is not None:
+            self._steps.close()
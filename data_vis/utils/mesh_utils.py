@@ -0,0 +1,217 @@
+# ©copyright Zdenek Dolezal 2024-, License GPL
+# Utility functions for building meshes from NumPy arrays
+
+import bpy
+import typing
+import numpy as np
+
+
+def grid_faces(m: int, n: int) -> np.ndarray:
+    """
+    Returns (m - 1) * (n - 1) quads of a grid with m rows and n columns, where the vertex
+    at [row, col] has index row * n + col.
+    """
+    if m < 2 or n < 2:
+        return np.empty((0, 4), dtype=np.int32)
+
+    cols, rows = np.meshgrid(np.arange(n - 1), np.arange(m - 1), indexing="ij")
+    starts = (rows * n + cols).ravel().astype(np.int32)
+    return np.column_stack((starts, starts + n, starts + n + 1, starts + 1))
+
+
+def fill_mesh(
+    mesh: bpy.types.Mesh,
+    verts: np.ndarray,
+    edges: typing.Optional[np.ndarray] = None,
+    faces: typing.Optional[np.ndarray] = None,
+) -> None:
+    """
+    Fills empty 'mesh' with the geometry. Equivalent of 'mesh.from_pydata', but the data
+    are written with 'foreach_set' in bulk. All of the 'faces' have to have the same
+    number of vertices.
+    """
+    verts = np.ascontiguousarray(verts, dtype=np.float32).reshape(-1, 3)
+    mesh.vertices.add(len(verts))
+    mesh.vertices.foreach_set("co", verts.ravel())
+
+    if edges is not None and len(edges) > 0:
+        edges = np.ascontiguousarray(edges, dtype=np.int32).reshape(-1, 2)
+        mesh.edges.add(len(edges))
+        mesh.edges.foreach_set("vertices", edges.ravel())
+
+    has_faces = faces is not None and len(faces) > 0
+    if has_faces:
+        faces = np.ascontiguousarray(faces, dtype=np.int32)
+        face_count, face_size = faces.shape
+        _add_polygons(
+            mesh,
+            faces.ravel(),
+            np.arange(0, faces.size, face_size, dtype=np.int32),
+        )
+
+    mesh.update(calc_edges=has_faces)
+
+
+def fill_mesh_polygons(
+    mesh: bpy.types.Mesh,
+    verts: np.ndarray,
+    loop_vertices: np.ndarray,
+    loop_starts: np.ndarray,
+) -> None:
+    """
+    Fills empty 'mesh' with polygons of any size. 'loop_vertices' are vertex indices of
+    all polygons one after another, 'loop_starts' are indices where each polygon starts.
+    """
+    verts = np.ascontiguousarray(verts, dtype=np.float32).reshape(-1, 3)
+    mesh.vertices.add(len(verts))
+    mesh.vertices.foreach_set("co", verts.ravel())
+    _add_polygons(
+        mesh,
+        np.ascontiguousarray(loop_vertices, dtype=np.int32),
+        np.ascontiguousarray(loop_starts, dtype=np.int32),
+    )
+    mesh.update(calc_edges=True)
+
+
+def _add_polygons(
+    mesh: bpy.types.Mesh, loop_vertices: np.ndarray, loop_starts: np.ndarray
+) -> None:
+    mesh.loops.add(len(loop_vertices))
+    mesh.loops.foreach_set("vertex_index", loop_vertices)
+    mesh.polygons.add(len(loop_starts))
+    mesh.polygons.foreach_set("loop_start", loop_starts)
+    if bpy.app.version < (4, 0, 0):
+        mesh.polygons.foreach_set(
+            "loop_total", np.diff(loop_starts, append=len(loop_vertices))
+        )
+
+
+def get_mesh_polygons(
+    mesh: bpy.types.Mesh,
+) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns vertices, loop vertices and loop starts of 'mesh', see 'fill_mesh_polygons'"""
+    verts = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", verts)
+    loop_vertices = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_vertices)
+    loop_starts = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", loop_starts)
+    return verts.reshape(-1, 3), loop_vertices, loop_starts
+
+
+def cube_polygons() -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Cube of size 2 centered at the origin, same as 'bpy.ops.mesh.primitive_cube_add'"""
+    verts = np.array(
+        [[x, y, z] for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)],
+        dtype=np.float32,
+    )
+    faces = np.array(
+        [
+            [0, 1, 3, 2],
+            [2, 3, 7, 6],
+            [6, 7, 5, 4],
+            [4, 5, 1, 0],
+            [2, 6, 4, 0],
+            [7, 3, 1, 5],
+        ],
+        dtype=np.int32,
+    )
+    return verts, faces.ravel(), np.arange(0, faces.size, 4, dtype=np.int32)
+
+
+def cylinder_polygons(
+    segments: int = 16,
+) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Cylinder with radius 1 and depth 2 centered at the origin, same as
+    'bpy.ops.mesh.primitive_cylinder_add'
+    """
+    angles = np.linspace(0, 2 * np.pi, segments, endpoint=False)
+    ring = np.column_stack((np.sin(angles), np.cos(angles)))
+    verts = np.vstack(
+        (
+            np.column_stack((ring, np.full(segments, -1.0))),
+            np.column_stack((ring, np.full(segments, 1.0))),
+        )
+    ).astype(np.float32)
+    bottom = np.arange(segments, dtype=np.int32)
+    bottom_next = np.roll(bottom, -1)
+    sides = np.column_stack(
+        (bottom, bottom + segments, bottom_next + segments, bottom_next)
+    )
+    loop_vertices = np.concatenate(
+        (sides.ravel(), bottom, (bottom + segments)[::-1])
+    ).astype(np.int32)
+    loop_starts = np.concatenate(
+        (
+            np.arange(0, sides.size, 4),
+            [sides.size, sides.size + segments],
+        )
+    ).astype(np.int32)
+    return verts, loop_vertices, loop_starts
+
+
+def tile_polygons(
+    loop_vertices: np.ndarray, loop_starts: np.ndarray, vert_count: int, count: int
+) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """
+    Repeats polygons of a mesh with 'vert_count' vertices 'count' times, each copy uses its
+    own vertices. Returns loop vertices and loop starts of all the copies.
+    """
+    offsets = np.arange(count, dtype=np.int32)
+    tiled_loops = (loop_vertices[None, :] + offsets[:, None] * vert_count).ravel()
+    tiled_starts = (
+        loop_starts[None, :] + offsets[:, None] * len(loop_vertices)
+    ).ravel()
+    return tiled_loops.astype(np.int32), tiled_starts.astype(np.int32)
+
+
+def pie_slice_polygons(
+    segment_from: int, segment_to: int, segments: int, radius: float, height: float
+) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Slice of a pie made of 'segments' segments, covering segments [segment_from, segment_to).
+    The pie is a prism with a regular polygon base, with 'radius' being distance from the
+    center to the middle of the polygon edges. Segment i is centered at angle
+    pi + i * 2 * pi / segments.
+    """
+    count = segment_to - segment_from
+    step = 2.0 * np.pi / segments
+    angles = np.pi + (np.arange(segment_from, segment_to + 1) - 0.5) * step
+    ring_radius = radius / np.cos(step / 2.0)
+    ring = np.column_stack((np.cos(angles), np.sin(angles))) * ring_radius
+
+    verts = np.vstack(
+        (
+            [[0.0, 0.0, height], [0.0, 0.0, 0.0]],
+            np.column_stack((ring, np.full(count + 1, height))),
+            np.column_stack((ring, np.zeros(count + 1))),
+        )
+    ).astype(np.float32)
+
+    top = np.arange(2, count + 3, dtype=np.int32)
+    bottom = top + count + 1
+    top_faces = np.column_stack((np.zeros(count, dtype=np.int32), top[:-1], top[1:]))
+    bottom_faces = np.column_stack(
+        (np.ones(count, dtype=np.int32), bottom[1:], bottom[:-1])
+    )
+    outer_faces = np.column_stack((bottom[:-1], bottom[1:], top[1:], top[:-1]))
+    side_faces = np.array(
+        [[1, bottom[0], top[0], 0], [1, 0, top[-1], bottom[-1]]], dtype=np.int32
+    )
+
+    loop_vertices = np.concatenate(
+        (
+            top_faces.ravel(),
+            bottom_faces.ravel(),
+            outer_faces.ravel(),
+            side_faces.ravel(),
+        )
+    ).astype(np.int32)
+    loop_starts = np.concatenate(
+        (
+            np.arange(0, 6 * count, 3),
+            np.arange(6 * count, loop_vertices.size, 4),
+        )
+    ).astype(np.int32)
+    return verts, loop_vertices, loop_starts
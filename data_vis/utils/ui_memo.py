@@ -0,0 +1,109 @@
+# ©copyright Zdenek Dolezal 2024-, License GPL
+# Memoization of state the UI polls and draws depend on. Poll functions run for every visible
+# button on every redraw, values computed there are remembered until the data are loaded,
+# a file is opened, undo happens, or the object they belong to is updated in the depsgraph.
+
+import bpy
+import typing
+
+T = typing.TypeVar("T")
+# Memoized values can be None, lookups are a single 'get', so the memo can be invalidated
+# from other threads
+_MISSING = object()
+
+# Values not tied to any ID, e.g. types of the active data
+_memo: typing.Dict[typing.Hashable, typing.Any] = {}
+# Values of single IDs, (ID pointer, ID name) -> {key: value}
+_id_memo: typing.Dict[
+    typing.Tuple[int, str], typing.Dict[typing.Hashable, typing.Any]
+] = {}
+# Called with no arguments when everything is invalidated, for caches kept elsewhere that
+# are keyed by ID pointers, which aren't valid across files
+_invalidate_callbacks: typing.List[typing.Callable[[], None]] = []
+
+
+def memoize(key: typing.Hashable, compute: typing.Callable[[], T]) -> T:
+    """Returns value remembered for 'key', 'compute' is called only if there is none"""
+    value = _memo.get(key, _MISSING)
+    if value is not _MISSING:
+        return value
+
+    value = compute()
+    _memo[key] = value
+    return value
+
+
+def memoize_id(
+    id_: bpy.types.ID, key: typing.Hashable, compute: typing.Callable[[], T]
+) -> T:
+    """
+    Returns value remembered for 'key' of 'id_', forgotten when the ID is updated in the
+    depsgraph. Changes not tagging the depsgraph, such as custom properties set from scripts,
+    have to be part of the 'key'.
+    """
+    id_values = _id_memo.setdefault(_id_key(id_), {})
+    value = id_values.get(key, _MISSING)
+    if value is not _MISSING:
+        return value
+
+    value = compute()
+    id_values[key] = value
+    return value
+
+
+def invalidate() -> None:
+    _memo.clear()
+    _id_memo.clear()
+    for callback in _invalidate_callbacks:
+        callback()
+
+
+def invalidate_id(id_: bpy.types.ID) -> None:
+    _id_memo.pop(_id_key(id_), None)
+
+
+def add_invalidate_callback(callback: typing.Callable[[], None]) -> None:
+    if callback not in _invalidate_callbacks:
+        _invalidate_callbacks.append(callback)
+
+
+def _id_key(id_: bpy.types.ID) -> typing.Tuple[int, str]:
+    # Name is part of the key, as pointers of removed IDs can be reused
+    return (id_.original.as_pointer(), id_.name)
+
+
+@bpy.app.handlers.persistent
+def _on_load_or_undo(*args) -> None:
+    invalidate()
+
+
+@bpy.app.handlers.persistent
+def _on_depsgraph_update(scene: bpy.types.Scene, depsgraph: bpy.types.Depsgraph):
+    if len(_id_memo) == 0:
+        return
+
+    for update in depsgraph.updates:
+        if isinstance(update.id, bpy.types.Object):
+            invalidate_id(update.id)
+
+
+_LOAD_OR_UNDO_HANDLERS = (
+    bpy.app.handlers.load_post,
+    bpy.app.handlers.undo_post,
+    bpy.app.handlers.redo_post,
+)
+
+
+def register():
+    for handlers in _LOAD_OR_UNDO_HANDLERS:
+        handlers.append(_on_load_or_undo)
+    bpy.app.handlers.depsgraph_update_post.append(_on_depsgraph_update)
+
+
+def unregister():
+    for handlers in _LOAD_OR_UNDO_HANDLERS:
+        if _on_load_or_undo in handlers:
+            handlers.remove(_on_load_or_undo)
+    if _on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(_on_depsgraph_update)
+    invalidate()
@@ -23,15 +23,20 @@ logger = logging.getLogger("data_vis")
 _DEFAULT_ADDON_ZIP = "dev/tests/intermediate/data_vis_3.0.0.zip"
 
 
-def _count_action_fcurves(action: bpy.types.Action) -> int:
+def _get_action_fcurves(action: bpy.types.Action) -> typing.List[bpy.types.FCurve]:
     if bpy.app.version >= (5, 0, 0):
-        return sum(
-            len(channelbag.fcurves)
+        return [
+            fcurve
             for layer in action.layers
             for strip in layer.strips
             for channelbag in strip.channelbags
-        )
-    return len(action.fcurves)
+            for fcurve in channelbag.fcurves
+        ]
+    return list(action.fcurves)
+
+
+def _count_action_fcurves(action: bpy.types.Action) -> int:
+    return len(_get_action_fcurves(action))
 
 
 def _parse_addon_zip() -> str:
@@ -234,6 +239,113 @@ class TestLoadData(DataVisTestCase):
         self.assertEqual(chart_data.lines, 4)
         self.assertEqual(chart_data.labels, ("x", "y", "res"))
 
+    def test_load_typed_columns(self):
+        import data_vis
+        import numpy as np
+
+        self.load_data("species_2D.csv")
+        dm = data_vis.DataManager()
+        self.assertEqual(dm.values.dtype, np.float64)
+        self.assertTupleEqual(dm.values.shape, (6, 1))
+        self.assertListEqual(
+            dm.categories.tolist(),
+            ["cat", "dog", "parrot", "hamster", "horse", "chicken"],
+        )
+        # Legacy row access is still available
+        self.assertListEqual(dm.parsed_data[0], ["cat", 10.0])
+
+    def test_chart_data_cached_until_reload(self):
+        import data_vis
+
+        self.load_data("species_2D.csv")
+        dm = data_vis.DataManager()
+        chart_data = dm.get_chart_data()
+        self.assertIs(dm.get_chart_data(), chart_data)
+
+        bpy.ops.data_list.reload_data()
+        self.assertIsNot(dm.get_chart_data(), chart_data)
+
+    def test_reload_from_cache(self):
+        import data_vis
+        import numpy as np
+
+        self.load_data("x+y_3D.csv")
+        dm = data_vis.DataManager()
+        ranges = dict(dm.ranges)
+        bpy.ops.data_list.reload_data()
+        self.assertIsInstance(dm.values, np.memmap)
+        self.assertDictEqual(dm.ranges, ranges)
+        self.assertEqual(dm.lines, 81)
+        self.assertEqual(dm.labels, ("x", "y", "x+y"))
+
+    def test_load_streamed_sample(self):
+        import data_vis
+
+        prefs = bpy.context.preferences.addons["data_vis"].preferences
+        prefs.stream_data = True
+        prefs.stream_stride = 2
+        prefs.stream_row_budget = 10
+        self.load_data("x+y_3D.csv")
+        dm = data_vis.DataManager()
+        self.assertEqual(dm.lines, 10)
+        self.assertTrue(dm.is_sampled())
+        self.assertEqual(dm.sampling["read_rows"], 19)
+        self.assertFalse(dm.sampling["complete"])
+
+        bpy.ops.data_vis.geonodes_bar_chart()
+        chart_data_info = json.loads(bpy.context.active_object["DV_DataType"])
+        self.assertEqual(chart_data_info["sampling"]["loaded_rows"], 10)
+
+    def test_registry_keeps_multiple_datasets(self):
+        import data_vis
+
+        data_1_path = self.load_data("species_2D.csv")
+        data_2_path = self.load_data("x+y_3D.csv")
+        registry = data_vis.DataManager.registry
+        self.assertIsNotNone(registry.get(data_1_path))
+        self.assertIsNotNone(registry.get(data_2_path))
+
+        # Data of the non-active entry are available without switching the active data
+        chart_data = bpy.context.scene.data_list[0].get_chart_data()
+        self.assertEqual(len(chart_data.parsed_data), 6)
+        self.assertEqual(data_vis.DataManager().filepath, data_2_path)
+
+    def test_memory_size_includes_cached_data(self):
+        import data_vis
+
+        self.load_data("species_2D.csv")
+        dm = data_vis.DataManager()
+        columns_size = dm.values.nbytes + dm.categories.nbytes
+        # Categorical ChartData is an object array copy of the columns
+        dm.get_chart_data()
+        chart_data_size = dm.get_memory_size()
+        self.assertGreater(chart_data_size, columns_size)
+        # Rows are built on first access
+        dm.get_parsed_data()
+        self.assertGreater(dm.get_memory_size(), chart_data_size)
+
+    def test_read_tail_ranges_match_fresh_load(self):
+        import tempfile
+        import data_vis
+
+        registry = data_vis.DataManager.registry
+        for filename in ("function-simple_3D_anim.csv", "species_2D.csv"):
+            with open(os.path.join(self.data_folder, filename)) as f:
+                lines = f.readlines()
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                data_path = os.path.join(tmp_dir, filename)
+                with open(data_path, "w") as f:
+                    f.writelines(lines[:3])
+                dataset = registry.get(data_path)
+                with open(data_path, "a") as f:
+                    f.writelines(lines[3:])
+                self.assertEqual(registry.read_tail(data_path), len(lines) - 3)
+
+                fresh = data_vis.DataManager.new_dataset()
+                fresh.read_file(data_path)
+                self.assertDictEqual(dataset.ranges, fresh.ranges)
+                self.assertEqual(dataset.byte_offset, fresh.byte_offset)
+
     def assertDataLoadedInScene(self, filepath: str):
         data_name = os.path.basename(filepath)
         found = False
@@ -289,6 +401,139 @@ class TestAddCharts(DataVisTestCase):
             bpy.context.active_object, "DV_Data", "DV_LineChart"
         )
 
+    def test_line_chart_downsampling_replayed_on_regenerate(self):
+        self.load_data("x+y_3D.csv")
+        bpy.ops.data_vis.geonodes_line_chart(
+            data_type="2D", downsampling_method="LTTB", downsampling_target=20
+        )
+        obj = bpy.context.active_object
+        self.assertEqual(len(obj.data.vertices), 20)
+        self.assertEqual(len(obj.data.edges), 19)
+
+        bpy.ops.data_vis.regenerate_data()
+        info = json.loads(obj["DV_DataType"])
+        self.assertEqual(info["downsampling"], {"method": "LTTB", "target": 20})
+        self.assertEqual(len(obj.data.vertices), 20)
+
+    def test_regenerate_appended_rows_in_place(self):
+        import tempfile
+
+        with open(os.path.join(self.data_folder, "x+y_3D.csv")) as f:
+            lines = f.readlines()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            data_path = os.path.join(tmp_dir, "appended.csv")
+            with open(data_path, "w") as f:
+                f.writelines(lines[:41])
+            bpy.ops.ui.dv_load_data(filepath=data_path)
+            bpy.ops.data_vis.geonodes_line_chart(data_type="2D")
+            obj = bpy.context.active_object
+            mesh = obj.data
+            self.assertEqual(len(mesh.vertices), 40)
+
+            with open(data_path, "w") as f:
+                f.writelines(lines)
+            bpy.ops.data_list.reload_data()
+            bpy.ops.data_vis.regenerate_data()
+
+        self.assertIs(obj.data, mesh)
+        self.assertEqual(len(mesh.vertices), 81)
+        self.assertEqual(len(mesh.edges), 80)
+        info = json.loads(obj["DV_DataType"])
+        self.assertEqual(info["fingerprint"]["rows"], 81)
+
+    def test_live_data_updates_charts_of_file(self):
+        import tempfile
+        import data_vis
+
+        with open(os.path.join(self.data_folder, "x+y_3D.csv")) as f:
+            lines = f.readlines()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            data_path = os.path.join(tmp_dir, "live.csv")
+            with open(data_path, "w") as f:
+                f.writelines(lines[:41])
+            bpy.ops.ui.dv_load_data(filepath=data_path)
+            bpy.ops.data_vis.geonodes_point_chart(data_type="3D")
+            obj = bpy.context.active_object
+
+            with open(data_path, "a") as f:
+                f.writelines(lines[41:])
+            updated = data_vis.live.update_file(
+                bpy.context, bpy.context.scene.data_list[0]
+            )
+
+        self.assertListEqual(updated, [obj])
+        self.assertEqual(len(obj.data.vertices), 80)
+        self.assertEqual(data_vis.DataManager().lines, 80)
+
+    def test_regenerate_all_charts(self):
+        data_path = self.load_data("x+y_3D.csv")
+        bpy.ops.data_vis.geonodes_bar_chart(data_type="3D")
+        bar_chart = bpy.context.active_object
+        bpy.ops.data_vis.geonodes_line_chart(data_type="2D")
+        line_chart = bpy.context.active_object
+        bar_info = json.loads(bar_chart["DV_DataType"])
+        self.assertEqual(bar_info["filepath"], data_path)
+        self.assertIn("content_hash", bar_info)
+
+        line_info = json.loads(line_chart["DV_DataType"])
+        line_info["content_hash"] = "stale"
+        line_chart["DV_DataType"] = json.dumps(line_info)
+        line_chart["DV_DataVersion"] += 1
+        self.load_data("species_2D.csv")
+        bpy.ops.data_vis.regenerate_all_charts()
+
+        line_info = json.loads(line_chart["DV_DataType"])
+        self.assertEqual(line_info["content_hash"], bar_info["content_hash"])
+        self.assertEqual(line_info["filepath"], data_path)
+        self.assertEqual(len(line_chart.data.vertices), 81)
+
+    def test_fingerprint_stored_with_loaded_data(self):
+        import data_vis
+
+        self.load_data("species_2D.csv")
+        bpy.ops.data_vis.geonodes_bar_chart(data_type="Cat_2D")
+        chart_data = data_vis.DataManager().get_chart_data()
+        fingerprint = chart_data.fingerprint
+        self.assertEqual(fingerprint["rows"], 6)
+        info = json.loads(bpy.context.active_object["DV_DataType"])
+        self.assertEqual(
+            info["content_hash"], data_vis.geonodes.data._content_hash(fingerprint)
+        )
+
+        # Other charts of the same data reuse the fingerprint
+        bpy.ops.data_vis.geonodes_bar_chart(data_type="Cat_2D")
+        self.assertIs(data_vis.DataManager().get_chart_data().fingerprint, fingerprint)
+
+    def test_bar_chart_aggregated_into_bins(self):
+        self.load_data("x+y_3D.csv")
+        bpy.ops.data_vis.geonodes_bar_chart(
+            data_type="3D", aggregation="COUNT", bins_x=3, bins_y=3
+        )
+        obj = bpy.context.active_object
+        self.assertEqual(len(obj.data.vertices), 9)
+        self.assertTrue(all(v.co.z == 9 for v in obj.data.vertices))
+
+        info = json.loads(obj["DV_DataType"])
+        self.assertEqual(info["max"][2], 9)
+        bpy.ops.data_vis.regenerate_data()
+        self.assertEqual(len(obj.data.vertices), 9)
+
+    def test_point_chart_aggregated_weights(self):
+        self.load_data("x+y_3D.csv")
+        bpy.ops.data_vis.geonodes_point_chart(
+            data_type="2D+W", aggregation="SUM_W", bins_x=3
+        )
+        obj = bpy.context.active_object
+        # Sums of x + y over x in {0, 1, 2}, {3, 4, 5} and {6, 7, 8}
+        self.assertListEqual(
+            sorted(v.co.z for v in obj.data.vertices), [135.0, 216.0, 297.0]
+        )
+
+        # Columns of 2D + W data are [x, z, w], only the Z range is aggregated
+        info = json.loads(obj["DV_DataType"])
+        self.assertListEqual(info["min"], [0.0, 135.0, 0.0])
+        self.assertListEqual(info["max"], [8.0, 297.0, 16.0])
+
     def test_add_point_chart(self):
         self.load_data("x+y_3D.csv")
         bpy.ops.data_vis.geonodes_point_chart()
@@ -318,6 +563,112 @@ class TestAddCharts(DataVisTestCase):
             bpy.context.active_object, "DV_Data", "DV_SurfaceChart"
         )
 
+    def test_surface_chart_grid(self):
+        self.load_data("x+y_3D.csv")
+        bpy.ops.data_vis.geonodes_surface_chart(grid_x=12, grid_y=7)
+        mesh = bpy.context.active_object.data
+        self.assertEqual(len(mesh.vertices), 12 * 7)
+        self.assertEqual(len(mesh.polygons), 11 * 6)
+        self.assertEqual(len(mesh.edges), 11 * 7 + 12 * 6)
+        self.assertTrue(all(len(p.vertices) == 4 for p in mesh.polygons))
+
+    def test_grid_faces_non_square(self):
+        import data_vis
+
+        # 3 rows and 4 columns, vertex at [row, col] has index row * 4 + col
+        faces = data_vis.utils.mesh_utils.grid_faces(3, 4)
+        self.assertListEqual(
+            faces.tolist(),
+            [
+                [0, 4, 5, 1],
+                [4, 8, 9, 5],
+                [1, 5, 6, 2],
+                [5, 9, 10, 6],
+                [2, 6, 7, 3],
+                [6, 10, 11, 7],
+            ],
+        )
+
+    def test_surface_chart_engine_replayed_on_regenerate(self):
+        self.load_data("x+y_3D.csv")
+        bpy.ops.data_vis.geonodes_surface_chart(
+            interpolation_engine="LINEAR", grid_x=10, grid_y=10
+        )
+        obj = bpy.context.active_object
+        info = json.loads(obj["DV_DataType"])
+        self.assertEqual(info["interpolation"]["engine"], "LINEAR")
+
+        bpy.ops.data_vis.regenerate_data()
+        info = json.loads(obj["DV_DataType"])
+        self.assertEqual(info["interpolation"]["engine"], "LINEAR")
+        self.assertEqual(len(obj.data.vertices), 100)
+
+    def test_surface_chart_regular_grid(self):
+        self.load_data("x+y_3D.csv")
+        bpy.ops.data_vis.geonodes_surface_chart(
+            interpolation_engine="REGULAR_GRID", grid_x=5, grid_y=5
+        )
+        self.assertEqual(len(bpy.context.active_object.data.vertices), 25)
+
+    def test_cancelled_data_object_removed(self):
+        import data_vis
+
+        self.load_data("function-simple_3D_anim.csv")
+        chart_data = data_vis.DataManager().get_chart_data()
+        data_type = data_vis.geonodes.data.DataTypeValue.Data2DA
+        meshes_count = len(bpy.data.meshes)
+        steps = data_vis.geonodes.data.build_data_object(
+            "DV_Cancelled",
+            data_type,
+            chart_data,
+            data_vis.geonodes.data._convert_data_to_geometry(data_type, chart_data),
+        )
+        # Mesh is created in the first step, then one step per each animated column
+        self.assertAlmostEqual(next(steps), 1 / 6)
+        self.assertIn("DV_Cancelled", bpy.data.objects)
+        steps.close()
+        self.assertNotIn("DV_Cancelled", bpy.data.objects)
+        self.assertEqual(len(bpy.data.meshes), meshes_count)
+
+    def test_background_chart_executed_without_invoke(self):
+        self.load_data("x+y_3D.csv")
+        # Same as redo, execute with the property set, but without invoke and a window
+        result = bpy.ops.data_vis.geonodes_line_chart(
+            "EXEC_DEFAULT", data_type="2D", run_in_background=True
+        )
+        self.assertSetEqual(result, {"FINISHED"})
+        self.assertEqual(len(bpy.context.active_object.data.vertices), 81)
+
+        # Pie chart isn't created from a data object, so it can't run in the background
+        pie_properties = bpy.ops.data_vis.geonodes_pie_chart.get_rna_type().properties
+        self.assertNotIn("run_in_background", pie_properties)
+
+    def test_library_reused_between_charts(self):
+        self.load_data("x+y_3D.csv")
+        bpy.ops.data_vis.geonodes_bar_chart()
+        node_groups_count = len(bpy.data.node_groups)
+        bpy.ops.data_vis.geonodes_bar_chart()
+        self.assertEqual(len(bpy.data.node_groups), node_groups_count)
+        self.assertEqual(len(bpy.data.libraries), 1)
+
+        self.assertEqual(bpy.ops.data_vis.refresh_library(), {"FINISHED"})
+        self.assertNodesModifier(bpy.context.active_object, "DV_BarChart")
+
+    def test_material_shared_between_charts(self):
+        import data_vis
+
+        self.load_data("x+y_3D.csv")
+        materials = []
+        for color in ((1.0, 0.0, 0.0), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0)):
+            bpy.ops.data_vis.geonodes_bar_chart(color=color)
+            modifier = bpy.context.active_object.modifiers["Bar Chart"]
+            materials.append(
+                data_vis.geonodes.modifier_utils.get_input(modifier, "Material")
+            )
+
+        self.assertEqual(materials[0], materials[1])
+        self.assertNotEqual(materials[0], materials[2])
+
     def test_add_pie_chart_invalid_data(self):
         self.load_data("x+y_3D.csv")
         self.assertFalse(bpy.ops.data_vis.geonodes_pie_chart.poll())
@@ -326,6 +677,14 @@ class TestAddCharts(DataVisTestCase):
         self.load_data("species_2D.csv")
         self.assertFalse(bpy.ops.data_vis.geonodes_surface_chart.poll())
 
+    def test_poll_follows_loaded_data(self):
+        self.load_data("species_2D.csv")
+        self.assertTrue(bpy.ops.data_vis.geonodes_pie_chart.poll())
+        self.load_data("x+y_3D.csv")
+        self.assertFalse(bpy.ops.data_vis.geonodes_pie_chart.poll())
+        self.load_data("species_2D.csv")
+        self.assertTrue(bpy.ops.data_vis.geonodes_pie_chart.poll())
+
 
 class TestAddAxis(DataVisTestCase):
     def test_add_categorical_axis(self):
@@ -453,6 +812,21 @@ class TestDataTypeProperty(DataVisTestCase):
             info["data_type"], data_vis.geonodes.data.DataTypeValue.CATEGORIC_Data2D
         )
 
+    def test_categories_stored_as_binary_arrays(self):
+        import data_vis
+
+        self.load_data("species_2D.csv")
+        bpy.ops.data_vis.geonodes_bar_chart()
+        obj = bpy.context.active_object
+        self.assertNotIn("categories", json.loads(obj["DV_DataType"]))
+        self.assertIn("categories", obj["DV_DataArrays"])
+
+        info = self._get_stored_prop(obj)
+        dm = data_vis.DataManager()
+        self.assertListEqual(info["categories"], dm.categories.tolist())
+        self.assertListEqual(info["axis_labels"], ["species", "count"])
+        self.assertIs(self._get_stored_prop(obj), info)
+
     def test_data_type_stored_animated(self):
         import data_vis
 
@@ -523,6 +897,69 @@ class TestAddAnimation(DataVisTestCase):
         # Basis + 4 columns
         self.assertEqual(len(chart_obj.data.shape_keys.key_blocks), 5)
 
+    def test_shape_keys_values(self):
+        import data_vis
+
+        self.load_data("function-simple_3D_anim.csv")
+        bpy.ops.data_vis.geonodes_bar_chart(
+            data_type=data_vis.geonodes.data.DataTypeValue.Data2DA
+        )
+        key_blocks = bpy.context.active_object.data.shape_keys.key_blocks
+        # Second data row is [0, 1, 1, 2, 3, 0, 1], Z of the first column is 1
+        self.assertAlmostEqual(key_blocks["Column: 0"].data[1].co.z, 1.0)
+        self.assertAlmostEqual(key_blocks["Column: 2"].data[1].co.z, 3.0)
+        self.assertAlmostEqual(key_blocks["Column: 2"].data[1].co.x, 0.0)
+
+    def test_animation_stored_as_attributes(self):
+        import data_vis
+
+        self.load_data("function-simple_3D_anim.csv")
+        prefs = bpy.context.preferences.addons["data_vis"].preferences
+        prefs.animation_storage = data_vis.geonodes.data.AnimationStorage.ATTRIBUTES
+        bpy.ops.data_vis.geonodes_bar_chart(
+            data_type=data_vis.geonodes.data.DataTypeValue.Data2DA
+        )
+        chart_obj = bpy.context.active_object
+        self.assertIsNone(chart_obj.data.shape_keys)
+        names = data_vis.geonodes.data.get_animation_attribute_names(chart_obj)
+        self.assertEqual(names, ["@z_0", "@z_1", "@z_2", "@z_3", "@z_4"])
+        self.assertAlmostEqual(chart_obj.data.attributes["@z_1"].data[1].value, 2.0)
+
+    def test_shape_keys_created_surface(self):
+        import data_vis
+
+        self.load_data("function-simple_3D_anim.csv")
+        bpy.ops.data_vis.geonodes_surface_chart(
+            data_type=data_vis.geonodes.data.DataTypeValue.Data3DA,
+            interpolation_engine="LINEAR",
+            grid_x=6,
+            grid_y=6,
+        )
+        chart_obj = bpy.context.active_object
+        # Basis + 4 columns, all interpolated into the grid
+        self.assertEqual(len(chart_obj.data.shape_keys.key_blocks), 5)
+        self.assertEqual(len(chart_obj.data.shape_keys.key_blocks[4].data), 36)
+
+    def test_surface_interpolated_in_processes(self):
+        import data_vis
+
+        self.load_data("function-simple_3D_anim.csv")
+        prefs = bpy.context.preferences.addons["data_vis"].preferences
+        results = []
+        for workers in (0, 2):
+            prefs.interpolation_workers = workers
+            bpy.ops.data_vis.geonodes_surface_chart(
+                data_type=data_vis.geonodes.data.DataTypeValue.Data3DA,
+                interpolation_engine="LINEAR",
+                grid_x=6,
+                grid_y=6,
+            )
+            key_blocks = bpy.context.active_object.data.shape_keys.key_blocks
+            results.append([v.co.z for sk in key_blocks for v in sk.data])
+
+        for serial, parallel in zip(*results):
+            self.assertAlmostEqual(serial, parallel, places=5)
+
     def test_add_animation(self):
         import data_vis
 
@@ -566,5 +1003,290 @@ class TestAddAnimation(DataVisTestCase):
         self.assertEqual(_count_action_fcurves(chart_obj.animation_data.action), 1)
 
 
+class TestLegacyCharts(DataVisTestCase):
+    # Settings of the legacy chart operators, ranges cover all of 'function-simple_3D_anim.csv'
+    AXIS_SETTINGS = {
+        "create": False,
+        "x_range": (0.0, 1.0),
+        "y_range": (0.0, 1.0),
+        "z_range": (0.0, 3.0),
+    }
+
+    def get_chart_objects(self) -> typing.List[bpy.types.Object]:
+        """Returns objects parented to the container of the created chart"""
+        return list(bpy.context.active_object.children)
+
+    def test_bar_chart_single_mesh(self):
+        import numpy as np
+        import data_vis
+
+        self.load_data("function-simple_3D_anim.csv")
+        bpy.ops.object.create_bar_chart(
+            dimensions="3",
+            data_type="0",
+            single_mesh=True,
+            axis_settings=self.AXIS_SETTINGS,
+            header_settings={"create": False},
+            label_settings={"create": False},
+            anim_settings={"animate": True},
+        )
+        objs = self.get_chart_objects()
+        self.assertEqual(len(objs), 1)
+        mesh = objs[0].data
+        # 4 bars made of cubes
+        self.assertEqual(len(mesh.vertices), 4 * 8)
+        self.assertEqual(len(mesh.polygons), 4 * 6)
+
+        color_attribute = mesh.attributes["DV_Color"]
+        self.assertEqual(color_attribute.domain, "FACE")
+        self.assertEqual(mesh.color_attributes.active_color_name, "DV_Color")
+        colors = np.empty(len(mesh.polygons) * 4, dtype=np.float32)
+        color_attribute.data.foreach_get("color", colors)
+        expected = data_vis.colors.get_value_colors(
+            (0.0, 0.0, 1.0),
+            data_vis.colors.ColorType.Gradient,
+            self.AXIS_SETTINGS["z_range"],
+            [0.0, 1.0, 2.0, 3.0],
+        )
+        np.testing.assert_allclose(
+            colors.reshape(4, 6, 4), np.repeat(expected[:, None], 6, axis=1), atol=1e-6
+        )
+
+        # Basis + 4 animated columns
+        key_blocks = mesh.shape_keys.key_blocks
+        self.assertEqual(len(key_blocks), 5)
+        # Top of the first bar in the last column, value 0 is kept barely visible
+        top = max(v.co.z for v in list(key_blocks[-1].data)[:8])
+        self.assertAlmostEqual(top, 0.0005, places=5)
+        self.assertIsNotNone(mesh.shape_keys.animation_data)
+
+    def assertPointInstances(
+        self, obj: bpy.types.Object, points: int, marker: bpy.types.Object = None
+    ) -> None:
+        self.assertEqual(len(obj.data.vertices), points)
+        self.assertEqual(len(obj.data.polygons), 0)
+        self.assertEqual(obj.data.attributes["DV_Size"].domain, "POINT")
+        self.assertEqual(obj.data.attributes["DV_Color"].domain, "POINT")
+        modifier = obj.modifiers["DV_PointInstances"]
+        self.assertEqual(modifier.type, "NODES")
+        marker_nodes = [
+            node
+            for node in modifier.node_group.nodes
+            if node.bl_idname == "GeometryNodeObjectInfo"
+        ]
+        if marker is None:
+            self.assertEqual(len(marker_nodes), 0)
+        else:
+            self.assertEqual(len(marker_nodes), 1)
+            self.assertEqual(marker_nodes[0].inputs["Object"].default_value, marker)
+
+    def test_point_chart_point_cloud(self):
+        self.load_data("function-simple_3D_anim.csv")
+        bpy.ops.object.create_point_chart(
+            dimensions="3",
+            use_instancing=True,
+            axis_settings=self.AXIS_SETTINGS,
+            header_settings={"create": False},
+            label_settings={"create": False},
+            anim_settings={"animate": True},
+        )
+        objs = self.get_chart_objects()
+        self.assertEqual(len(objs), 1)
+        self.assertPointInstances(objs[0], 4)
+        # Basis + 4 animated columns, Z of the first point in the last column is 0
+        key_blocks = objs[0].data.shape_keys.key_blocks
+        self.assertEqual(len(key_blocks), 5)
+        self.assertAlmostEqual(key_blocks[-1].data[0].co.z, 0.0)
+        self.assertAlmostEqual(key_blocks[-1].data[3].co.z, 1.0)
+
+    def test_point_chart_point_cloud_custom_marker(self):
+        marker = bpy.data.objects.new("Marker", bpy.data.meshes.new("Marker"))
+        bpy.context.collection.objects.link(marker)
+        self.load_data("function-simple_3D_anim.csv")
+        bpy.ops.object.create_point_chart(
+            dimensions="3",
+            use_instancing=True,
+            use_obj="Custom",
+            custom_obj_name=marker.name,
+            axis_settings={**self.AXIS_SETTINGS, "x_range": (0.0, 0.5)},
+            header_settings={"create": False},
+            label_settings={"create": False},
+        )
+        objs = self.get_chart_objects()
+        self.assertEqual(len(objs), 1)
+        # Only the points with x = 0 are in range
+        self.assertPointInstances(objs[0], 2, marker)
+
+    def test_bubble_chart_point_cloud_size_animation(self):
+        self.load_data("function-simple_3D_anim.csv")
+        bpy.ops.object.create_bubble_chart(
+            dimensions="3",
+            use_instancing=True,
+            anim_type="size",
+            axis_settings=self.AXIS_SETTINGS,
+            header_settings={"create": False},
+            label_settings={"create": False},
+            anim_settings={"animate": True, "key_spacing": 10},
+        )
+        objs = self.get_chart_objects()
+        self.assertEqual(len(objs), 1)
+        self.assertPointInstances(objs[0], 4)
+
+        mesh = objs[0].data
+        fcurves = _get_action_fcurves(mesh.animation_data.action)
+        # One F-curve per point, keyframes of W and the 3 animated columns
+        self.assertEqual(len(fcurves), 4)
+        for fcurve in fcurves:
+            self.assertTrue(fcurve.data_path.startswith('attributes["DV_Size"]'))
+            self.assertEqual(len(fcurve.keyframe_points), 4)
+            frames = [point.co.x for point in fcurve.keyframe_points]
+            start = bpy.context.scene.frame_current
+            self.assertListEqual(frames, [start, start + 10, start + 20, start + 30])
+
+        sizes = [point.value for point in mesh.attributes["DV_Size"].data]
+        first_keyframes = [fcurve.keyframe_points[0].co.y for fcurve in fcurves]
+        self.assertListEqual(sorted(sizes), sorted(first_keyframes))
+
+    def test_pie_chart_slices(self):
+        self.load_data("species_2D.csv")
+        bpy.ops.object.create_pie_chart(
+            vertices=64,
+            create_labels=False,
+            header_settings={"create": False},
+            legend_settings={"create": False},
+        )
+        container = bpy.context.active_object
+        slices = self.get_chart_objects()
+        # Only the container and the slices, no leftovers of joined objects
+        self.assertEqual(len(bpy.data.objects), len(slices) + 1)
+        self.assertEqual(len(slices), 6)
+        self.assertListEqual(bpy.context.selected_objects, [container])
+
+        # Gradient colors get lighter from the base color of the first slice
+        slices.sort(key=lambda obj: obj.active_material.diffuse_color[0])
+        for i, (slice_obj, segments) in enumerate(zip(slices, (17, 25, 7, 10, 2, 3))):
+            self.assertEqual(slice_obj.type, "MESH")
+            self.assertIs(slice_obj.parent, container)
+            self.assertAlmostEqual(slice_obj.active_material.diffuse_color[0], i / 6)
+            # Top and bottom triangles, outer quads and two sides of each slice
+            self.assertEqual(len(slice_obj.data.polygons), 3 * segments + 2)
+            self.assertEqual(len(slice_obj.data.vertices), 2 * segments + 4)
+
+    def create_axes(self, dim, ranges, tick_labels=([], [], [])):
+        """
+        Creates axes of 'dim' dimensions, returns their containers by direction. Checks
+        that the active object and the selection stay the same.
+        """
+        import types
+        import data_vis
+
+        axis = data_vis.operators.features.axis
+        parent = bpy.data.objects.new("Chart", None)
+        bpy.context.collection.objects.link(parent)
+        settings = types.SimpleNamespace(
+            x_step=0.1,
+            y_step=0.1,
+            z_step=0.1,
+            x_range=ranges[0],
+            y_range=ranges[1],
+            z_range=ranges[2],
+            thickness=0.01,
+            tick_mark_height=0.03,
+            auto_steps=True,
+            text_size=0.05,
+            number_format="0",
+            decimal_places=2,
+            padding=0.1,
+            z_position="FRONT",
+        )
+        bpy.context.view_layer.objects.active = parent
+        parent.select_set(True)
+        axis.AxisFactory.create(
+            parent, settings, dim, 0, ("x", "y", "z"), tick_labels=tick_labels
+        )
+        self.assertIs(bpy.context.view_layer.objects.active, parent)
+        self.assertListEqual(bpy.context.selected_objects, [parent])
+        containers = {obj.name: obj for obj in parent.children}
+        return {
+            direction: containers[f"Axis_Container_{direction}"]
+            for direction in axis.AxisDir
+            if f"Axis_Container_{direction}" in containers
+        }
+
+    def assertAxis(
+        self, container: bpy.types.Object, label: str, tick_bodies: typing.List[str]
+    ) -> None:
+        ticks = [obj for obj in container.children if obj.name.startswith("Ticks")]
+        self.assertEqual(len(ticks), 1)
+        # One cube for each tick
+        self.assertEqual(len(ticks[0].data.vertices), 8 * len(tick_bodies))
+        self.assertEqual(len(ticks[0].data.edges), 12 * len(tick_bodies))
+        bodies = [obj.data.body for obj in container.children if obj.type == "FONT"]
+        self.assertCountEqual(bodies, tick_bodies + [label])
+
+    def test_axes_2D(self):
+        import data_vis
+
+        axes = self.create_axes(2, ((0.0, 1.0), (0.0, 1.0), (0.0, 3.0)))
+        axis_dir = data_vis.operators.features.axis.AxisDir
+        self.assertSetEqual(set(axes), {axis_dir.X, axis_dir.Z})
+        self.assertAxis(axes[axis_dir.X], "x", [f"{i / 10:.2f}" for i in range(11)])
+        self.assertAxis(axes[axis_dir.Z], "z", [f"{i * 0.3:.2f}" for i in range(11)])
+
+    def test_axes_3D(self):
+        import data_vis
+
+        axes = self.create_axes(3, ((0.0, 1.0), (0.0, 2.0), (0.0, 3.0)))
+        axis_dir = data_vis.operators.features.axis.AxisDir
+        self.assertEqual(len(axes), 3)
+        self.assertAxis(axes[axis_dir.X], "x", [f"{i / 10:.2f}" for i in range(11)])
+        self.assertAxis(axes[axis_dir.Y], "y", [f"{i / 5:.2f}" for i in range(11)])
+        self.assertAxis(axes[axis_dir.Z], "z", [f"{i * 0.3:.2f}" for i in range(11)])
+
+    def test_axes_categorical(self):
+        import data_vis
+
+        categories = ["cat", "dog", "parrot", "hamster", "horse", "chicken"]
+        axes = self.create_axes(
+            2, ((0.0, 5.0), (0.0, 1.0), (0.0, 15.0)), (categories, [], [])
+        )
+        axis_dir = data_vis.operators.features.axis.AxisDir
+        self.assertAxis(axes[axis_dir.X], "x", categories)
+
+    def test_range_mask_and_normalization_match_per_entry(self):
+        import types
+        import numpy as np
+        import data_vis
+
+        chart_cls = data_vis.general.OBJECT_OT_GenericChart
+
+        class Chart:
+            in_axis_range_mask = chart_cls.in_axis_range_mask
+            in_axis_range_bounds_new = chart_cls.in_axis_range_bounds_new
+            get_axis_range_and_size = chart_cls.get_axis_range_and_size
+            normalize_value = chart_cls.normalize_value
+            normalize_array = chart_cls.normalize_array
+
+        for filename in ("x+y_3D.csv", "function-simple_3D_anim.csv"):
+            self.load_data(filename)
+            chart = Chart()
+            chart.dm = data_vis.DataManager()
+            chart.container_size = (2.0, 3.0, 4.0)
+            chart.axis_settings = types.SimpleNamespace(
+                x_range=(0.5, 5.0), y_range=(0.0, 0.5), z_range=(1.0, 40.0)
+            )
+
+            rows = chart.dm.get_parsed_data()
+            mask = chart.in_axis_range_mask()
+            self.assertListEqual(
+                mask.tolist(), [chart.in_axis_range_bounds_new(row) for row in rows]
+            )
+            for column, direction in enumerate("xyz"):
+                np.testing.assert_allclose(
+                    chart.normalize_array(chart.dm.get_column(column), direction),
+                    [chart.normalize_value(row[column], direction) for row in rows],
+                )
+
+
 if __name__ == "__main__":
     unittest.main(argv=["main"])